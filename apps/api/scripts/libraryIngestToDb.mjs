@@ -1,5 +1,7 @@
 import fs from "node:fs";
 import path from "node:path";
+import zlib from "node:zlib";
+import { promisify } from "node:util";
 import { fileURLToPath } from "node:url";
 import crypto from "node:crypto";
 import { PrismaClient } from "@prisma/client";
@@ -30,9 +32,41 @@ function loadEnvFile(filePath) {
 loadEnvFile(path.join(repoRoot, ".env"));
 loadEnvFile(path.join(apiRoot, ".env"));
 
-function readJsonl(filePath) {
+const EXPORT_BASES = {
+  normalized: "listings.normalized",
+  raw: "listings.raw",
+  manifest: "media_manifest",
+};
+const gunzip = promisify(zlib.gunzip);
+
+// export_index.json (written by library_import.py) lists the shards of each
+// export; without it the export is a single plain <base>.jsonl.
+function exportFiles(outDir, name) {
+  const indexPath = path.join(outDir, "export_index.json");
+  if (fs.existsSync(indexPath)) {
+    try {
+      const entries = JSON.parse(fs.readFileSync(indexPath, "utf-8"))?.outputs?.[name];
+      return Array.isArray(entries) ? entries.map((entry) => path.join(outDir, entry.file)) : [];
+    } catch {
+      // unreadable index: fall back to the single-file layout
+    }
+  }
+  return [path.join(outDir, `${EXPORT_BASES[name]}.jsonl`)];
+}
+
+async function decodeFile(filePath) {
+  const buf = await fs.promises.readFile(filePath);
+  if (filePath.endsWith(".gz")) return (await gunzip(buf)).toString("utf-8");
+  if (filePath.endsWith(".zst")) {
+    if (typeof zlib.zstdDecompress !== "function") throw new Error(`${filePath}: zstd exports need Node >= 22.15`);
+    return (await promisify(zlib.zstdDecompress)(buf)).toString("utf-8");
+  }
+  return buf.toString("utf-8");
+}
+
+async function readJsonl(filePath) {
   if (!fs.existsSync(filePath)) return [];
-  return fs.readFileSync(filePath, "utf-8")
+  return (await decodeFile(filePath))
     .split(/\r?\n/)
     .map((line) => line.trim())
     .filter(Boolean)
@@ -45,6 +79,15 @@ function readJsonl(filePath) {
     });
 }
 
+async function readExport(outDir, name) {
+  const files = exportFiles(outDir, name);
+  const parts = await Promise.all(files.map(readJsonl));
+  const rows = parts.flat();
+  // shards split listing_pk order; restore it so LIBRARY_INGEST_MAX_ROWS takes the same rows
+  if (files.length > 1) rows.sort((a, b) => (a.listing_pk < b.listing_pk ? -1 : a.listing_pk > b.listing_pk ? 1 : 0));
+  return rows;
+}
+
 function slugify(value, fallback = "unknown") {
   const slug = String(value || "")
     .trim()
@@ -310,9 +353,11 @@ async function main() {
     ? path.resolve(process.env.LIBRARY_EXPORT_DIR)
     : path.join(repoRoot, "data_exports");
 
-  const normalizedRowsAll = readJsonl(path.join(outDir, "listings.normalized.jsonl"));
-  const rawRows = readJsonl(path.join(outDir, "listings.raw.jsonl"));
-  const manifestRows = readJsonl(path.join(outDir, "media_manifest.jsonl"));
+  const [normalizedRowsAll, rawRows, manifestRows] = await Promise.all([
+    readExport(outDir, "normalized"),
+    readExport(outDir, "raw"),
+    readExport(outDir, "manifest"),
+  ]);
   const maxRows = Math.max(0, Number(process.env.LIBRARY_INGEST_MAX_ROWS || 0));
   const normalizedRows = maxRows > 0 ? normalizedRowsAll.slice(0, maxRows) : normalizedRowsAll;
 
@@ -13,6 +13,7 @@ import { mountCollectionRoutes } from "./collectionRoutes.js";
 import { downloadFromBackblazeByKey, uploadToBackblaze } from "./lib/backblaze.js";
 import { EBAY_GLOBAL_IDS, fetchEbayMarketplaceRows, persistEbayRows as persistEbayListings } from "./lib/ebay.js";
 import { recomputeGloveMarketSummaries } from "./lib/gloveMarketSummary.js";
+import { readLibraryExport } from "./lib/libraryExport.js";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -34,8 +35,6 @@ const publicDir = path.join(projectRoot, "public");
 const uploadsDir = path.join(publicDir, "uploads");
 const runtimeDir = path.join(projectRoot, "data", "runtime");
 const libraryExportDir = runtimeConfig.libraryExportDir;
-const libraryListingsPath = path.join(libraryExportDir, "listings.normalized.jsonl");
-const libraryManifestPath = path.join(libraryExportDir, "media_manifest.jsonl");
 const resolvedPort = runtimeConfig.port;
 const publicBaseUrl = runtimeConfig.publicBaseUrl;
 const b2PublicBaseUrl = runtimeConfig.backblaze.publicBaseUrl;
@@ -889,24 +888,6 @@ function loadSeedFile<T>(name: string): T[] {
   return JSON.parse(raw) as T[];
 }
 
-function loadJsonlFile<T>(filePath: string): T[] {
-  if (!fs.existsSync(filePath)) return [];
-  const lines = fs
-    .readFileSync(filePath, "utf-8")
-    .split(/\r?\n/)
-    .map((line) => line.trim())
-    .filter(Boolean);
-  const out: T[] = [];
-  for (const line of lines) {
-    try {
-      out.push(JSON.parse(line) as T);
-    } catch {
-      // Skip malformed row; import_report.json carries integrity counts.
-    }
-  }
-  return out;
-}
-
 function loadCategoryStore(): {
   brand_variant: Array<{ brand_variant_id: string; display_name?: string; market?: string | null }>;
   model_family: Array<{ model_family_id: string; brand_variant_id: string; display_name?: string; type?: string | null; notes?: string | null }>;
@@ -1118,13 +1099,15 @@ const seedArtifacts: Artifact[] = artifactsRaw.map((row) => {
   };
 });
 
-const manifestRows = loadJsonlFile<ExportMediaManifest>(libraryManifestPath);
+const [manifestRows, exportListings] = await Promise.all([
+  readLibraryExport<ExportMediaManifest>(libraryExportDir, "manifest"),
+  readLibraryExport<ExportListing>(libraryExportDir, "normalized"),
+]);
 const mediaByListingPk = new Map<string, ExportMediaManifest>();
 for (const row of manifestRows) {
   if (row?.listing_pk) mediaByListingPk.set(row.listing_pk, row);
 }
 
-const exportListings = loadJsonlFile<ExportListing>(libraryListingsPath);
 const exportArtifacts: Artifact[] = exportListings
   .map((row) => {
     if (!row?.listing_pk || !row?.source_listing_id) return null;
@@ -1291,7 +1274,7 @@ async function recordAppraisalRuns(params: {
   });
 }
 
-const libraryStore = loadLibraryStore({ exportDir: libraryExportDir, env: process.env, prisma });
+const libraryStore = await loadLibraryStore({ exportDir: libraryExportDir, env: process.env, prisma });
 
 app.get("/health", (_req, res) => res.json({ ok: true }));
 app.get("/api/system/config", (_req, res) => res.json({
@@ -0,0 +1,87 @@
+import fs from "node:fs";
+import path from "node:path";
+import { promisify } from "node:util";
+import zlib from "node:zlib";
+
+// Export files written by scrapers/jbg/library_import.py. export_index.json lists
+// every (possibly sharded, gzip/zstd compressed) file of each export; the default
+// layout (and exports written before the index existed) is a single plain
+// <base>.jsonl with no index.
+export type LibraryExportName = "normalized" | "raw" | "manifest";
+
+const EXPORT_BASES: Record<LibraryExportName, string> = {
+  normalized: "listings.normalized",
+  raw: "listings.raw",
+  manifest: "media_manifest",
+};
+
+type ExportIndex = {
+  outputs?: Partial<Record<LibraryExportName, Array<{ file: string }>>>;
+};
+
+type ZstdAsync = { zstdDecompress?: (buf: Buffer, cb: (err: Error | null, out: Buffer) => void) => void };
+
+const gunzip = promisify(zlib.gunzip);
+
+export function libraryExportFiles(exportDir: string, name: LibraryExportName): string[] {
+  const indexPath = path.join(exportDir, "export_index.json");
+  if (fs.existsSync(indexPath)) {
+    try {
+      const index = JSON.parse(fs.readFileSync(indexPath, "utf-8")) as ExportIndex;
+      const entries = index.outputs?.[name];
+      // An export missing from the index was not written (e.g. --no-raw).
+      return Array.isArray(entries) ? entries.map((entry) => path.join(exportDir, entry.file)) : [];
+    } catch {
+      // Unreadable index: fall back to the single-file layout.
+    }
+  }
+  return [path.join(exportDir, `${EXPORT_BASES[name]}.jsonl`)];
+}
+
+async function decodeExportFile(filePath: string): Promise<string> {
+  const buf = await fs.promises.readFile(filePath);
+  if (filePath.endsWith(".gz")) return (await gunzip(buf)).toString("utf-8");
+  if (filePath.endsWith(".zst")) {
+    const zstdDecompress = (zlib as unknown as ZstdAsync).zstdDecompress;
+    if (typeof zstdDecompress !== "function") throw new Error(`${filePath}: zstd exports need Node >= 22.15`);
+    return (await promisify(zstdDecompress)(buf)).toString("utf-8");
+  }
+  return buf.toString("utf-8");
+}
+
+function parseJsonl<T>(text: string): T[] {
+  const out: T[] = [];
+  for (const raw of text.split(/\r?\n/)) {
+    const line = raw.trim();
+    if (!line) continue;
+    try {
+      out.push(JSON.parse(line) as T);
+    } catch {
+      // Skip malformed row; import_report.json carries integrity counts.
+    }
+  }
+  return out;
+}
+
+async function readExportFile<T>(filePath: string): Promise<T[]> {
+  if (!fs.existsSync(filePath)) return [];
+  return parseJsonl<T>(await decodeExportFile(filePath));
+}
+
+export async function readLibraryExport<T extends { listing_pk?: string }>(
+  exportDir: string,
+  name: LibraryExportName,
+): Promise<T[]> {
+  const files = libraryExportFiles(exportDir, name);
+  const parts = await Promise.all(files.map((filePath) => readExportFile<T>(filePath)));
+  const rows = parts.flat();
+  // Shards split listing_pk order; restore it so every layout yields the same row order.
+  if (files.length > 1) {
+    rows.sort((a, b) => {
+      const ak = a.listing_pk ?? "";
+      const bk = b.listing_pk ?? "";
+      return ak < bk ? -1 : ak > bk ? 1 : 0;
+    });
+  }
+  return rows;
+}
@@ -1,8 +1,7 @@
 import crypto from "node:crypto";
-import fs from "node:fs";
-import path from "node:path";
 import type { PrismaClient } from "@prisma/client";
 import { computeGloveMarketSummary } from "./lib/gloveMarketSummary.js";
+import { readLibraryExport } from "./lib/libraryExport.js";
 
 type ListingRow = {
   listing_pk: string;
@@ -141,21 +140,6 @@ export type LibraryStore = {
   listingDetail: (id: string) => Promise<LibraryListingDetail | null>;
 };
 
-function readJsonl<T>(filePath: string): T[] {
-  if (!fs.existsSync(filePath)) return [];
-  return fs.readFileSync(filePath, "utf-8")
-    .split(/\r?\n/)
-    .map((v) => v.trim())
-    .filter(Boolean)
-    .flatMap((line) => {
-      try {
-        return [JSON.parse(line) as T];
-      } catch {
-        return [];
-      }
-    });
-}
-
 function hashHex(input: string) {
   return crypto.createHash("sha1").update(input).digest("hex");
 }
@@ -179,11 +163,11 @@ function signB2Key(key: string, sourceUrl: string | null, env: NodeJS.ProcessEnv
   return `${signerBase}/media/key/${encodeURIComponent(key)}?exp=${exp}&sig=${sig}`;
 }
 
-function buildFileStore(params: { exportDir: string; env: NodeJS.ProcessEnv }): FileStore {
-  const normalizedPath = path.join(params.exportDir, "listings.normalized.jsonl");
-  const manifestPath = path.join(params.exportDir, "media_manifest.jsonl");
-  const listingRows = readJsonl<ListingRow>(normalizedPath);
-  const manifestRows = readJsonl<MediaManifestRow>(manifestPath);
+async function buildFileStore(params: { exportDir: string; env: NodeJS.ProcessEnv }): Promise<FileStore> {
+  const [listingRows, manifestRows] = await Promise.all([
+    readLibraryExport<ListingRow>(params.exportDir, "normalized"),
+    readLibraryExport<MediaManifestRow>(params.exportDir, "manifest"),
+  ]);
   const mediaByListing = new Map(manifestRows.map((m) => [m.listing_pk, m]));
   const byListingId = new Map<string, ListingRow>();
   const byGlove = new Map<string, {
@@ -539,12 +523,12 @@ function computeGloveMetrics(listings: Array<{ price: number | null; available?:
   };
 }
 
-export function loadLibraryStore(params: {
+export async function loadLibraryStore(params: {
   exportDir: string;
   env: NodeJS.ProcessEnv;
   prisma: PrismaClient;
-}): LibraryStore {
-  const fileStore = buildFileStore({ exportDir: params.exportDir, env: params.env });
+}): Promise<LibraryStore> {
+  const fileStore = await buildFileStore({ exportDir: params.exportDir, env: params.env });
   let dbReadyPromise: Promise<boolean> | null = null;
 
   function dbReady() {
@@ -7,10 +7,13 @@ Reads an Excel workbook produced by the scrapers and uploads per-listing images
 Inputs:
 - Workbook with detail sheet containing: source, source_listing_id, listing_url, images_json (list of URLs)
 
-Outputs (written back to the same workbook):
+Outputs (written back to the same workbook, or to the SQLite staging store with --staging-db):
 - b2_images_json: list of objects with keys: { "b2_key", "file_name", "content_type", "source_url" }
 - b2_status: OK | SKIP | ERROR
 - b2_error: error message (if any)
+- a JSON run report (default .crawl_state/b2_ingest_run_report.json): row/image
+  counts, bytes downloaded and per-stage time / throughput / memory
+  (run_stats.py); --profile DIR adds cProfile stats and collapsed stacks
 
 Why separate step?
 - Scrape can run without credentials.
@@ -37,9 +40,14 @@ from typing import Any, Dict, List, Optional, Tuple
 import requests
 from b2sdk.v2 import InMemoryAccountInfo, B2Api
 from openpyxl import load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
+
+from crawl_cursors import DEFAULT_STATE_DIR
+from run_stats import StageRecorder, add_profile_args, start_profiler
+from staging_store import open_workbook
+from worksheet_index import WorksheetIndex
 
 DEFAULT_DETAIL_SHEETS = ["SS_Detail_Enrichment", "JBG_Detail_Enrichment"]
+DEFAULT_RUN_REPORT = os.path.join(DEFAULT_STATE_DIR, "b2_ingest_run_report.json")
 
 def _safe_json_loads(val: Any) -> Any:
     if val is None:
@@ -63,23 +71,6 @@ def _guess_content_type(url: str, fallback: str = "image/jpeg") -> str:
     ct, _ = mimetypes.guess_type(url.split("?")[0])
     return ct or fallback
 
-def _ensure_columns(ws: Worksheet, required: List[str]) -> Dict[str, int]:
-    header_row = 1
-    headers = {}
-    for col in range(1, ws.max_column + 1):
-        v = ws.cell(row=header_row, column=col).value
-        if v:
-            headers[str(v).strip()] = col
-
-    # Append missing columns at the end
-    next_col = ws.max_column + 1
-    for name in required:
-        if name not in headers:
-            ws.cell(row=header_row, column=next_col).value = name
-            headers[name] = next_col
-            next_col += 1
-    return headers
-
 @dataclass
 class B2Config:
     key_id: str
@@ -124,14 +115,6 @@ def _b2_key(prefix: str, source: str, listing_id: str, index: int, sha1: str, co
     # Deterministic key: prefix/source/listing_id/{index}_{sha1[:10]}.ext
     return f"{prefix}/{source}/{listing_id}/{index:02d}_{sha1[:10]}{ext}"
 
-def _row_get(ws: Worksheet, row: int, headers: Dict[str, int], key: str):
-    col = headers.get(key)
-    return ws.cell(row=row, column=col).value if col else None
-
-def _row_set(ws: Worksheet, row: int, headers: Dict[str, int], key: str, value: Any):
-    col = headers[key]
-    ws.cell(row=row, column=col).value = value
-
 def ingest_images(
     xlsx_path: str,
     sheets: List[str],
@@ -139,104 +122,139 @@ def ingest_images(
     delay: float,
     resume: bool,
     dry_run: bool,
-):
+    staging_db: Optional[str] = None,
+    stats: Optional[StageRecorder] = None,
+) -> Dict[str, int]:
+    """Ingest every sheet; returns run counters (rows by status, images, bytes downloaded)."""
+    stats = stats or StageRecorder()
+    counts = {"rows_ok": 0, "rows_error": 0, "rows_skip": 0, "images": 0, "bytes_downloaded": 0}
     cfg = _load_b2_config()
-    bucket = _b2_connect(cfg)
+    with stats.stage("connect"):
+        bucket = _b2_connect(cfg)
 
-    wb = load_workbook(xlsx_path)
+    with stats.stage("open_workbook"):
+        wb = open_workbook(xlsx_path, staging_db) if staging_db else load_workbook(xlsx_path)
+    # staging store: commit each row as it is done instead of once per sheet
+    row_commits = getattr(wb, "commits_per_row", False)
     found_any = False
 
+    def tally(status: str, images: int = 0, nbytes: int = 0) -> None:
+        counts[f"rows_{status}"] += 1
+        counts["images"] += images
+        counts["bytes_downloaded"] += nbytes
+
     for sheet_name in sheets:
         if sheet_name not in wb.sheetnames:
             continue
         found_any = True
         ws = wb[sheet_name]
 
-        headers = _ensure_columns(ws, [
-            "source",
-            "source_listing_id",
-            "listing_url",
-            "images_json",
-            "b2_images_json",
-            "b2_status",
-            "b2_error",
-            "updated_at",
-        ])
-
-        processed = 0
-        for r in range(2, ws.max_row + 1):
-            if limit and processed >= limit:
-                break
-
-            source = str(_row_get(ws, r, headers, "source") or "").strip()
-            listing_id = str(_row_get(ws, r, headers, "source_listing_id") or "").strip()
-            listing_url = str(_row_get(ws, r, headers, "listing_url") or "").strip()
-            images_val = _row_get(ws, r, headers, "images_json")
-            b2_existing = _safe_json_loads(_row_get(ws, r, headers, "b2_images_json"))
-
-            if not source or not listing_id or not images_val:
-                continue
-
-            if resume and b2_existing:
-                _row_set(ws, r, headers, "b2_status", "SKIP")
-                continue
-
-            images = _safe_json_loads(images_val)
-            if not isinstance(images, list) or not images:
-                continue
-
-            out: List[Dict[str, Any]] = []
-            try:
-                for idx, img_url in enumerate(images, start=1):
-                    if not isinstance(img_url, str) or not img_url.strip():
-                        continue
-                    img_url = img_url.strip()
-
-                    if dry_run:
-                        # fake sha1 for deterministic key even in dry-run
-                        sha1 = _sha1_bytes(img_url.encode("utf-8"))
-                        ct = _guess_content_type(img_url)
+        with stats.stage(sheet_name) as st:
+            index = WorksheetIndex(ws)
+            index.ensure_columns([
+                "source",
+                "source_listing_id",
+                "listing_url",
+                "images_json",
+                "b2_images_json",
+                "b2_status",
+                "b2_error",
+                "updated_at",
+            ])
+
+            processed = 0
+            bytes_before = counts["bytes_downloaded"]
+            for r in index.data_rows():
+                if limit and processed >= limit:
+                    break
+
+                source = str(index.get(r, "source") or "").strip()
+                listing_id = str(index.get(r, "source_listing_id") or "").strip()
+                listing_url = str(index.get(r, "listing_url") or "").strip()
+                images_val = index.get(r, "images_json")
+                b2_existing = _safe_json_loads(index.get(r, "b2_images_json"))
+
+                if not source or not listing_id or not images_val:
+                    continue
+
+                if resume and b2_existing:
+                    index.set(r, "b2_status", "SKIP")
+                    tally("skip")
+                    if row_commits:
+                        wb.save(xlsx_path)
+                    continue
+
+                images = _safe_json_loads(images_val)
+                if not isinstance(images, list) or not images:
+                    continue
+
+                out: List[Dict[str, Any]] = []
+                uploaded = 0
+                row_bytes = 0
+                try:
+                    for idx, img_url in enumerate(images, start=1):
+                        if not isinstance(img_url, str) or not img_url.strip():
+                            continue
+                        img_url = img_url.strip()
+
+                        if dry_run:
+                            # fake sha1 for deterministic key even in dry-run
+                            sha1 = _sha1_bytes(img_url.encode("utf-8"))
+                            ct = _guess_content_type(img_url)
+                            key = _b2_key(cfg.prefix, source, listing_id, idx, sha1, ct)
+                            out.append({"b2_key": key, "file_name": os.path.basename(key), "content_type": ct, "source_url": img_url})
+                            continue
+
+                        data, ct = _download_image(img_url)
+                        row_bytes += len(data)
+                        sha1 = _sha1_bytes(data)
                         key = _b2_key(cfg.prefix, source, listing_id, idx, sha1, ct)
+
+                        # Upload (small files: upload_bytes)
+                        bucket.upload_bytes(
+                            data,
+                            file_name=key,
+                            content_type=ct,
+                            file_info={
+                                "source": source,
+                                "source_listing_id": listing_id,
+                                "listing_url": listing_url,
+                                "source_url": img_url,
+                                "sha1": sha1,
+                            },
+                        )
                         out.append({"b2_key": key, "file_name": os.path.basename(key), "content_type": ct, "source_url": img_url})
-                        continue
-
-                    data, ct = _download_image(img_url)
-                    sha1 = _sha1_bytes(data)
-                    key = _b2_key(cfg.prefix, source, listing_id, idx, sha1, ct)
-
-                    # Upload (small files: upload_bytes)
-                    bucket.upload_bytes(
-                        data,
-                        file_name=key,
-                        content_type=ct,
-                        file_info={
-                            "source": source,
-                            "source_listing_id": listing_id,
-                            "listing_url": listing_url,
-                            "source_url": img_url,
-                            "sha1": sha1,
-                        },
-                    )
-                    out.append({"b2_key": key, "file_name": os.path.basename(key), "content_type": ct, "source_url": img_url})
-
-                    time.sleep(delay)
-
-                _row_set(ws, r, headers, "b2_images_json", json.dumps(out, ensure_ascii=False))
-                _row_set(ws, r, headers, "b2_status", "OK")
-                _row_set(ws, r, headers, "b2_error", "")
-                _row_set(ws, r, headers, "updated_at", time.strftime("%Y-%m-%dT%H:%M:%S"))
-
-            except Exception as e:
-                _row_set(ws, r, headers, "b2_status", "ERROR")
-                _row_set(ws, r, headers, "b2_error", str(e))
-                _row_set(ws, r, headers, "updated_at", time.strftime("%Y-%m-%dT%H:%M:%S"))
-
-            processed += 1
-
-        wb.save(xlsx_path)
+                        uploaded += 1
+
+                        time.sleep(delay)
+
+                    index.set(r, "b2_images_json", json.dumps(out, ensure_ascii=False))
+                    index.set(r, "b2_status", "OK")
+                    index.set(r, "b2_error", "")
+                    index.set(r, "updated_at", time.strftime("%Y-%m-%dT%H:%M:%S"))
+                    status = "ok"
+
+                except Exception as e:
+                    index.set(r, "b2_status", "ERROR")
+                    index.set(r, "b2_error", str(e))
+                    index.set(r, "updated_at", time.strftime("%Y-%m-%dT%H:%M:%S"))
+                    status = "error"
+
+                tally(status, uploaded, row_bytes)
+                processed += 1
+                if row_commits:
+                    wb.save(xlsx_path)
+
+            st.rows = processed
+            st.bytes = counts["bytes_downloaded"] - bytes_before
+
+        # its own top-level stage, so the sheet stage above is row work only
+        with stats.stage("save"):
+            wb.save(xlsx_path)
 
     if not found_any:
         raise RuntimeError(f"No detail sheets found. Looked for: {sheets}. Workbook sheets: {wb.sheetnames}")
+    return counts
 
 def main():
     p = argparse.ArgumentParser()
@@ -247,10 +265,30 @@ def main():
     p.add_argument("--delay", type=float, default=0.5, help="Delay between image uploads (seconds).")
     p.add_argument("--resume", action="store_true", help="Skip rows that already have b2_images_json.")
     p.add_argument("--dry-run", action="store_true", help="Do not download/upload; just compute expected B2 keys.")
+    p.add_argument("--staging-db", default="", help="Read/write the SQLite staging store instead of the workbook (seeded from --xlsx).")
+    p.add_argument("--run-report", default=DEFAULT_RUN_REPORT, help="Where to write the JSON run report.")
+    add_profile_args(p)
     args = p.parse_args()
 
     sheets = [s.strip() for s in args.sheets.split(",") if s.strip()]
-    ingest_images(args.xlsx, sheets, args.limit, args.delay, args.resume, args.dry_run)
+    stats = StageRecorder(trace_memory=args.trace_memory)
+    profiler = start_profiler(args.profile, "b2_ingest_images")
+    counts = ingest_images(args.xlsx, sheets, args.limit, args.delay, args.resume, args.dry_run, args.staging_db or None, stats)
+
+    report: Dict[str, Any] = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "xlsx": args.xlsx,
+        "sheets": sheets,
+        "dry_run": args.dry_run,
+        "counts": counts,
+        "metrics": stats.report(),
+    }
+    if profiler:
+        report["profile"] = profiler.finish()
+    os.makedirs(os.path.dirname(os.path.abspath(args.run_report)), exist_ok=True)
+    with open(args.run_report, "w", encoding="utf-8") as f:
+        f.write(json.dumps(report, indent=2, ensure_ascii=False, sort_keys=True) + "\n")
+    print(" ".join(f"{k}={v}" for k, v in counts.items()) + f" report={args.run_report}")
 
 if __name__ == "__main__":
     main()
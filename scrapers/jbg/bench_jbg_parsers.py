@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Parity check + micro-benchmark for the JBG HTML extractors (BeautifulSoup vs lxml).
+
+Runs both parsers over saved pages, fails if any output differs, then reports
+per-page parse time for each, plus the structured-data-first detail path
+(JSON-LD / page state, DOM fallback) that the scraper uses by default.
+
+Pages come from fixtures/pages/ (file name prefix decides the kind:
+jbg_catalog_* or jbg_detail_*) and, optionally, from the raw-HTML archive.
+
+Usage:
+python bench_jbg_parsers.py
+python bench_jbg_parsers.py --archive-dir .page_archive --limit 300 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from jbg_master_scraper import (
+    extract_catalog_products,
+    extract_catalog_products_lxml,
+    parse_detail_page,
+    parse_detail_page_lxml,
+    parse_detail_structured_lxml,
+)
+from page_archive import PageArchive
+
+
+DEFAULT_PAGES_DIR = Path(__file__).resolve().parent / "fixtures" / "pages"
+BASE_URL = "https://www.justballgloves.com/products/"
+
+PARSERS: Dict[str, Tuple[Callable, Callable]] = {
+    "catalog": (extract_catalog_products, extract_catalog_products_lxml),
+    "detail": (parse_detail_page, parse_detail_page_lxml),
+}
+
+
+def load_pages(pages_dir: Path, archive_dir: str, limit: int) -> List[Tuple[str, str, str, str]]:
+    """Return [(label, kind, url, html)]."""
+    pages = []
+    for path in sorted(pages_dir.glob("jbg_*.html")):
+        kind = "catalog" if path.name.startswith("jbg_catalog") else "detail"
+        pages.append((path.name, kind, BASE_URL, path.read_text(encoding="utf-8")))
+    if archive_dir:
+        archive = PageArchive(archive_dir)
+        for archive_kind, kind in (("jbg_catalog", "catalog"), ("jbg_detail", "detail")):
+            for n, page in enumerate(archive.iter_latest(archive_kind)):
+                if limit and n >= limit:
+                    break
+                pages.append((page.url, kind, page.url, page.html))
+    return pages
+
+
+def time_parser(fn: Callable, html: str, url: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(html, url)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Parity + timing for soup vs lxml JBG extractors")
+    p.add_argument("--pages-dir", default=str(DEFAULT_PAGES_DIR))
+    p.add_argument("--archive-dir", default="", help="Also use archived jbg_catalog/jbg_detail pages")
+    p.add_argument("--limit", type=int, default=200, help="Max archived pages per kind (0 = all)")
+    p.add_argument("--repeat", type=int, default=10, help="Timing repeats per page (best-of)")
+    args = p.parse_args()
+
+    pages = load_pages(Path(args.pages_dir), args.archive_dir, args.limit)
+    if not pages:
+        print("[ERROR] no pages found")
+        raise SystemExit(2)
+
+    mismatches = 0
+    for label, kind, url, html in pages:
+        soup_fn, lxml_fn = PARSERS[kind]
+        expected = soup_fn(html, url)
+        got = lxml_fn(html, url)
+        if got != expected:
+            mismatches += 1
+            print(f"[MISMATCH] {kind} {label}")
+            print("  soup:", json.dumps(expected, ensure_ascii=False, sort_keys=True)[:800])
+            print("  lxml:", json.dumps(got, ensure_ascii=False, sort_keys=True)[:800])
+    if mismatches:
+        print(f"[ERROR] {mismatches}/{len(pages)} pages differ between parsers")
+        raise SystemExit(2)
+    print(f"[OK] parity on {len(pages)} pages")
+
+    for kind in ("catalog", "detail"):
+        subset = [(label, url, html) for label, k, url, html in pages if k == kind]
+        if not subset:
+            continue
+        soup_fn, lxml_fn = PARSERS[kind]
+        soup_ms = [time_parser(soup_fn, html, url, args.repeat) * 1000 for _, url, html in subset]
+        lxml_ms = [time_parser(lxml_fn, html, url, args.repeat) * 1000 for _, url, html in subset]
+        soup_med = statistics.median(soup_ms)
+        lxml_med = statistics.median(lxml_ms)
+        line = (
+            f"[BENCH] {kind}: pages={len(subset)} soup={soup_med:.2f}ms/page lxml={lxml_med:.2f}ms/page "
+            f"speedup={soup_med / lxml_med if lxml_med else float('inf'):.1f}x"
+        )
+        if kind == "detail":
+            sd_ms = [time_parser(parse_detail_structured_lxml, html, url, args.repeat) * 1000 for _, url, html in subset]
+            line += f" structured+lxml={statistics.median(sd_ms):.2f}ms/page"
+            # where the structured price disagrees with the DOM guess (e.g. promo "Save $20" text)
+            for label, url, html in subset:
+                dom_price = soup_fn(html, url).get("price_detail")
+                sd_price = parse_detail_structured_lxml(html, url).get("price_detail")
+                if dom_price != sd_price:
+                    print(f"[PRICE] {label}: dom={dom_price} structured={sd_price}")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for the library import pipeline on synthetic workbooks.
+
+For each --sizes row count, generates (once, cached in --work-dir) a seeded
+synthetic workbook with synthetic_workbook.py, then times the export stages
+on it:
+
+- validate_workbook (parse + snapshot the XLSX, row checks)
+- build_exports (snapshot load, source rows, normalize, media manifest)
+- serialize (JSONL lines for the normalized / raw / manifest exports)
+- write (export_shards.write_export of the three files)
+
+Every run happens in a fresh process, so peak RSS belongs to that workbook
+size alone; with --repeat N the fastest run's times are kept. Per stage (and
+nested sub-stage, e.g. build_exports.normalize) the baseline records wall and
+CPU seconds, rows/sec, bytes/sec and peak RSS (plus the Python-heap peak with
+--trace-memory), together with the commit, host and parameters, in a JSON file
+(default .bench/library_import_<commit>.json).
+
+--compare OLD.json prints the change per stage against an earlier baseline and
+exits 1 when a stage got slower (or its peak RSS grew) by more than
+--threshold. Compare baselines taken on the same machine with the same
+--seed; the generator version is recorded so a changed workbook shape shows up
+as a parameter mismatch rather than a regression.
+
+Usage:
+python bench_library_import.py --sizes 1000,10000
+python bench_library_import.py --sizes 10000,100000 --repeat 3 --compare .bench/library_import_5c043cf.json
+python bench_library_import.py --sizes 1000000 --repeat 1 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import openpyxl
+
+from export_shards import write_export
+from library_import import EXPORT_BASES, _json_line, build_exports, validate_workbook
+from run_stats import StageRecorder
+from synthetic_workbook import GENERATOR_VERSION, generate_workbook
+
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_WORK_DIR = HERE / ".bench"
+BASELINE_SCHEMA = 1
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", *args], cwd=HERE, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def synthetic_workbook(work_dir: Path, rows: int, seed: int) -> Path:
+    """Cached synthetic workbook for (rows, seed, generator version)."""
+    path = work_dir / f"synthetic_{rows}_s{seed}_v{GENERATOR_VERSION}.xlsx"
+    if not path.exists():
+        started = time.perf_counter()
+        tmp = path.with_suffix(".tmp.xlsx")
+        generate_workbook(str(tmp), rows, seed)
+        os.replace(tmp, path)
+        print(f"[bench] generated {path.name} in {time.perf_counter() - started:.1f}s")
+    return path
+
+
+def measure(xlsx: str, rows: int, workers: int, trace_memory: bool) -> Dict[str, Any]:
+    """One pass over the export stages of `xlsx`; runs in its own process."""
+    scratch = tempfile.mkdtemp(prefix="bench_library_import_")
+    try:
+        snapshot_dir = os.path.join(scratch, "snapshots")
+        out = Path(scratch) / "out"
+        out.mkdir()
+        stats = StageRecorder(trace_memory=trace_memory)
+
+        with stats.stage("validate_workbook", rows=rows, bytes=os.path.getsize(xlsx)):
+            validation = validate_workbook(xlsx, snapshot_dir, stats)
+        if not validation.ok:
+            raise RuntimeError(f"synthetic workbook failed validation: {validation.errors[:5]}")
+
+        with stats.stage("build_exports", rows=rows):
+            exports = build_exports(xlsx, b2_prefix="gloveiq", snapshot_dir=snapshot_dir, workers=workers, stats=stats)
+        pks = [listing["listing_pk"] for listing in exports["listings"]]
+
+        with stats.stage("serialize", rows=len(pks)) as st:
+            lines = {
+                "normalized": [_json_line(r) for r in exports["listings"]],
+                "raw": [_json_line(r) for r in exports["raw_rows"]],
+                "manifest": [_json_line(r) for r in exports["media_manifest"]],
+            }
+            st.bytes = sum(len(line) for part in lines.values() for line in part)
+
+        with stats.stage("write", rows=len(pks)) as st:
+            files = {name: write_export(out, EXPORT_BASES[name], pks, lines[name]) for name in lines}
+            st.bytes = sum(e["bytes"] for entries in files.values() for e in entries)
+
+        result = stats.report()
+        result["listings"] = len(pks)
+        return result
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def _measure_in_child(xlsx: str, rows: int, workers: int, trace_memory: bool) -> Dict[str, Any]:
+    # spawn, not fork: a forked child would start with the parent's resident pages
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(measure, xlsx, rows, workers, trace_memory).result()
+
+
+def _best_of(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per stage: the fastest run's timings and throughput, the highest memory seen in any run."""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for run in runs:
+        for st in run["stages"]:
+            name = st["name"]
+            best = stages.get(name)
+            if best is None or st["wall_s"] < best["wall_s"]:
+                keep = {k: v for k, v in st.items() if k != "name"}
+                keep["wall_s_runs"] = (best or {}).get("wall_s_runs", [])
+                if best is not None:
+                    keep["rss_peak_mb"] = max(best["rss_peak_mb"] or 0, st["rss_peak_mb"] or 0)
+                    if "py_peak_mb" in best:
+                        keep["py_peak_mb"] = max(best["py_peak_mb"], st.get("py_peak_mb", 0))
+                stages[name] = best = keep
+            else:
+                best["rss_peak_mb"] = max(best["rss_peak_mb"] or 0, st["rss_peak_mb"] or 0)
+                if "py_peak_mb" in st:
+                    best["py_peak_mb"] = max(best.get("py_peak_mb", 0), st["py_peak_mb"])
+            best["wall_s_runs"].append(st["wall_s"])
+    return {
+        "listings": runs[0]["listings"],
+        "wall_s": min(r["wall_s"] for r in runs),
+        "peak_rss_mb": max(r["peak_rss_mb"] or 0 for r in runs),
+        "stages": stages,
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float, min_seconds: float) -> int:
+    """Print per-stage changes from `old` to `new`; returns the number of regressions."""
+    for key in ("seed", "generator_version", "workers"):
+        if old["params"].get(key) != new["params"].get(key):
+            print(f"[WARN] {key} differs: baseline={old['params'].get(key)} now={new['params'].get(key)}; numbers are not comparable")
+    if old.get("host", {}).get("machine") != new["host"]["machine"] or old.get("host", {}).get("cpu_count") != new["host"]["cpu_count"]:
+        print("[WARN] baseline was taken on a different host")
+
+    regressions = 0
+    print(f"[COMPARE] against {old.get('commit') or '?'} ({old.get('generated_at')})")
+    for size, cur in new["sizes"].items():
+        base = old["sizes"].get(size)
+        if base is None:
+            print(f"  {size} rows: not in baseline")
+            continue
+        for name, st in cur["stages"].items():
+            was = base["stages"].get(name)
+            if was is None:
+                continue
+            ratio = st["wall_s"] / was["wall_s"] if was["wall_s"] else 1.0
+            slower = ratio > 1 + threshold and st["wall_s"] - was["wall_s"] > min_seconds
+            old_rss, new_rss = was.get("rss_peak_mb") or 0, st.get("rss_peak_mb") or 0
+            bigger = old_rss and new_rss > old_rss * (1 + threshold)
+            flag = " REGRESSION" if slower or bigger else ""
+            regressions += bool(flag)
+            print(
+                f"  {size:>8} {name:<34} {was['wall_s']:9.3f}s -> {st['wall_s']:9.3f}s ({ratio:5.2f}x) "
+                f"rss {old_rss:7.1f} -> {new_rss:7.1f} MB{flag}"
+            )
+    return regressions
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Time validate / build / serialize / write on synthetic workbooks and record a JSON baseline")
+    p.add_argument("--sizes", default="1000,10000", help="Comma-separated source row counts, e.g. 10000,100000,1000000")
+    p.add_argument("--seed", type=int, default=0, help="Synthetic workbook seed (keep it fixed across commits)")
+    p.add_argument("--repeat", type=int, default=3, help="Runs per size, each in a fresh process; the fastest is kept")
+    p.add_argument("--workers", type=int, default=1, help="build_exports normalize workers")
+    p.add_argument("--trace-memory", action="store_true", help="Also record the Python-heap peak per stage (tracemalloc; inflates the times)")
+    p.add_argument("--work-dir", default=str(DEFAULT_WORK_DIR), help="Where synthetic workbooks and baselines are kept")
+    p.add_argument("--out", default="", help="Baseline JSON to write (default: <work-dir>/library_import_<commit>.json)")
+    p.add_argument("--compare", default="", help="Earlier baseline JSON to compare against (exit 1 on regression)")
+    p.add_argument("--threshold", type=float, default=0.25, help="Relative slowdown / RSS growth that counts as a regression")
+    p.add_argument("--min-seconds", type=float, default=0.05, help="Ignore slowdowns smaller than this many seconds (timer noise)")
+    args = p.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    work_dir = Path(args.work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    commit = _git("rev-parse", "--short", "HEAD")
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+
+    baseline: Dict[str, Any] = {
+        "schema": BASELINE_SCHEMA,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": commit,
+        "dirty": dirty,
+        "host": {
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "openpyxl": openpyxl.__version__,
+        },
+        "params": {
+            "seed": args.seed,
+            "generator_version": GENERATOR_VERSION,
+            "repeat": args.repeat,
+            "workers": args.workers,
+            "trace_memory": args.trace_memory,
+        },
+        "sizes": {},
+    }
+
+    for rows in sizes:
+        xlsx = synthetic_workbook(work_dir, rows, args.seed)
+        runs = [_measure_in_child(str(xlsx), rows, args.workers, args.trace_memory) for _ in range(max(1, args.repeat))]
+        result = _best_of(runs)
+        result["workbook_bytes"] = xlsx.stat().st_size
+        baseline["sizes"][str(rows)] = result
+        top = " ".join(
+            f"{name}={st['wall_s']:.2f}s({st.get('rows_per_s') or 0:,.0f}/s)" for name, st in result["stages"].items() if "." not in name
+        )
+        print(f"[BENCH] {rows} rows -> {result['listings']} listings: {top} peak_rss={result['peak_rss_mb']}MB")
+
+    out = Path(args.out) if args.out else work_dir / f"library_import_{commit or 'nogit'}{'-dirty' if dirty else ''}.json"
+    out.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"[bench] wrote {out}")
+
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(old, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"[ERROR] {regressions} stage(s) regressed by more than {args.threshold:.0%}")
+            raise SystemExit(1)
+        print("[OK] no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Parity check + micro-benchmark for glove_normalize (compiled/memoized) vs the
+previous per-call field normalizers.
+
+Takes every exportable row of a workbook, pulls out the fields the normalizers
+see (title, size / throwing hand / position text), and runs both the legacy
+implementations below and glove_normalize over them. Fails if any result
+differs (SidelineSwap normalize_specs included), then reports rows/sec for the
+field pass before and after, and for a full normalize_batch over the rows.
+
+Usage:
+python bench_normalize.py
+python bench_normalize.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import glove_normalize as gn
+from library_import import _iter_source_rows
+from workbook_snapshot import DEFAULT_SNAPSHOT_DIR, load_snapshot
+
+
+DEFAULT_XLSX = Path(__file__).resolve().parent / "GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx"
+
+# --- previous implementations (library_import.py / ss_master_scraper.py before glove_normalize) ---
+
+
+def legacy_throw(v: Optional[str]) -> Optional[str]:
+    s = (gn.clean(v) or "").lower()
+    if not s:
+        return None
+    if "rht" in s or "right" in s:
+        return "RHT"
+    if "lht" in s or "left" in s:
+        return "LHT"
+    return "UNK"
+
+
+def legacy_position(v: Optional[str]) -> Optional[str]:
+    s = (gn.clean(v) or "").lower()
+    if not s:
+        return None
+    if "outfield" in s or s == "of":
+        return "OF"
+    if "infield" in s or s == "if":
+        return "IF"
+    if "pitch" in s:
+        return "P"
+    if "catch" in s:
+        return "C"
+    if "1b" in s or "first" in s:
+        return "1B"
+    if "middle" in s or "ss" in s or "2b" in s:
+        return "MI"
+    if "utility" in s:
+        return "Utility"
+    return gn.clean(v)
+
+
+def legacy_size(text: Optional[str]) -> Optional[float]:
+    s = gn.clean(text)
+    if not s:
+        return None
+    m = re.search(r"(\d{1,2}\.\d{1,2})", s)
+    if m:
+        return gn.safe_float(m.group(1))
+    m = re.search(r"(\d{1,2})\s*[\-\s]\s*(\d)\s*/\s*(\d)", s)
+    if m:
+        return float(m.group(1)) + (float(m.group(2)) / float(m.group(3)))
+    m = re.search(r"(\d{1,2}(?:\.\d+)?)\s*\"", s)
+    if m:
+        return gn.safe_float(m.group(1))
+    return None
+
+
+def legacy_brand(title: Optional[str]) -> Optional[str]:
+    t = (gn.clean(title) or "").lower()
+    for brand in gn.KNOWN_BRANDS:
+        if brand.lower() in t:
+            return brand
+    return None
+
+
+def legacy_model(title: Optional[str]) -> Optional[str]:
+    t = gn.clean(title)
+    if not t:
+        return None
+    m = re.search(r"\[Model:\s*([^\]]+)\]", t, re.I)
+    if m:
+        return gn.clean(m.group(1))
+    m = re.search(r"\(([A-Z0-9\-]{5,})\)\s*$", t)
+    if m:
+        return gn.clean(m.group(1))
+    return None
+
+
+def legacy_images(v: Any) -> List[str]:
+    arr = gn.safe_json(v, [])
+    out: List[str] = []
+    if not isinstance(arr, list):
+        return out
+    seen = set()
+    for item in arr:
+        u = gn.clean(item)
+        if not u or not (u.startswith("http://") or u.startswith("https://")):
+            continue
+        if u in seen:
+            continue
+        seen.add(u)
+        out.append(u)
+    return out
+
+
+def legacy_slug(s: Optional[str]) -> str:
+    raw = (gn.clean(s) or "unknown").lower()
+    return re.sub(r"[^a-z0-9]+", "-", raw).strip("-") or "unknown"
+
+
+def legacy_record_type(source: str, model_code: Optional[str], title: Optional[str]) -> str:
+    text = " ".join([source or "", model_code or "", title or ""]).lower()
+    if any(m in text for m in ["custom", "one of one", "1/1", "game used", "player issued", "modified", "re-lace", "relace"]):
+        return "artifact"
+    if model_code and gn.clean(model_code) and gn.clean(model_code) != "Unknown":
+        return "variant"
+    return "variant" if source.upper() in {"JBG", "JUSTBALLGLOVES"} else "artifact"
+
+
+def legacy_ss_specs(specs: Dict[str, Any], title: Optional[str]) -> Dict[str, Any]:
+    def clean(s: Any) -> str:
+        return re.sub(r"\s+", " ", (s or "").strip())
+
+    def size(text: str) -> Optional[float]:
+        t = clean(text)
+        if not t:
+            return None
+        m = re.search(r"(\d{1,2}\.\d{1,2})", t)
+        if m:
+            return float(m.group(1))
+        m = re.search(r"(\d{1,2})\s*(?:-|\s)\s*(\d)\s*/\s*(\d)", t)
+        if m:
+            return float(m.group(1)) + (float(m.group(2)) / float(m.group(3)))
+        return None
+
+    def throw(v: str) -> str:
+        v = clean(v).lower()
+        if "right" in v and "throw" in v:
+            return "RHT"
+        if "left" in v and "throw" in v:
+            return "LHT"
+        return "UNK"
+
+    def position(v: str) -> Optional[str]:
+        v = clean(v).lower()
+        if "outfield" in v or v == "of":
+            return "OF"
+        if "infield" in v or v == "if":
+            return "IF"
+        if "pitch" in v:
+            return "P"
+        if "catch" in v:
+            return "C"
+        if "first" in v or "1b" in v:
+            return "1B"
+        if "middle" in v or "ss" in v or "2b" in v:
+            return "MI"
+        return clean(v).upper() if v else None
+
+    lower = {clean(k).lower(): v for k, v in (specs or {}).items()}
+
+    def get(*keys: str) -> Any:
+        for k in keys:
+            if k in lower and lower[k]:
+                return lower[k]
+        return None
+
+    size_raw, throw_raw, pos_raw, web_raw = get("size", "glove size"), get("throwing hand", "throws"), get("position"), get("web", "web type")
+    return {
+        "raw": specs,
+        "norm": {
+            "size_in": size(str(size_raw)) if size_raw else None,
+            "throw_hand": throw(str(throw_raw)) if throw_raw else "UNK",
+            "position": position(str(pos_raw)) if pos_raw else None,
+            "web": clean(str(web_raw)) if web_raw else None,
+            "title": clean(str(title)) if title else None,
+            "source": "SS",
+        },
+    }
+
+
+FieldInputs = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str], Any]
+
+
+def field_inputs(source_rows: List[gn.SourceRow]) -> List[FieldInputs]:
+    """(source, title, size text, throwing-hand text, position text, images_json) per row, as the normalizers receive them."""
+    out = []
+    for sheet, _, row, cat in source_rows:
+        if sheet == "Catalog":
+            norm = gn.safe_json(row.get("normalized_json"), {})
+            norm = norm.get("norm", {}) if isinstance(norm, dict) else {}
+            norm = norm if isinstance(norm, dict) else {}
+            title = gn.clean(row.get("title")) or gn.clean(norm.get("title"))
+            out.append(("SS", title, gn.clean(norm.get("size_in")), gn.clean(norm.get("throw_hand")), gn.clean(norm.get("position")), row.get("images_json")))
+            continue
+        profile = gn.safe_json(row.get("glove_profile_json"), {})
+        texts: Dict[str, Optional[str]] = {"size": None, "throw": None, "position": None}
+        for k, v in (profile.items() if isinstance(profile, dict) else []):
+            lk = (gn.clean(k) or "").lower()
+            for key, needles in (("size", ("size",)), ("throw", ("throw", "hand")), ("position", ("position",))):
+                if any(n in lk for n in needles) and not texts[key]:
+                    texts[key] = gn.clean(v)
+        title = gn.clean(row.get("title")) or gn.clean(cat.get("catalog_title"))
+        out.append((gn.clean(cat.get("source")) or "JBG", title, texts["size"], texts["throw"], texts["position"], row.get("images_json")))
+    return out
+
+
+def legacy_fields(item: FieldInputs) -> Tuple[Any, ...]:
+    source, title, size_text, throw_text, pos_text, images = item
+    model = legacy_model(title)
+    size = legacy_size(size_text) or legacy_size(title)
+    return (
+        legacy_brand(title),
+        model,
+        size,
+        legacy_throw(throw_text),
+        legacy_position(pos_text),
+        legacy_slug(title),
+        legacy_record_type(source, model, title),
+        legacy_images(images),
+    )
+
+
+def compiled_fields(item: FieldInputs) -> Tuple[Any, ...]:
+    source, title, size_text, throw_text, pos_text, images = item
+    model = gn.infer_model(title, None)
+    size = gn.size_from_spec(size_text) or gn.extract_size_in(title)
+    return (
+        gn.infer_brand(title, None),
+        model,
+        size,
+        gn.norm_throw(throw_text),
+        gn.norm_position(pos_text),
+        gn.slug(title),
+        gn.record_type_from_listing(source=source, condition=None, model_code=model, title=title),
+        gn.norm_images(images),
+    )
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    gc.collect()
+    gc.disable()  # allocation-heavy; a collection landing in one pass skews best-of
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    return best
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Parity + rows/sec for glove_normalize vs the previous field normalizers")
+    p.add_argument("--xlsx", default=str(DEFAULT_XLSX), help="Workbook whose rows are normalized")
+    p.add_argument("--repeat", type=int, default=10, help="Timing repeats (best-of)")
+    p.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR, help="Parsed-workbook cache shared with library_import")
+    args = p.parse_args()
+
+    wb = load_snapshot(args.xlsx, args.snapshot_dir)
+    counters: Dict[str, int] = {"Catalog": 0, "JBG_Full_Catalog": 0, "JBG_Detail_Enrichment": 0}
+    source_rows = list(_iter_source_rows(wb, [], counters))
+    items = field_inputs(source_rows)
+    # titles mentioning several brands, or brands inside other words, exercise the rank rule
+    items += [("SS", t, None, None, None, '[" https://a/1.jpg", "https://a/1.jpg", "ftp://x", null, 7, ""]') for t in ("Rawlings glove, Wilson web", "Nike x Wilson", "nokonaSSK", "All Star 44 Pro Mizuno")]
+    if not items:
+        print("[ERROR] no rows found")
+        raise SystemExit(2)
+
+    mismatches = 0
+    for item in items:
+        expected, got = legacy_fields(item), compiled_fields(item)
+        if expected != got:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"[MISMATCH] {item}\n  legacy:   {expected}\n  compiled: {got}")
+    specs = [(gn.safe_json(row.get("normalized_json"), {}).get("raw") or {}, row.get("title")) for sheet, _, row, _ in source_rows if sheet == "Catalog"]
+    specs += [({"Glove Size": "11 1/2", "Throws": "Right Hand Throw", "Position": "utility", "Web Type": " I-Web "}, "  Wilson  A2000 ")]
+    for spec, title in specs:
+        if isinstance(spec, dict) and legacy_ss_specs(spec, title) != gn.normalize_specs(spec, title):
+            mismatches += 1
+            print(f"[MISMATCH] normalize_specs {spec} {title!r}")
+    if mismatches:
+        print(f"[ERROR] {mismatches} rows differ from the previous normalizers")
+        raise SystemExit(2)
+    print(f"[OK] parity on {len(items)} rows and {len(specs)} SS spec maps")
+
+    t_legacy = best_of(lambda: [legacy_fields(i) for i in items], args.repeat)
+    t_compiled = best_of(lambda: [compiled_fields(i) for i in items], args.repeat)
+    t_batch = best_of(lambda: gn.normalize_batch(source_rows), args.repeat)
+    n = len(items)
+    print(
+        f"[BENCH] field pass: legacy={n / t_legacy:,.0f} rows/s compiled={n / t_compiled:,.0f} rows/s "
+        f"speedup={t_legacy / t_compiled:.1f}x"
+    )
+    print(f"[BENCH] normalize_batch: {len(source_rows)} rows in {t_batch:.3f}s ({len(source_rows) / t_batch:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Correctness check + micro-benchmark for the glove_taxonomy automaton.
+
+Runs every workbook title (plus a few edge cases) through the Aho-Corasick
+automaton and through a plain per-alias scan (str.find for every alias, same
+word-boundary rule) and fails if the two find different hits. Then times both
+on the bundled taxonomy and on the taxonomy padded with synthetic aliases, to
+show the automaton's cost tracks title length, not dictionary size, and
+prints how many titles got a brand / series / pattern / web.
+
+Usage:
+python bench_taxonomy.py
+python bench_taxonomy.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --pad 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from glove_normalize import clean
+from glove_taxonomy import AUTOMATON, TAXONOMY_PATH, Hit, TaxonomyAutomaton, Term, fold, load_taxonomy, resolve
+from library_import import _iter_source_rows
+from workbook_snapshot import DEFAULT_SNAPSHOT_DIR, load_snapshot
+
+
+DEFAULT_XLSX = Path(__file__).resolve().parent / "GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx"
+
+EDGE_CASES = [
+    "Mizuno Prospect Select",  # "pro" must not hit inside "prospect"
+    "Wilson A2000 1786SS 11.5\"",  # "1786" must not hit inside "1786ss"
+    "rawlings   GOLD  glove   elite",  # case and whitespace folding, nested aliases
+    "Custom A2000",  # series without a brand name
+    "hoh hoh-hoh",
+    "",
+]
+
+
+def scan_all(pairs: List[Tuple[str, Term]], text: str) -> List[Hit]:
+    """Reference matcher: every alias searched for separately."""
+    hits: List[Hit] = []
+    for alias, term in pairs:
+        start = text.find(alias)
+        while start >= 0:
+            end = start + len(alias)
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                hits.append((start, end, term))
+            start = text.find(alias, start + 1)
+    return hits
+
+
+def padded(extra: int) -> TaxonomyAutomaton:
+    """The bundled taxonomy plus `extra` synthetic pattern aliases that never occur in a title."""
+    base = load_taxonomy(TAXONOMY_PATH).entries
+    filler = Term("pattern", "SYNTHETIC", "Wilson")
+    return TaxonomyAutomaton(base + [(f"zq{i:06d}x", filler) for i in range(extra)])
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    return best
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Automaton vs per-alias scan: same hits, and time per title")
+    p.add_argument("--xlsx", default=str(DEFAULT_XLSX), help="Workbook whose titles are matched")
+    p.add_argument("--repeat", type=int, default=5, help="Timing repeats (best-of)")
+    p.add_argument("--pad", type=int, default=10000, help="Synthetic aliases added for the scaling run")
+    p.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR, help="Parsed-workbook cache shared with library_import")
+    args = p.parse_args()
+
+    wb = load_snapshot(args.xlsx, args.snapshot_dir)
+    counters: Dict[str, int] = {"Catalog": 0, "JBG_Full_Catalog": 0, "JBG_Detail_Enrichment": 0}
+    titles = [
+        clean(row.get("title")) or clean(cat.get("catalog_title")) or ""
+        for _, _, row, cat in _iter_source_rows(wb, [], counters)
+    ]
+    texts = [fold(t) for t in titles + EDGE_CASES]
+
+    pairs = AUTOMATON.entries
+    mismatches = 0
+    for text in texts:
+        expected: Set[Hit] = set(scan_all(pairs, text))
+        got: Set[Hit] = set(AUTOMATON.find_all(text))
+        if expected != got:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"[MISMATCH] {text!r}\n  scan:      {sorted(expected)}\n  automaton: {sorted(got)}")
+    if mismatches:
+        print(f"[ERROR] {mismatches}/{len(texts)} titles differ from the per-alias scan")
+        raise SystemExit(2)
+    print(f"[OK] automaton matches the per-alias scan on {len(texts)} titles ({len(pairs)} aliases)")
+
+    found = {"brand": 0, "series": 0, "pattern": 0, "web": 0}
+    for text in texts[: len(titles)]:
+        m = resolve(AUTOMATON.find_all(text))
+        for kind in found:
+            found[kind] += getattr(m, kind) is not None
+    print("[COVERAGE] " + " ".join(f"{kind}={n}/{len(titles)}" for kind, n in found.items()))
+
+    chars = sum(len(t) for t in texts)
+    for label, automaton in (("bundled", AUTOMATON), (f"+{args.pad} aliases", padded(args.pad))):
+        ref = automaton.entries
+        t_auto = best_of(lambda: [automaton.find_all(t) for t in texts], args.repeat)
+        t_scan = best_of(lambda: [scan_all(ref, t) for t in texts], max(1, args.repeat // 2))
+        print(
+            f"[BENCH] {label} ({len(ref)} aliases): automaton {len(texts) / t_auto:,.0f} titles/s ({chars / t_auto / 1e6:.1f} M chars/s) "
+            f"per-alias scan {len(texts) / t_scan:,.0f} titles/s speedup={t_scan / t_auto:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Persisted per-source crawl cursors for incremental catalog crawls.
+
+Mirrors `source_sync_cursors` from apps/api/db/migrations/0002_gloveiq_ingestion.sql
+(source + cursor_key -> JSON cursor_value) in a local SQLite file, plus a page
+table recording each catalog page's body fingerprint, the product ids it listed
+and its "next" link. A crawl can then:
+- skip extraction/writes for pages whose fingerprint is unchanged
+- resume an interrupted deep crawl from the saved cursor instead of page 1
+
+A detail_history table keeps, per product, the fingerprint of its last parsed
+detail page, the catalog title/price it was scraped against and how often the
+content changed between scrapes; recrawl_scheduler.py ranks refreshes from it.
+
+Callers should only record pages / advance the cursor after the workbook rows
+for those pages have been saved, otherwise a crash would mark unsaved pages as seen.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".crawl_state")
+
+
+def _now_iso() -> str:
+    return dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+
+def page_fingerprint(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class CrawlCursorStore:
+    def __init__(self, state_dir: str = DEFAULT_STATE_DIR):
+        os.makedirs(state_dir, exist_ok=True)
+        self.path = os.path.join(state_dir, "crawl_cursors.sqlite")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS source_sync_cursors (
+                source TEXT NOT NULL,
+                cursor_key TEXT NOT NULL DEFAULT 'default' CHECK (cursor_key <> ''),
+                cursor_value TEXT NOT NULL DEFAULT '{}',
+                checkpointed_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (source, cursor_key)
+            );
+            CREATE TABLE IF NOT EXISTS crawl_pages (
+                source TEXT NOT NULL,
+                page_url TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                product_ids TEXT NOT NULL DEFAULT '[]',
+                next_url TEXT,
+                seen_at TEXT NOT NULL,
+                PRIMARY KEY (source, page_url)
+            );
+            CREATE TABLE IF NOT EXISTS detail_history (
+                source TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                catalog_signature TEXT,
+                observations INTEGER NOT NULL DEFAULT 1,
+                changes INTEGER NOT NULL DEFAULT 0,
+                first_seen_at TEXT NOT NULL,
+                last_changed_at TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (source, item_id)
+            );
+            """
+        )
+
+    def get(self, source: str, cursor_key: str = "default") -> Dict[str, Any]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT cursor_value FROM source_sync_cursors WHERE source = ? AND cursor_key = ?",
+                (source, cursor_key),
+            ).fetchone()
+        if not row:
+            return {}
+        try:
+            value = json.loads(row[0])
+        except Exception:
+            return {}
+        return value if isinstance(value, dict) else {}
+
+    def save(self, source: str, cursor_key: str, value: Dict[str, Any]) -> None:
+        now = _now_iso()
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO source_sync_cursors (source, cursor_key, cursor_value, checkpointed_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(source, cursor_key) DO UPDATE SET
+                    cursor_value = excluded.cursor_value,
+                    checkpointed_at = excluded.checkpointed_at,
+                    updated_at = excluded.updated_at
+                """,
+                (source, cursor_key, json.dumps(value, ensure_ascii=False, sort_keys=True), now, now),
+            )
+
+    def get_page(self, source: str, page_url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fingerprint, product_ids, next_url, seen_at FROM crawl_pages WHERE source = ? AND page_url = ?",
+                (source, page_url),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "fingerprint": row[0],
+            "product_ids": json.loads(row[1] or "[]"),
+            "next_url": row[2],
+            "seen_at": row[3],
+        }
+
+    def record_page(
+        self,
+        source: str,
+        page_url: str,
+        fingerprint: str,
+        product_ids: List[str],
+        next_url: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO crawl_pages (source, page_url, fingerprint, product_ids, next_url, seen_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (source, page_url, fingerprint, json.dumps(product_ids), next_url, _now_iso()),
+            )
+
+    def detail_history(self, source: str) -> Dict[str, Dict[str, Any]]:
+        """{item_id: {fingerprint, catalog_signature, observations, changes, first_seen_at, last_changed_at, updated_at}}"""
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT item_id, fingerprint, catalog_signature, observations, changes,
+                       first_seen_at, last_changed_at, updated_at
+                FROM detail_history WHERE source = ?
+                """,
+                (source,),
+            ).fetchall()
+        cols = ("fingerprint", "catalog_signature", "observations", "changes", "first_seen_at", "last_changed_at", "updated_at")
+        return {r[0]: dict(zip(cols, r[1:])) for r in rows}
+
+    def record_detail(self, source: str, item_id: str, fingerprint: str, catalog_signature: Optional[str] = None) -> bool:
+        """Record one successful detail scrape; returns True if the content differs from the previous one."""
+        now = _now_iso()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fingerprint FROM detail_history WHERE source = ? AND item_id = ?",
+                (source, item_id),
+            ).fetchone()
+            if row is None:
+                self._db.execute(
+                    """
+                    INSERT INTO detail_history
+                        (source, item_id, fingerprint, catalog_signature, observations, changes, first_seen_at, last_changed_at, updated_at)
+                    VALUES (?, ?, ?, ?, 1, 0, ?, NULL, ?)
+                    """,
+                    (source, item_id, fingerprint, catalog_signature, now, now),
+                )
+                return False
+            changed = row[0] != fingerprint
+            self._db.execute(
+                """
+                UPDATE detail_history SET
+                    fingerprint = ?,
+                    catalog_signature = ?,
+                    observations = observations + 1,
+                    changes = changes + ?,
+                    last_changed_at = CASE WHEN ? THEN ? ELSE last_changed_at END,
+                    updated_at = ?
+                WHERE source = ? AND item_id = ?
+                """,
+                (fingerprint, catalog_signature, int(changed), int(changed), now, now, source, item_id),
+            )
+            return changed
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
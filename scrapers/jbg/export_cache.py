@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Row-hash index over the previous library export, for incremental re-exports.
+
+library_import.py hashes every source row (its cell values, its sheet row and,
+for JBG details, the catalog row it joins). The index written next to the
+exports maps each row hash to the listing it produced, and each retained
+listing to the line it occupies in the listings.normalized / listings.raw /
+media_manifest files (single or sharded, see export_shards.py). On the next run
+a row whose hash is unchanged takes its lines straight from the previous
+files; only new or changed rows are normalized again.
+
+The index is only trusted when it was written by the same normalizer code with
+the same B2 prefix (`signature`) and the export files still have the size and
+mtime they had when it was written; otherwise everything is rebuilt.
+
+Usage:
+    cache = ExportRowCache(out_dir, signature)
+    cache.load(["normalized", "manifest"])
+    meta = cache.meta(row_hash(sheet, r, row, catalog_row))
+    lines = cache.lines(meta["pk"], h, ["normalized", "manifest"])
+    ...
+    cache.save(rows, winners, pks_in_file_order, {"normalized": [path, ...], "manifest": [...]})
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from export_shards import read_lines
+
+
+CACHE_VERSION = 2
+INDEX_FILE = ".library_import.rows.json"
+
+
+def _hash_default(o: Any) -> str:
+    # dates/times from openpyxl; typed so "2024-01-01" text and a date cell differ
+    if isinstance(o, (dt.datetime, dt.date, dt.time)):
+        return f"{type(o).__name__}:{o.isoformat()}"
+    return f"{type(o).__name__}:{o}"
+
+
+def row_hash(*parts: Any) -> str:
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=_hash_default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _stat(path: Path) -> Optional[Dict[str, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class ExportRowCache:
+    def __init__(self, out_dir: str, signature: str):
+        self.path = Path(out_dir) / INDEX_FILE
+        self.signature = signature
+        self._rows: Dict[str, Dict[str, Any]] = {}  # row hash -> {"pk", "source", "record_type", "defaults", "images"}
+        self._winners: Dict[str, str] = {}  # listing pk -> row hash whose lines are in the files
+        self._lines: Dict[str, Dict[str, str]] = {}  # output name -> {pk: line}
+
+    def load(self, names: Iterable[str]) -> bool:
+        """Read the index and the previous lines of the `names` exports; False (empty cache) if anything doesn't line up."""
+        try:
+            index = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(index, dict) or index.get("version") != CACHE_VERSION or index.get("signature") != self.signature:
+            return False
+        pks: List[str] = index.get("pks") or []
+        lines: Dict[str, Dict[str, str]] = {}
+        recorded_outputs = index.get("outputs") or {}
+        for name in names:
+            if name not in recorded_outputs:
+                continue
+            file_lines: List[str] = []
+            for recorded in recorded_outputs[name]:
+                path = self.path.parent / recorded["file"]
+                if _stat(path) != {"size": recorded.get("size"), "mtime_ns": recorded.get("mtime_ns")}:
+                    return False
+                file_lines.extend(read_lines(path))
+            if len(file_lines) != len(pks):
+                return False
+            lines[name] = dict(zip(pks, file_lines))
+        self._rows = index.get("rows") or {}
+        self._winners = index.get("winners") or {}
+        self._lines = lines
+        return True
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def meta(self, h: str) -> Optional[Dict[str, Any]]:
+        return self._rows.get(h)
+
+    def lines(self, pk: str, h: str, names: Iterable[str]) -> Optional[Dict[str, str]]:
+        """Last run's lines for `pk` if they came from row `h` and every requested output has one."""
+        if self._winners.get(pk) != h:
+            return None
+        out = {}
+        for name in names:
+            line = self._lines.get(name, {}).get(pk)
+            if line is None:
+                return None
+            out[name] = line
+        return out
+
+    def save(
+        self,
+        rows: Dict[str, Dict[str, Any]],
+        winners: Dict[str, str],
+        pks: List[str],
+        outputs: Dict[str, List[Path]],
+    ) -> None:
+        """
+        Index the export just written (call after the output files are in
+        place). `pks` is the listing order of the lines across each export's
+        files, read in the given order.
+        """
+        index = {
+            "version": CACHE_VERSION,
+            "signature": self.signature,
+            "pks": pks,
+            "winners": winners,
+            "rows": rows,
+            "outputs": {name: [{"file": p.name, **(_stat(p) or {})} for p in paths] for name, paths in outputs.items()},
+        }
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(index, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Compressed / sharded layout for the library export files.
+
+By default each export is one plain JSONL file (listings.normalized.jsonl, ...).
+With compression and/or shards > 1 every export is split by a hash range of
+`listing_pk` and each part is compressed:
+
+    listings.normalized.00-of-08.jsonl.zst
+    listings.normalized.01-of-08.jsonl.zst
+    ...
+
+Shard of a row: the first 4 bytes of sha1(listing_pk) as a big-endian uint32 h,
+shard = h * shards // 2**32, so shard i holds the contiguous hash range
+[i * 2**32 // shards, (i + 1) * 2**32 // shards). Rows keep listing_pk order
+inside a shard, and gzip output carries no timestamp, so the same export is
+byte-identical run to run.
+
+`export_index.json` lists every file per export (shard, hash range, rows,
+bytes, sha256) so loaders can fetch and parse shards in parallel. It is
+written for the default single-file layout too.
+
+zstd needs the optional `zstandard` package (pip install zstandard).
+
+Usage:
+    files = write_export(out_dir, "listings.normalized", pks, lines, shards=8, compression="zstd")
+    write_index(out_dir, {"normalized": files}, shards=8, compression="zstd")
+    lines = read_lines(out_dir / files[0]["file"])
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for --compress zstd
+    zstandard = None
+
+
+INDEX_FILE = "export_index.json"
+INDEX_VERSION = 1
+COMPRESSIONS = ("none", "gzip", "zstd")
+SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+ZSTD_LEVEL = 3
+_HASH_SPACE = 1 << 32
+
+
+def check_compression(compression: str) -> None:
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"unknown compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError("zstd output needs the zstandard package (pip install zstandard)")
+
+
+def shard_of(pk: str, shards: int) -> int:
+    h = int.from_bytes(hashlib.sha1(pk.encode("utf-8")).digest()[:4], "big")
+    return h * shards // _HASH_SPACE
+
+
+def shard_range(shard: int, shards: int) -> List[int]:
+    """[lo, hi) of the uint32 sha1 prefix held by `shard`."""
+    return [shard * _HASH_SPACE // shards, (shard + 1) * _HASH_SPACE // shards]
+
+
+def file_name(base: str, shard: int, shards: int, compression: str) -> str:
+    if shards <= 1:
+        return f"{base}.jsonl{SUFFIXES[compression]}"
+    width = max(2, len(str(shards - 1)))
+    return f"{base}.{shard:0{width}d}-of-{shards:0{width}d}.jsonl{SUFFIXES[compression]}"
+
+
+def _file_pattern(base: str) -> "re.Pattern[str]":
+    return re.compile(re.escape(base) + r"(\.\d+-of-\d+)?\.jsonl(\.gz|\.zst)?$")
+
+
+def _write_file(path: Path, lines: Iterable[str], compression: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as raw:
+        if compression == "gzip":
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as out:
+                _write_text(out, lines)
+        elif compression == "zstd":
+            with zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False) as out:
+                _write_text(out, lines)
+        else:
+            _write_text(raw, lines)
+    tmp.replace(path)
+
+
+def _write_text(out, lines: Iterable[str], batch: int = 1000) -> None:
+    buf: List[str] = []
+    for line in lines:
+        buf.append(line)
+        if len(buf) >= batch:
+            out.write("".join(buf).encode("utf-8"))
+            buf = []
+    if buf:
+        out.write("".join(buf).encode("utf-8"))
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_export(
+    out_dir: Path,
+    base: str,
+    pks: Sequence[str],
+    lines: Sequence[str],
+    shards: int = 1,
+    compression: str = "none",
+) -> List[Dict[str, object]]:
+    """
+    Write one export (`lines[i]` belongs to `pks[i]`, both in listing_pk order)
+    and remove files of the same export left over from another layout.
+    Returns the index entries, in shard order.
+    """
+    check_compression(compression)
+    shards = max(1, shards)
+    parts: List[List[str]] = [[] for _ in range(shards)]
+    if shards == 1:
+        parts[0] = list(lines)
+    else:
+        for pk, line in zip(pks, lines):
+            parts[shard_of(pk, shards)].append(line)
+
+    entries = []
+    for shard, part in enumerate(parts):
+        name = file_name(base, shard, shards, compression)
+        path = out_dir / name
+        _write_file(path, part, compression)
+        entries.append(
+            {
+                "file": name,
+                "shard": shard,
+                "pk_hash_range": shard_range(shard, shards),
+                "rows": len(part),
+                "bytes": path.stat().st_size,
+                "sha256": _sha256(path),
+            }
+        )
+
+    keep = {e["file"] for e in entries}
+    pattern = _file_pattern(base)
+    for stale in os.listdir(out_dir):
+        if stale not in keep and pattern.match(stale):
+            os.remove(out_dir / stale)
+    return entries
+
+
+def write_index(out_dir: Path, outputs: Dict[str, List[Dict[str, object]]], shards: int, compression: str) -> Path:
+    index = {
+        "version": INDEX_VERSION,
+        "compression": compression,
+        "shards": max(1, shards),
+        "shard_key": "listing_pk",
+        "shard_hash": "uint32 big-endian of sha1(listing_pk)[:4]; shard = h * shards // 2**32",
+        "outputs": outputs,
+    }
+    path = out_dir / INDEX_FILE
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(index, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def read_lines(path: Path) -> List[str]:
+    """Lines (with their "\\n") of a plain, .gz or .zst export file."""
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as fh:
+            return fh.readlines()
+    if path.suffix == ".zst":
+        check_compression("zstd")
+        with path.open("rb") as raw:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw)
+            return io.TextIOWrapper(reader, encoding="utf-8", newline="").readlines()
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        return fh.readlines()
@@ -0,0 +1,667 @@
+#!/usr/bin/env python3
+"""
+Listing normalization for the GloveIQ library export (and SidelineSwap specs).
+
+Turns one workbook row (SS `Catalog`, or `JBG_Detail_Enrichment` joined to its
+`JBG_Full_Catalog` entry) into a normalized listing + raw row:
+
+- patterns are compiled once at import
+- brands are found with one combined alternation over the lowercased title
+  (the first KNOWN_BRANDS entry present still wins, as before)
+- low-cardinality fields (throwing hand, position, size text) go through
+  bounded memo caches
+- series, pattern and web names missing from the row are looked up in the
+  title with the glove_taxonomy.py dictionary automaton, which also gives the
+  `model_line` field ("Wilson A2000", only when it names the listing's own
+  brand); spec fields filled this way get a lower confidence. brand, model, glove_id and canonical_name do not use the match,
+  so listing identities are unchanged
+- `normalize_batch(rows)` normalizes a list of rows in one call; it is what
+  library_import.py runs per chunk, in-process or in worker processes
+
+`normalize_specs()` is the SidelineSwap detail-page variant used by
+ss_master_scraper.py (its throw/position rules differ slightly and are kept).
+
+`python bench_normalize.py` checks the compiled field normalizers against the
+previous per-call implementations and reports rows/sec for both.
+
+Usage:
+    from glove_normalize import normalize_batch
+    for listing, raw, defaults in normalize_batch([(sheet, row_number, row, catalog_entry), ...]):
+        ...
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from glove_taxonomy import TitleMatch, match_title
+
+
+KNOWN_BRANDS = [
+    "Wilson",
+    "Rawlings",
+    "Mizuno",
+    "Easton",
+    "Marucci",
+    "Franklin",
+    "Louisville Slugger",
+    "Nike",
+    "Nokona",
+    "SSK",
+    "Adidas",
+    "All Star",
+    "Akadema",
+    "44 Pro",
+]
+
+REQUIRED_SPEC_FIELDS = [
+    "Item #",
+    "Back",
+    "Color",
+    "Fit",
+    "Leather",
+    "Level",
+    "Lining",
+    "Padding",
+    "Pattern",
+    "Series",
+    "Shell",
+    "Size",
+    "Special Feature",
+    "Sport",
+    "Throwing Hand",
+    "Usage",
+    "Used by",
+    "Web",
+    "Wrist",
+    "Age Group",
+    "Description",
+]
+
+# (sheet, sheet row, row values, JBG catalog entry or {})
+SourceRow = Tuple[str, int, Dict[str, Any], Dict[str, Any]]
+Normalized = Tuple[Dict[str, Any], Dict[str, Any], List[str]]
+
+MEMO_SIZE = 4096
+
+SPEC_CONFIDENCE = 0.92
+# spec values only read off the title by the taxonomy matcher
+TITLE_MATCH_CONFIDENCE = 0.8
+
+_NUMBER = re.compile(r"([\d,]+(?:\.\d+)?)")
+_SIZE_DECIMAL = re.compile(r"(\d{1,2}\.\d{1,2})")
+_SIZE_FRACTION = re.compile(r"(\d{1,2})\s*[\-\s]\s*(\d)\s*/\s*(\d)")
+_SIZE_INCHES = re.compile(r"(\d{1,2}(?:\.\d+)?)\s*\"")
+_MODEL_TAG = re.compile(r"\[Model:\s*([^\]]+)\]", re.I)
+_MODEL_PAREN = re.compile(r"\(([A-Z0-9\-]{5,})\)\s*$")
+_SLUG = re.compile(r"[^a-z0-9]+")
+_URL_SCHEMES = ("http://", "https://")
+_BRAND_RANK = {brand.lower(): i for i, brand in enumerate(KNOWN_BRANDS)}
+_BRANDS = re.compile("|".join(re.escape(b) for b in sorted(_BRAND_RANK, key=len, reverse=True)))
+_ARTIFACT = re.compile("|".join(re.escape(m) for m in ["custom", "one of one", "1/1", "game used", "player issued", "modified", "re-lace", "relace"]))
+
+
+def clean(v: Any) -> Optional[str]:
+    if v is None:
+        return None
+    s = str(v).strip()
+    return s if s else None
+
+
+def safe_float(v: Any) -> Optional[float]:
+    if v is None or v == "":
+        return None
+    try:
+        f = float(v)
+        # "nan" / "inf" text: not a price, and json.dumps would write the invalid token NaN
+        return f if math.isfinite(f) else None
+    except Exception:
+        s = clean(v)
+        if not s:
+            return None
+        m = _NUMBER.search(s)
+        if not m:
+            return None
+        try:
+            return float(m.group(1).replace(",", ""))
+        except Exception:
+            return None
+
+
+def safe_json(v: Any, fallback: Any) -> Any:
+    if v is None:
+        return fallback
+    if isinstance(v, (dict, list)):
+        return v
+    s = clean(v)
+    if not s:
+        return fallback
+    try:
+        return json.loads(s)
+    except Exception:
+        return fallback
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def norm_throw(v: Optional[str]) -> Optional[str]:
+    s = (clean(v) or "").lower()
+    if not s:
+        return None
+    if "rht" in s or "right" in s:
+        return "RHT"
+    if "lht" in s or "left" in s:
+        return "LHT"
+    return "UNK"
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def norm_position(v: Optional[str]) -> Optional[str]:
+    s = (clean(v) or "").lower()
+    if not s:
+        return None
+    if "outfield" in s or s == "of":
+        return "OF"
+    if "infield" in s or s == "if":
+        return "IF"
+    if "pitch" in s:
+        return "P"
+    if "catch" in s:
+        return "C"
+    if "1b" in s or "first" in s:
+        return "1B"
+    if "middle" in s or "ss" in s or "2b" in s:
+        return "MI"
+    if "utility" in s:
+        return "Utility"
+    return clean(v)
+
+
+def extract_size_in(text: Optional[str]) -> Optional[float]:
+    s = clean(text)
+    if not s:
+        return None
+    m = _SIZE_DECIMAL.search(s)
+    if m:
+        return safe_float(m.group(1))
+    m = _SIZE_FRACTION.search(s)
+    if m:
+        return float(m.group(1)) + (float(m.group(2)) / float(m.group(3)))
+    m = _SIZE_INCHES.search(s)
+    if m:
+        return safe_float(m.group(1))
+    return None
+
+
+# size spec values ("12.75\"", "11 1/2") repeat across listings; titles don't, so they skip the memo
+size_from_spec = lru_cache(maxsize=MEMO_SIZE)(extract_size_in)
+
+
+def infer_brand(title: Optional[str], explicit: Optional[str]) -> Optional[str]:
+    if clean(explicit):
+        return clean(explicit)
+    t = (clean(title) or "").lower()
+    m = _BRANDS.search(t)
+    if not m:
+        return None
+    # the alternation finds the leftmost brand; the first-listed brand present wins
+    rank = _BRAND_RANK[m.group(0)]
+    for brand in KNOWN_BRANDS[:rank]:
+        if brand.lower() in t:
+            return brand
+    return KNOWN_BRANDS[rank]
+
+
+def infer_model(title: Optional[str], explicit: Optional[str]) -> Optional[str]:
+    if clean(explicit):
+        return clean(explicit)
+    t = clean(title)
+    if not t:
+        return None
+    m = _MODEL_TAG.search(t)
+    if m:
+        return clean(m.group(1))
+    m = _MODEL_PAREN.search(t)
+    if m:
+        return clean(m.group(1))
+    return None
+
+
+def infer_sport(title: Optional[str], profile: Dict[str, Any]) -> str:
+    title_l = (clean(title) or "").lower()
+    text = " ".join(str(v) for v in profile.values()).lower()
+    if "softball" in title_l or "fastpitch" in title_l or "softball" in text or "fastpitch" in text:
+        return "softball"
+    return "baseball"
+
+
+def norm_images(v: Any) -> List[str]:
+    arr = safe_json(v, [])
+    if not isinstance(arr, list):
+        return []
+    # str() + strip() is clean() minus the None/"" cases, which fail the prefix test anyway;
+    # dict.fromkeys drops repeats and keeps first-seen order
+    return list(dict.fromkeys([u for u in map(str.strip, map(str, arr)) if u.startswith(_URL_SCHEMES)]))
+
+
+def slug(s: Optional[str]) -> str:
+    raw = (clean(s) or "unknown").lower()
+    return _SLUG.sub("-", raw).strip("-") or "unknown"
+
+
+def stable_key(source: str, listing_id: str) -> str:
+    return f"{source}:{listing_id}"
+
+
+def record_type_from_listing(*, source: str, condition: Optional[str], model_code: Optional[str], title: Optional[str]) -> str:
+    text = " ".join([source or "", condition or "", model_code or "", title or ""]).lower()
+    if _ARTIFACT.search(text):
+        return "artifact"
+    if model_code and clean(model_code) and clean(model_code) != "Unknown":
+        return "variant"
+    if source.upper() in {"JBG", "JUSTBALLGLOVES"}:
+        return "variant"
+    return "artifact"
+
+
+def build_spec_map(
+    title: Optional[str],
+    description: Optional[str],
+    model_code: Optional[str],
+    size_in: Optional[float],
+    throw_hand: Optional[str],
+    sport: Optional[str],
+    web_type: Optional[str],
+    glove_profile: Optional[Dict[str, Any]] = None,
+    spec_json: Optional[Dict[str, Any]] = None,
+    title_match: Optional[TitleMatch] = None,
+) -> Tuple[Dict[str, Optional[str]], Dict[str, float]]:
+    by_lower: Dict[str, str] = {}
+    for container in (glove_profile or {}, spec_json or {}):
+        for k, v in container.items():
+            # clean() inlined: this loop sees every spec of every listing
+            if k is None or v is None:
+                continue
+            kk = str(k).strip()
+            vv = str(v).strip()
+            if kk and vv:
+                by_lower[kk.lower()] = vv
+
+    from_any = by_lower.get  # values are never empty, so a hit is always truthy
+
+    out: Dict[str, Optional[str]] = {
+        "Item #": clean(model_code),
+        "Back": from_any("back"),
+        "Color": from_any("color"),
+        "Fit": from_any("fit"),
+        "Leather": from_any("leather"),
+        "Level": from_any("level"),
+        "Lining": from_any("lining"),
+        "Padding": from_any("padding"),
+        "Pattern": from_any("pattern"),
+        "Series": from_any("series"),
+        "Shell": from_any("shell"),
+        "Size": from_any("size") or (f"{size_in:.2f}" if isinstance(size_in, (int, float)) else None),
+        "Special Feature": from_any("special feature"),
+        "Sport": from_any("sport") or clean(sport),
+        "Throwing Hand": from_any("throwing hand") or clean(throw_hand),
+        "Usage": from_any("usage"),
+        "Used by": from_any("used by"),
+        "Web": from_any("web") or clean(web_type),
+        "Wrist": from_any("wrist"),
+        "Age Group": from_any("age group"),
+        "Description": clean(description) or clean(title),
+    }
+
+    from_title = []
+    if title_match is not None:
+        for field, value in (("Series", title_match.series), ("Pattern", title_match.pattern), ("Web", title_match.web)):
+            if value and not out[field]:
+                out[field] = value
+                from_title.append(field)
+
+    confidence: Dict[str, float] = {}
+    for field in REQUIRED_SPEC_FIELDS:
+        value = out.get(field)
+        confidence[field] = SPEC_CONFIDENCE if value else 0.0
+    for field in from_title:
+        confidence[field] = TITLE_MATCH_CONFIDENCE
+    return out, confidence
+
+
+def model_line(taxonomy: TitleMatch, brand: Optional[str]) -> Optional[str]:
+    """The taxonomy's "{brand} {series}", unless its brand is one the listing's own `brand` doesn't have."""
+    return taxonomy.model_line if brand and taxonomy.brand == brand else None
+
+
+def normalize_ss_row(r: int, row: Dict[str, Any]) -> Normalized:
+    """Listing + raw row for one Catalog row, and the defaults it needed."""
+    defaults: List[str] = []
+    listing_id = clean(row.get("listing_id"))
+    url = clean(row.get("product_url"))
+
+    norm = safe_json(row.get("normalized_json"), {})
+    norm_raw = norm.get("raw", {}) if isinstance(norm, dict) else {}
+    norm_obj = norm.get("norm", {}) if isinstance(norm, dict) else {}
+
+    title = clean(row.get("title")) or clean(norm_obj.get("title"))
+    brand = infer_brand(title, clean(row.get("brand")))
+    model = infer_model(title, clean(row.get("model")))
+    # fills only model_line and the series / pattern / web the row lacks; brand and model stay as inferred
+    taxonomy = match_title(title, brand)
+    size_in = safe_float(norm_obj.get("size_in")) if isinstance(norm_obj, dict) else None
+    throw_hand = norm_throw(clean(norm_obj.get("throw_hand")) if isinstance(norm_obj, dict) else None)
+    position = norm_position(clean(norm_obj.get("position")) if isinstance(norm_obj, dict) else None)
+    web_type = clean(norm_obj.get("web")) if isinstance(norm_obj, dict) else None
+    description = clean(norm_obj.get("description")) if isinstance(norm_obj, dict) else None
+    sport = infer_sport(title, {})
+    record_type = record_type_from_listing(
+        source="SS",
+        condition=clean(row.get("condition")),
+        model_code=model,
+        title=title,
+    )
+    canonical_name = " ".join([x for x in [brand, model, f"{size_in:.2f}" if isinstance(size_in, (int, float)) else None] if x]).strip() or title or "Unknown"
+    glove_id = (
+        f"variant:{slug(brand)}:{slug(model)}:{slug(str(size_in) if size_in is not None else 'na')}:{slug(throw_hand or 'unk')}"
+        if record_type == "variant"
+        else f"artifact:SS:{listing_id}"
+    )
+    specs_raw, specs_conf = build_spec_map(
+        title=title,
+        description=description,
+        model_code=model,
+        size_in=size_in,
+        throw_hand=throw_hand,
+        sport=sport,
+        web_type=web_type,
+        glove_profile={},
+        spec_json=norm_raw if isinstance(norm_raw, dict) else {},
+        title_match=taxonomy,
+    )
+
+    if not brand:
+        defaults.append("brand_unknown")
+    if not model:
+        defaults.append("model_unknown")
+
+    images = norm_images(row.get("images_json"))
+    listing = {
+        "listing_pk": stable_key("SS", listing_id),
+        "glove_id": glove_id,
+        "record_type": record_type,
+        "source": "SS",
+        "source_listing_id": listing_id,
+        "url": url,
+        "title": title,
+        "canonical_name": canonical_name,
+        "brand": brand or "Unknown",
+        "model": model or "Unknown",
+        "model_code": model or "Unknown",
+        "model_line": model_line(taxonomy, brand),
+        "size_in": size_in,
+        "hand": throw_hand or "UNK",
+        "throw_hand": throw_hand or "UNK",
+        "player_position": position or "Unknown",
+        "position": position or "Unknown",
+        "web_type": web_type or taxonomy.web or "Unknown",
+        "sport": sport,
+        "condition": clean(row.get("condition")) or "Unknown",
+        "price": safe_float(row.get("price")),
+        "currency": clean(row.get("currency")) or "USD",
+        "created_at": None,
+        "seen_at": None,
+        "item_number": model or None,
+        "pattern": (clean(norm_obj.get("pattern")) if isinstance(norm_obj, dict) else None) or taxonomy.pattern,
+        "series": (clean(norm_obj.get("series")) if isinstance(norm_obj, dict) else None) or taxonomy.series,
+        "level": clean(norm_obj.get("level")) if isinstance(norm_obj, dict) else None,
+        "age_group": clean(norm_obj.get("age_group")) if isinstance(norm_obj, dict) else None,
+        "market_origin": None,
+        "raw_specs": norm_raw if isinstance(norm_raw, dict) else {},
+        "spec_fields_raw": specs_raw,
+        "normalized_specs": {k: v for k, v in specs_raw.items() if v},
+        "normalized_confidence": specs_conf,
+        "raw_html": None,
+        "raw_text": title,
+        "images": images,
+    }
+    raw = {
+        "listing_pk": listing["listing_pk"],
+        "source": "SS",
+        "source_sheet": "Catalog",
+        "source_row": r,
+        "source_columns": row,
+        "parsed_normalized_json": norm,
+        "raw_html": None,
+        "raw_text": title,
+    }
+    return listing, raw, defaults
+
+
+def normalize_jbg_row(r: int, row: Dict[str, Any], cat: Dict[str, Any]) -> Normalized:
+    """Listing + raw row for one JBG_Detail_Enrichment row joined to its catalog entry, and the defaults it needed."""
+    defaults: List[str] = []
+    pid = clean(row.get("product_id"))
+    source = clean(cat.get("source")) or "JBG"
+    url = clean(row.get("product_url")) or clean(cat.get("product_url"))
+
+    glove_profile = safe_json(row.get("glove_profile_json"), {})
+    spec_json = safe_json(row.get("spec_json"), {})
+
+    title = clean(row.get("title")) or clean(cat.get("catalog_title"))
+    price = safe_float(row.get("price"))
+    if price is None:
+        price = safe_float(cat.get("catalog_price"))
+        if price is not None:
+            defaults.append("price_from_catalog")
+
+    brand = infer_brand(title, None)
+    model_code = clean(row.get("model_code")) or infer_model(title, None)
+    model = model_code
+    # fills only model_line and the series / pattern / web the row lacks; brand and model stay as inferred
+    taxonomy = match_title(title, brand)
+
+    size_text = None
+    throw_text = None
+    pos_text = None
+    web_text = None
+
+    if isinstance(glove_profile, dict):
+        for k, v in glove_profile.items():
+            lk = (clean(k) or "").lower()
+            if "size" in lk and not size_text:
+                size_text = clean(v)
+            if ("throw" in lk or "hand" in lk) and not throw_text:
+                throw_text = clean(v)
+            if "position" in lk and not pos_text:
+                pos_text = clean(v)
+            if "web" in lk and not web_text:
+                web_text = clean(v)
+
+    size_in = size_from_spec(size_text) or extract_size_in(title)
+    throw_hand = norm_throw(throw_text)
+    position = norm_position(pos_text)
+
+    if not brand:
+        defaults.append("brand_unknown")
+    if not model:
+        defaults.append("model_unknown")
+
+    images = norm_images(row.get("images_json"))
+    description = clean(row.get("description_snippet"))
+    sport = infer_sport(title, glove_profile if isinstance(glove_profile, dict) else {})
+    condition = "New" if source == "JBG" else "Unknown"
+    record_type = record_type_from_listing(
+        source=source,
+        condition=condition,
+        model_code=model_code,
+        title=title,
+    )
+    canonical_name = " ".join([x for x in [brand, model_code or model, f"{size_in:.2f}" if isinstance(size_in, (int, float)) else None] if x]).strip() or title or "Unknown"
+    glove_id = (
+        f"variant:{slug(brand)}:{slug(model_code or model)}:{slug(str(size_in) if size_in is not None else 'na')}:{slug(throw_hand or 'unk')}"
+        if record_type == "variant"
+        else f"artifact:{source}:{pid}"
+    )
+    specs_raw, specs_conf = build_spec_map(
+        title=title,
+        description=description,
+        model_code=model_code or model,
+        size_in=size_in,
+        throw_hand=throw_hand,
+        sport=sport,
+        web_type=web_text,
+        glove_profile=glove_profile if isinstance(glove_profile, dict) else {},
+        spec_json=spec_json if isinstance(spec_json, dict) else {},
+        title_match=taxonomy,
+    )
+
+    listing = {
+        "listing_pk": stable_key(source, pid),
+        "glove_id": glove_id,
+        "record_type": record_type,
+        "source": source,
+        "source_listing_id": pid,
+        "url": url,
+        "title": title,
+        "canonical_name": canonical_name,
+        "brand": brand or "Unknown",
+        "model": model or "Unknown",
+        "model_code": model_code or "Unknown",
+        "model_line": model_line(taxonomy, brand),
+        "size_in": size_in,
+        "hand": throw_hand or "UNK",
+        "throw_hand": throw_hand or "UNK",
+        "player_position": position or "Unknown",
+        "position": position or "Unknown",
+        "web_type": web_text or taxonomy.web or "Unknown",
+        "sport": sport,
+        "condition": condition,
+        "price": price,
+        "currency": "USD",
+        "created_at": clean(cat.get("catalog_scraped_at")),
+        "seen_at": clean(row.get("detail_scraped_at")),
+        "item_number": model_code or None,
+        "pattern": (clean(glove_profile.get("pattern")) if isinstance(glove_profile, dict) else None) or taxonomy.pattern,
+        "series": (clean(glove_profile.get("series")) if isinstance(glove_profile, dict) else None) or taxonomy.series,
+        "level": clean(glove_profile.get("level")) if isinstance(glove_profile, dict) else None,
+        "age_group": clean(glove_profile.get("age_group")) if isinstance(glove_profile, dict) else None,
+        "market_origin": clean(glove_profile.get("country")) if isinstance(glove_profile, dict) else None,
+        "raw_specs": {
+            "glove_profile": glove_profile if isinstance(glove_profile, dict) else {},
+            "spec_json": spec_json if isinstance(spec_json, dict) else {},
+        },
+        "spec_fields_raw": specs_raw,
+        "normalized_specs": {k: v for k, v in specs_raw.items() if v},
+        "normalized_confidence": specs_conf,
+        "raw_html": None,
+        "raw_text": clean(row.get("description_snippet")) or title,
+        "images": images,
+    }
+    raw = {
+        "listing_pk": listing["listing_pk"],
+        "source": source,
+        "source_sheet": "JBG_Detail_Enrichment",
+        "source_row": r,
+        "source_columns": row,
+        "catalog_columns": cat.get("raw", {}),
+        "parsed_glove_profile_json": glove_profile,
+        "parsed_spec_json": spec_json,
+        "raw_html": None,
+        "raw_text": clean(row.get("description_snippet")) or title,
+    }
+    return listing, raw, defaults
+
+
+def normalize_row(sheet: str, r: int, row: Dict[str, Any], cat: Dict[str, Any]) -> Normalized:
+    if sheet == "Catalog":
+        return normalize_ss_row(r, row)
+    return normalize_jbg_row(r, row, cat)
+
+
+# --- SidelineSwap detail specs (ss_master_scraper.py) ---
+
+_WHITESPACE = re.compile(r"\s+")
+_SS_SIZE_FRACTION = re.compile(r"(\d{1,2})\s*(?:-|\s)\s*(\d)\s*/\s*(\d)")
+
+
+def collapse_ws(s: Optional[str]) -> str:
+    return _WHITESPACE.sub(" ", (s or "").strip())
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def ss_size_inches(text: str) -> Optional[float]:
+    t = collapse_ws(text)
+    if not t:
+        return None
+    m = _SIZE_DECIMAL.search(t)
+    if m:
+        return float(m.group(1))
+    m = _SS_SIZE_FRACTION.search(t)
+    if m:
+        return float(m.group(1)) + (float(m.group(2)) / float(m.group(3)))
+    return None
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def ss_norm_throw(v: str) -> str:
+    v = collapse_ws(v).lower()
+    if "right" in v and "throw" in v:
+        return "RHT"
+    if "left" in v and "throw" in v:
+        return "LHT"
+    return "UNK"
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def ss_norm_position(v: str) -> Optional[str]:
+    v = collapse_ws(v).lower()
+    if "outfield" in v or v == "of":
+        return "OF"
+    if "infield" in v or v == "if":
+        return "IF"
+    if "pitch" in v:
+        return "P"
+    if "catch" in v:
+        return "C"
+    if "first" in v or "1b" in v:
+        return "1B"
+    if "middle" in v or "ss" in v or "2b" in v:
+        return "MI"
+    return collapse_ws(v).upper() if v else None
+
+
+def normalize_specs(specs: Optional[Dict[str, Any]], title: Optional[str]) -> Dict[str, Any]:
+    """normalized_json for one SidelineSwap listing: the scraped specs plus the fields GloveIQ reads."""
+    lower = {collapse_ws(k).lower(): v for k, v in (specs or {}).items()}
+
+    def get(*keys: str) -> Any:
+        for k in keys:
+            if k in lower and lower[k]:
+                return lower[k]
+        return None
+
+    size_raw = get("size", "glove size")
+    throw_raw = get("throwing hand", "throws")
+    pos_raw = get("position")
+    web_raw = get("web", "web type")
+
+    return {
+        "raw": specs,
+        "norm": {
+            "size_in": ss_size_inches(str(size_raw)) if size_raw else None,
+            "throw_hand": ss_norm_throw(str(throw_raw)) if throw_raw else "UNK",
+            "position": ss_norm_position(str(pos_raw)) if pos_raw else None,
+            "web": collapse_ws(str(web_raw)) if web_raw else None,
+            "title": collapse_ws(str(title)) if title else None,
+            "source": "SS",
+        },
+    }
+
+
+def normalize_batch(rows: Iterable[SourceRow]) -> List[Normalized]:
+    """(listing, raw row, defaults applied) for each source row, in order."""
+    return [normalize_row(*item) for item in rows]
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Dictionary matcher for glove titles: brand, series, pattern and web names.
+
+The vocabulary lives in glove_taxonomy.json (brands, series, patterns, webs,
+each with its aliases), mirroring the brand / family / pattern / pattern_alias
+tables in docs/ai-appraisal/dbdiagram.dbml. Every alias is compiled into one
+Aho-Corasick automaton at import, so a title is read once, left to right,
+whatever the size of the dictionary:
+
+- matching is case-insensitive with runs of whitespace collapsed
+- a hit must start and end on a word boundary ("pro" is not found inside
+  "prospect", "1786" not inside "1786ss")
+- series and patterns belong to a brand and only count once that brand is
+  known, named in the title or passed in from the row; they never supply the
+  brand themselves (several brands share names like "Pro Series")
+- an entry with "match_name": false is only found through its aliases: its
+  name is a common word ("Worth", "Elite") that would otherwise match prose
+- per kind, the leftmost hit wins, and the longest one among hits starting at
+  the same place ("gold glove elite" over "gold glove")
+
+`match_title()` is what glove_normalize.py uses to fill series / pattern / web
+and `model_line` when the source row does not carry them.
+
+`python bench_taxonomy.py` checks the automaton against a per-alias scan and
+times both.
+
+Usage:
+    from glove_taxonomy import match_title
+    m = match_title('Wilson A2000 1786 11.5" I Web')
+    m.brand, m.series, m.pattern, m.web, m.model_line
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+TAXONOMY_PATH = Path(__file__).with_name("glove_taxonomy.json")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class Term(NamedTuple):
+    kind: str
+    name: str
+    brand: Optional[str]  # display name of the owning brand (brands own themselves, webs have none)
+
+
+# (start, end, term) over the folded text
+Hit = Tuple[int, int, Term]
+
+
+@dataclass(frozen=True)
+class TitleMatch:
+    brand: Optional[str] = None
+    series: Optional[str] = None
+    pattern: Optional[str] = None
+    web: Optional[str] = None
+
+    @property
+    def model_line(self) -> Optional[str]:
+        if self.brand and self.series:
+            return f"{self.brand} {self.series}"
+        return None
+
+
+def fold(text: Optional[str]) -> str:
+    return _WHITESPACE.sub(" ", (text or "").strip()).lower()
+
+
+class TaxonomyAutomaton:
+    """Aho-Corasick automaton over the folded aliases of a set of terms."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Term]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[List[Tuple[int, Term]]] = [[]]
+        self.entries: List[Tuple[str, Term]] = []  # (folded alias, term), as compiled
+        for alias, term in entries:
+            key = fold(alias)
+            if not key:
+                continue
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                state = nxt
+            if (len(key), term) not in self._out[state]:
+                self._out[state].append((len(key), term))
+                self.entries.append((key, term))
+        self._fail = self._link()
+        # goto plus every fail-link walk taken so far, filled in lazily: a
+        # (state, char) pair seen once is a single dict lookup afterwards
+        self._delta: List[Dict[str, int]] = [dict(g) for g in self._goto]
+
+    def _link(self) -> List[int]:
+        goto, out = self._goto, self._out
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f][ch] if state and ch in goto[f] else 0
+                # every alias ending at the fallback state also ends here
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        return fail
+
+    def _step(self, state: int, ch: str) -> int:
+        goto, fail = self._goto, self._fail
+        s = state
+        while s and ch not in goto[s]:
+            s = fail[s]
+        nxt = goto[s].get(ch, 0)
+        self._delta[state][ch] = nxt
+        return nxt
+
+    def find_all(self, text: str) -> List[Hit]:
+        """Every alias occurrence in already-folded `text` that sits on word boundaries, in end order."""
+        delta, out, step = self._delta, self._out, self._step
+        hits: List[Hit] = []
+        state = 0
+        n = len(text)
+        for end, ch in enumerate(text, 1):
+            nxt = delta[state].get(ch)
+            state = step(state, ch) if nxt is None else nxt
+            if not out[state] or (end < n and text[end].isalnum()):
+                continue
+            for length, term in out[state]:
+                start = end - length
+                if start == 0 or not text[start - 1].isalnum():
+                    hits.append((start, end, term))
+        return hits
+
+
+def load_taxonomy(path: Path = TAXONOMY_PATH) -> TaxonomyAutomaton:
+    """Automaton for a taxonomy file; every name is also an alias of itself unless "match_name" is false."""
+    data: Dict[str, Any] = json.loads(Path(path).read_text(encoding="utf-8"))
+    brands = {b["key"]: b["name"] for b in data.get("brands", [])}
+
+    def owner(entry: Dict[str, Any]) -> str:
+        key = entry.get("brand")
+        if key not in brands:
+            raise ValueError(f"{path}: unknown brand key {key!r} in {entry}")
+        return brands[key]
+
+    def aliases(entry: Dict[str, Any], name: str) -> List[str]:
+        return ([name] if entry.get("match_name", True) else []) + list(entry.get("aliases", []))
+
+    entries: List[Tuple[str, Term]] = []
+    for b in data.get("brands", []):
+        term = Term("brand", b["name"], b["name"])
+        entries += [(a, term) for a in aliases(b, b["name"])]
+    for s in data.get("series", []):
+        term = Term("series", s["name"], owner(s))
+        entries += [(a, term) for a in aliases(s, s["name"])]
+    for p in data.get("patterns", []):
+        term = Term("pattern", p["code"], owner(p))
+        entries += [(a, term) for a in aliases(p, p["code"])]
+    for w in data.get("webs", []):
+        term = Term("web", w["name"], None)
+        entries += [(a, term) for a in aliases(w, w["name"])]
+    return TaxonomyAutomaton(entries)
+
+
+AUTOMATON = load_taxonomy()
+
+
+def resolve(hits: List[Hit], brand: Optional[str] = None) -> TitleMatch:
+    """Pick one brand / series / pattern / web out of a title's hits (see module docstring)."""
+
+    def first(kind: str, owner: Optional[str] = None) -> Optional[Term]:
+        found = [h for h in hits if h[2].kind == kind and (owner is None or (h[2].brand or "").lower() == owner)]
+        return min(found, key=lambda h: (h[0], -h[1]))[2] if found else None
+
+    if not brand:
+        term = first("brand")
+        brand = term.name if term else None
+    series = first("series", brand.lower()) if brand else None
+    pattern = first("pattern", brand.lower()) if brand else None
+    web = first("web")
+    return TitleMatch(
+        brand=brand,
+        series=series.name if series else None,
+        pattern=pattern.name if pattern else None,
+        web=web.name if web else None,
+    )
+
+
+def match_title(title: Optional[str], brand: Optional[str] = None) -> TitleMatch:
+    """Taxonomy terms named in `title`; `brand`, when already known, scopes the series and pattern lookup."""
+    return resolve(AUTOMATON.find_all(fold(title)), brand)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+On-disk HTTP conditional-request cache for scraper page fetches.
+
+Stores the last 200 response per URL (zlib-compressed body + ETag / Last-Modified
+validators) in a SQLite file under the scraper directory. The next GET for the
+same URL sends If-None-Match / If-Modified-Since; a 304 is answered from the
+cache as a normal 200 response (`resp.from_cache` is True), so callers never
+see the difference.
+
+The cache is bounded by total stored body bytes; least recently used entries
+are evicted first.
+
+Usage:
+    cache = HttpCache(DEFAULT_CACHE_DIR, max_bytes=256 * 1024 * 1024)
+    mount_cache(session, cache)
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Dict[str, str]
+    body: bytes
+
+
+class HttpCache:
+    """SQLite-backed URL -> (validators, body) store with LRU eviction by size."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "responses.sqlite")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        self._total = int(self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, content_type, body FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, content_type, body = row
+        headers = {"Content-Type": content_type} if content_type else {}
+        return CachedResponse(url=url, etag=etag, last_modified=last_modified, headers=headers, body=zlib.decompress(body))
+
+    def touch(self, url: str) -> None:
+        with self._lock:
+            self._db.execute("UPDATE responses SET last_used = ? WHERE url = ?", (time.time(), url))
+            self.stats["hits"] += 1
+
+    def store(self, url: str, resp: requests.Response) -> None:
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            # nothing to revalidate against next time
+            self.stats["misses"] += 1
+            return
+        blob = zlib.compress(resp.content, 6)
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO responses (url, etag, last_modified, content_type, body, size, stored_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, etag, last_modified, resp.headers.get("Content-Type"), blob, len(blob), now, now),
+            )
+            self._total += len(blob) - (old[0] if old else 0)
+            self.stats["misses"] += 1
+            self.stats["stored"] += 1
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        if self._total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT url, size FROM responses ORDER BY last_used ASC").fetchall()
+        for url, size in rows:
+            if self._total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._total -= size
+            self.stats["evicted"] += 1
+
+    def summary(self) -> str:
+        s = self.stats
+        return f"hits(304)={s['hits']} misses={s['misses']} stored={s['stored']} evicted={s['evicted']} size_mb={self._total / 1e6:.1f}"
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that revalidates GETs against an HttpCache."""
+
+    def __init__(self, cache: HttpCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != "GET" or kwargs.get("stream"):
+            return super().send(request, **kwargs)
+
+        entry = self.cache.lookup(request.url)
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        resp = super().send(request, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            self.cache.touch(request.url)
+            return _replay(resp, entry)
+        resp.from_cache = False
+        if resp.status_code == 200:
+            self.cache.store(request.url, resp)
+        return resp
+
+
+def _replay(resp: requests.Response, entry: CachedResponse) -> requests.Response:
+    """Turn a 304 into the cached 200 so callers can use .text / .content as usual."""
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp.headers.update(entry.headers)
+    resp._content = entry.body
+    resp._content_consumed = True
+    resp.encoding = get_encoding_from_headers(resp.headers)
+    resp.from_cache = True
+    return resp
+
+
+def mount_cache(session: requests.Session, cache: HttpCache, pool_size: int = 10) -> requests.Session:
+    adapter = CachingAdapter(cache, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
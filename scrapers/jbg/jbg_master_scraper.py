@@ -18,6 +18,26 @@ python jbg_master_scraper.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOG
 
 # 3) Full run (catalog + details)
 python jbg_master_scraper.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --max-pages 25 --max-details 2000 --delay 1.5
+
+# 4) Rebuild JBG_Detail_Enrichment from archived pages after a parser fix (no network)
+python jbg_master_scraper.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --reparse-from-archive
+
+# 5) Details with up to 4 requests in flight (same 1 req / 1.5s politeness budget per host)
+python jbg_master_scraper.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --max-pages 0 --max-details 2000 --delay 1.5 --concurrency 4 --resume
+
+# 6) Let the adaptive controller find the rate the site tolerates (backs off on 429/5xx, retries failures)
+python jbg_master_scraper.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --max-pages 0 --max-details 2000 --delay 0 --concurrency 16 --resume
+
+# 7) Discover products from the XML sitemaps, then re-scrape only new/changed (<lastmod>) products
+python jbg_master_scraper.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --discover sitemap --max-details 2000 --delay 1.5
+
+# 8) Spend a fixed budget on the products most likely to have changed (new/failed first, then catalog
+#    price/title moves, then by age x past change rate)
+python jbg_master_scraper.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --max-pages 25 --max-details 300 --schedule staleness
+
+# 9) Write rows to the SQLite staging store (per-row commits, no workbook rewrites); export the XLSX afterwards
+python jbg_master_scraper.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --staging-db .staging/gloveiq.sqlite --max-pages 25 --max-details 2000
+python staging_store.py export --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx"
 """
 
 from __future__ import annotations
@@ -28,19 +48,37 @@ import json
 import re
 import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, urlencode
 
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
 import openpyxl
 
+from recrawl_scheduler import (
+    DEFAULT_MIN_AGE_DAYS,
+    DetailCandidate,
+    catalog_signature,
+    detail_fingerprint,
+    reason_counts,
+    schedule_refresh,
+)
+from scraper_core import Checkpointer, JournalCheckpointer, ScraperRuntime, SourceAdapter, add_runtime_args, save_workbook
+from staging_store import open_workbook
+from worksheet_index import WorksheetIndex
+from sitemaps import SitemapEntry, iter_site_entries, parse_lastmod
+from structured_data import find_product, offer_price, product_images, product_properties, product_text
+
 
 DEFAULT_START_URL = "https://www.justballgloves.com/products/glove%20type~baseball,female%20fastpitch,slow%20pitch%20softball,softball,tee%20ball,youth/"
 UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36"
 
 PRODUCT_RE = re.compile(r"/(?:product|products)/(?:[^/]+/)*?(?P<pid>\d+)(?:/|$)", re.I)
 
+# catalog pages between workbook saves (the crawl cursor only advances on save)
+CATALOG_CHECKPOINT_PAGES = 5
+
 
 def now_iso() -> str:
     return _dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
@@ -62,58 +100,10 @@ def safe_json(obj) -> str:
     return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
 
 
-def get_session() -> requests.Session:
-    s = requests.Session()
-    s.headers.update(
-        {
-            "User-Agent": UA,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-    )
-    return s
-
-
 def load_wb(xlsx_path: str) -> openpyxl.Workbook:
     return openpyxl.load_workbook(xlsx_path)
 
 
-def header_map(ws) -> Dict[str, int]:
-    """Return {header_name: col_index} for row 1."""
-    m = {}
-    for col in range(1, ws.max_column + 1):
-        v = ws.cell(row=1, column=col).value
-        if v is None:
-            continue
-        name = str(v).strip()
-        if name:
-            m[name] = col
-    return m
-
-
-def first_empty_row(ws, key_col: int) -> int:
-    """Find first empty row by checking a primary key column (e.g., product_id)."""
-    r = 2
-    while True:
-        if ws.cell(row=r, column=key_col).value in (None, ""):
-            return r
-        r += 1
-
-
-def build_existing_index(ws, key_header: str) -> Dict[str, int]:
-    hm = header_map(ws)
-    if key_header not in hm:
-        raise RuntimeError(f"Sheet {ws.title} missing required header: {key_header}")
-    key_col = hm[key_header]
-    idx = {}
-    for r in range(2, ws.max_row + 1):
-        v = ws.cell(row=r, column=key_col).value
-        if v is None or str(v).strip() == "":
-            continue
-        idx[str(v).strip()] = r
-    return idx
-
-
 def parse_money(text: str) -> Optional[float]:
     if not text:
         return None
@@ -207,7 +197,11 @@ def parse_glove_profile(soup: BeautifulSoup) -> Dict[str, str]:
             break
 
     # Heuristic: label elements frequently end with ':'
-    text = section.get_text("\n", strip=True)
+    return _profile_from_text(section.get_text("\n", strip=True))
+
+
+def _profile_from_text(text: str) -> Dict[str, str]:
+    profile = {}
     lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
 
     # Build a loose key/value parser:
@@ -259,6 +253,12 @@ def parse_images(soup: BeautifulSoup, base_url: str) -> List[str]:
     return out
 
 
+def _model_code(title: Optional[str]) -> Optional[str]:
+    # e.g. "... Baseball Glove (WBW100396115)"
+    m = re.search(r"\(([A-Z0-9\-]{6,})\)\s*$", title) if title else None
+    return m.group(1) if m else None
+
+
 def parse_detail_page(html: str, url: str) -> Dict:
     soup = BeautifulSoup(html, "lxml")
     title = None
@@ -282,12 +282,8 @@ def parse_detail_page(html: str, url: str) -> Dict:
     glove_profile = parse_glove_profile(soup)
     images = parse_images(soup, url)
 
-    # Try to extract a "model_code" from parentheses at end of title, e.g. "(WBW100396115)"
-    model_code = None
-    if title:
-        m = re.search(r"\(([A-Z0-9\-]{6,})\)\s*$", title)
-        if m:
-            model_code = m.group(1)
+    # model code from parentheses at the end of the title
+    model_code = _model_code(title)
 
     # Try to capture bullet benefits or description snippets (lightweight)
     desc = None
@@ -315,211 +311,656 @@ def parse_detail_page(html: str, url: str) -> Dict:
     }
 
 
-def write_catalog_rows(ws, items: List[Dict]) -> Tuple[int, int]:
-    hm = header_map(ws)
-    required = ["product_id", "product_url"]
-    for r in required:
-        if r not in hm:
-            raise RuntimeError(f"Sheet {ws.title} missing required header: {r}")
+# -------------------
+# lxml fast path
+# -------------------
+# Same output as the BeautifulSoup functions above, but one libxml2 parse, a
+# single filtered pass over the tree and no full-document text serialization.
+# Text extraction mirrors bs4's get_text(sep, strip=True): comments/PIs and text
+# inside script/style/template/rt/rp are not "content" strings.
+
+_LXML_PARSER = etree.HTMLParser()
+_NON_CONTENT_TAGS = frozenset(("script", "style", "template", "rt", "rp"))
+_PRICE_SCAN_CHARS = 5000
+_XP_HREF_ANCHORS = etree.XPath("//a[@href]")
+_XP_IMGS = etree.XPath("//img")
+
+
+class _Document:
+    """Stand-in for the BeautifulSoup object that sits above <html> when climbing parents."""
+
+    def __init__(self, root):
+        self.root = root
+
+
+def _lxml_root(html: str):
+    root = etree.fromstring(html, _LXML_PARSER)
+    if root is None:
+        raise ValueError("empty document")
+    return root
+
+
+def _lxml_parent(node):
+    if isinstance(node, _Document):
+        return None
+    parent = node.getparent()
+    return parent if parent is not None else _Document(node)
+
+
+def _lxml_strings(node, out: List[str], limit: Optional[int] = None) -> int:
+    """Append stripped content strings under `node` to `out`; stop once `limit` chars are collected."""
+    if isinstance(node, _Document):
+        node = node.root
+    for anc in node.iterancestors():
+        if anc.tag in _NON_CONTENT_TAGS:
+            return 0
+    if node.tag in _NON_CONTENT_TAGS:
+        return 0
+    return _lxml_collect(node, out, 0, limit)
+
+
+def _lxml_collect(el, out: List[str], size: int, limit: Optional[int]) -> int:
+    if el.text:
+        t = el.text.strip()
+        if t:
+            out.append(t)
+            size += len(t) + 1
+    for child in el:
+        if limit is not None and size > limit:
+            # joined length (size - 1 separators) already covers the requested prefix
+            return size
+        tag = child.tag
+        if isinstance(tag, str) and tag not in _NON_CONTENT_TAGS:
+            size = _lxml_collect(child, out, size, limit)
+        if child.tail:
+            t = child.tail.strip()
+            if t:
+                out.append(t)
+                size += len(t) + 1
+    return size
+
+
+def _lxml_text(node, sep: str = " ", limit: Optional[int] = None) -> str:
+    parts: List[str] = []
+    _lxml_strings(node, parts, limit)
+    text = sep.join(parts)
+    return text[:limit] if limit is not None else text
+
+
+def _lxml_first_desc(node, *tags):
+    if isinstance(node, _Document):
+        node = node.root
+        if node.tag in tags:
+            return node
+    return next(node.iterdescendants(*tags), None)
+
+
+def extract_catalog_products_lxml(html: str, base_url: str) -> List[Dict]:
+    root = _lxml_root(html)
+    found = []
+    for a in _XP_HREF_ANCHORS(root):
+        href = a.get("href")
+        m = PRODUCT_RE.search(href)
+        if not m:
+            continue
+        pid = m.group("pid")
+        url = abs_url(base_url, href)
+        card = a
+        for _ in range(4):
+            if getattr(card, "tag", None) in ("article", "li", "div"):
+                break
+            card = _lxml_parent(card)
+            if card is None:
+                break
+
+        title = None
+        price = None
+        thumb = None
+        if card is not None:
+            h = _lxml_first_desc(card, "h2", "h3")
+            if h is not None:
+                title = _lxml_text(h) or None
+            price = parse_money(_lxml_text(card))
+            img = _lxml_first_desc(card, "img")
+            if img is not None:
+                thumb = img.get("data-src") or img.get("src")
+
+        found.append(
+            {
+                "product_id": pid,
+                "product_url": url,
+                "title_catalog": title,
+                "price_catalog": price,
+                "thumb_url": thumb,
+            }
+        )
+
+    dedup = {}
+    out = []
+    for item in found:
+        if item["product_id"] in dedup:
+            continue
+        dedup[item["product_id"]] = True
+        out.append(item)
+    return out
+
+
+def _lxml_section_text(heading, needle: str, extra: Tuple[str, ...] = ()) -> Tuple[object, str]:
+    """Climb up to 6 parents like the soup heuristics; return (section, lowercased text)."""
+    section = heading
+    txt = ""
+    for _ in range(6):
+        parent = _lxml_parent(section)
+        if parent is None:
+            break
+        section = parent
+        txt = _lxml_text(section).lower()
+        if needle in txt and (not extra or any(x in txt for x in extra)):
+            break
+    return section, txt
+
+
+def parse_detail_page_lxml(html: str, url: str) -> Dict:
+    root = _lxml_root(html)
+
+    h1 = None
+    headings = []
+    meta_prop = None
+    meta_itemprop = None
+    # single filtered pass over the tree
+    for el in root.iter("h1", "h2", "h3", "meta"):
+        tag = el.tag
+        if tag == "h1":
+            if h1 is None:
+                h1 = el
+        elif tag == "meta":
+            if meta_prop is None and el.get("property") == "product:price:amount":
+                meta_prop = el
+            elif meta_itemprop is None and el.get("itemprop") == "price":
+                meta_itemprop = el
+        else:
+            headings.append(el)
+
+    title = None
+    if h1 is not None:
+        title = _lxml_text(h1) or None
+
+    price = None
+    meta_price = meta_prop if meta_prop is not None else meta_itemprop
+    if meta_price is not None and meta_price.get("content"):
+        try:
+            price = float(meta_price.get("content"))
+        except Exception:
+            price = None
+    if price is None:
+        price = parse_money(_lxml_text(_Document(root), limit=_PRICE_SCAN_CHARS))
+
+    glove_profile: Dict[str, str] = {}
+    desc = None
+    profile_h = None
+    benefits_h = None
+    for h in headings:
+        if profile_h is not None and benefits_h is not None:
+            break
+        htxt = _lxml_text(h).lower()
+        if profile_h is None and "glove profile" in htxt:
+            profile_h = h
+        if benefits_h is None and "glove benefits" in htxt:
+            benefits_h = h
+    if profile_h is not None:
+        section, _ = _lxml_section_text(profile_h, "glove profile", ("positions", "age", "stiffness"))
+        glove_profile = _profile_from_text(_lxml_text(section, sep="\n"))
+    if benefits_h is not None:
+        sec, _ = _lxml_section_text(benefits_h, "glove benefits")
+        dtxt = _lxml_text(sec)
+        desc = dtxt[:600] if dtxt else None
 
-    idx = build_existing_index(ws, "product_id")
+    images = []
+    seen = set()
+    for img in _XP_IMGS(root):
+        src = img.get("data-src") or img.get("data-lazy-src") or img.get("src")
+        if not src:
+            continue
+        if "justballgloves" not in src and "cdn" not in src and not src.startswith("http"):
+            continue
+        full = abs_url(url, src)
+        if full in seen:
+            continue
+        seen.add(full)
+        images.append(full)
+
+    model_code = _model_code(title)
+
+    return {
+        "title_detail": title,
+        "price_detail": price,
+        "model_code": model_code,
+        "glove_profile": glove_profile,
+        "description_snippet": desc,
+        "images": images,
+    }
+
+
+def extract_catalog_products_fast(html: str, base_url: str) -> List[Dict]:
+    try:
+        return extract_catalog_products_lxml(html, base_url)
+    except (ValueError, etree.LxmlError):
+        # e.g. str input carrying an XML encoding declaration; bs4 copes with those
+        return extract_catalog_products(html, base_url)
+
+
+def parse_detail_page_fast(html: str, url: str) -> Dict:
+    try:
+        return parse_detail_page_lxml(html, url)
+    except (ValueError, etree.LxmlError):
+        return parse_detail_page(html, url)
+
+
+def parse_detail_structured(html: str, url: str, dom_parse=parse_detail_page) -> Dict:
+    """
+    Detail dict from the page's schema.org Product (JSON-LD / page state) first.
+
+    A Product carrying name, offer price and additionalProperty (the glove
+    profile) needs no DOM at all. Otherwise dom_parse() fills the gaps, but the
+    Offer price still wins over the DOM's "first $ amount in the page" guess
+    (which picks up promo text like "Save $20").
+    """
+    product = find_product(html)
+    if product is None:
+        return dom_parse(html, url)
+
+    name = product_text(product, "name")
+    price = offer_price(product)
+    images = product_images(product, url)
+    profile = product_properties(product)
+    desc = product_text(product, "description")
+    if name and price is not None and profile:
+        return {
+            "title_detail": name,
+            "price_detail": price,
+            "model_code": _model_code(name),
+            "glove_profile": profile,
+            "description_snippet": desc[:600] if desc else None,
+            "images": images,
+        }
+
+    data = dom_parse(html, url)
+    if not data.get("title_detail") and name:
+        data["title_detail"] = name
+        data["model_code"] = _model_code(name)
+    if price is not None:
+        data["price_detail"] = price
+    if not data.get("glove_profile") and profile:
+        data["glove_profile"] = profile
+    if not data.get("description_snippet") and desc:
+        data["description_snippet"] = desc[:600]
+    data["images"] = images + [u for u in data.get("images") or [] if u not in images]
+    return data
+
+
+def parse_detail_structured_lxml(html: str, url: str) -> Dict:
+    return parse_detail_structured(html, url, parse_detail_page_fast)
+
+
+CATALOG_PARSERS = {
+    "soup": extract_catalog_products,
+    "lxml": extract_catalog_products_fast,
+}
+# structured data first; the key picks the DOM fallback
+DETAIL_PARSERS = {
+    "soup": parse_detail_structured,
+    "lxml": parse_detail_structured_lxml,
+}
+
+
+def next_catalog_page(html: str, page_url: str) -> Optional[str]:
+    """JBG listings paginate with ?page=N; the crawl stops at the first page that adds nothing."""
+    page = int((parse_qs(urlparse(page_url).query).get("page") or ["1"])[0])
+    return set_query_param(page_url, "page", str(page + 1))
+
+
+def make_adapter(parser: str = "soup") -> SourceAdapter:
+    return SourceAdapter(
+        source="JBG",
+        catalog_kind="jbg_catalog",
+        detail_kind="jbg_detail",
+        id_field="product_id",
+        extract_catalog=CATALOG_PARSERS[parser],
+        next_page=next_catalog_page,
+        parse_detail=DETAIL_PARSERS[parser],
+        headers={
+            "User-Agent": UA,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        },
+        stop_when_no_new=True,
+        checkpoint_pages=CATALOG_CHECKPOINT_PAGES,
+    )
+
+
+def refresh_catalog_row(cat: WorksheetIndex, row: int, it: Dict) -> bool:
+    """
+    Update title/price of an already-listed product when the catalog card changed,
+    so the recrawl scheduler can see the move. Returns True if anything changed.
+    """
+    changed = False
+    for col, key in (("catalog_title", "title_catalog"), ("catalog_price", "price_catalog")):
+        if cat.col(col) is None or it.get(key) in (None, ""):
+            continue
+        value = float(it[key]) if col == "catalog_price" else it[key]
+        if cat.get(row, col) != value:
+            cat.set(row, col, value)
+            changed = True
+    if changed:
+        cat.set(row, "catalog_scraped_at", now_iso())
+    return changed
+
+
+def write_catalog_rows(cat: WorksheetIndex, items: List[Dict]) -> Tuple[int, int]:
+    cat.require("product_id", "product_url")
     appended = 0
     for it in items:
         pid = str(it["product_id"])
-        if pid in idx:
+        existing = cat.row(pid)
+        if existing is not None:
+            refresh_catalog_row(cat, existing, it)
             continue
-        row = first_empty_row(ws, hm["product_id"])
-        ws.cell(row=row, column=hm["product_id"]).value = pid
-        ws.cell(row=row, column=hm["product_url"]).value = it["product_url"]
-        if "source" in hm:
-            ws.cell(row=row, column=hm["source"]).value = "JBG"
-        if "catalog_title" in hm and it.get("title_catalog"):
-            ws.cell(row=row, column=hm["catalog_title"]).value = it["title_catalog"]
-        if "catalog_price" in hm and it.get("price_catalog") is not None:
-            ws.cell(row=row, column=hm["catalog_price"]).value = float(it["price_catalog"])
-        if "thumb_url" in hm and it.get("thumb_url"):
-            ws.cell(row=row, column=hm["thumb_url"]).value = it["thumb_url"]
-        if "catalog_scraped_at" in hm:
-            ws.cell(row=row, column=hm["catalog_scraped_at"]).value = now_iso()
+        row = cat.insert(pid)
+        cat.set(row, "product_url", it["product_url"])
+        cat.set(row, "source", "JBG")
+        if it.get("title_catalog"):
+            cat.set(row, "catalog_title", it["title_catalog"])
+        if it.get("price_catalog") is not None:
+            cat.set(row, "catalog_price", float(it["price_catalog"]))
+        if it.get("thumb_url"):
+            cat.set(row, "thumb_url", it["thumb_url"])
+        cat.set(row, "catalog_scraped_at", now_iso())
         appended += 1
 
     return len(items), appended
 
 
-def collect_detail_targets(ws_catalog, ws_detail, resume: bool) -> List[Tuple[str, str]]:
+def _scraped_ok(det: WorksheetIndex, row: Optional[int]) -> bool:
+    status = det.get(row, "detail_status") if row else None
+    return bool(status and str(status).upper().startswith("OK"))
+
+
+def collect_detail_targets(cat: WorksheetIndex, det: WorksheetIndex, resume: bool) -> List[Tuple[str, str]]:
     """
     Return [(product_id, product_url)] that need detail scrape.
     If resume=True, skip ones already present in detail sheet OR with detail_status=OK.
     """
-    hmc = header_map(ws_catalog)
-    hmd = header_map(ws_detail)
-
-    for col in ("product_id", "product_url"):
-        if col not in hmc:
-            raise RuntimeError(f"Sheet {ws_catalog.title} missing required header: {col}")
-    if "product_id" not in hmd:
-        raise RuntimeError(f"Sheet {ws_detail.title} missing required header: product_id")
-
-    existing_detail = build_existing_index(ws_detail, "product_id")
+    cat.require("product_id", "product_url")
+    det.require("product_id")
 
     targets = []
-    for r in range(2, ws_catalog.max_row + 1):
-        pid = ws_catalog.cell(row=r, column=hmc["product_id"]).value
-        url = ws_catalog.cell(row=r, column=hmc["product_url"]).value
+    for r in cat.data_rows():
+        pid = cat.get(r, "product_id")
+        url = cat.get(r, "product_url")
         if not pid or not url:
             continue
         pid = str(pid).strip()
         url = str(url).strip()
 
-        if resume and pid in existing_detail:
-            # if already scraped OK, skip
-            drow = existing_detail[pid]
-            status = ws_detail.cell(row=drow, column=hmd.get("detail_status", 0)).value if hmd.get("detail_status") else None
-            if status and str(status).upper().startswith("OK"):
-                continue
+        # if already scraped OK, skip
+        if resume and _scraped_ok(det, det.row(pid)):
+            continue
         targets.append((pid, url))
     return targets
 
 
-def upsert_detail_row(ws_detail, pid: str, url: str, data: Dict, ok: bool, err: Optional[str] = None):
-    hm = header_map(ws_detail)
-    if "product_id" not in hm:
-        raise RuntimeError(f"Sheet {ws_detail.title} missing required header: product_id")
+_EPOCH = _dt.datetime(1970, 1, 1, tzinfo=_dt.timezone.utc)
 
-    idx = build_existing_index(ws_detail, "product_id")
-    if pid in idx:
-        row = idx[pid]
-    else:
-        row = first_empty_row(ws_detail, hm["product_id"])
-        ws_detail.cell(row=row, column=hm["product_id"]).value = pid
+
+def sitemap_products(entries: Iterable[SitemapEntry]) -> List[Dict]:
+    """Product items (same shape as extract_catalog_products, plus lastmod) from sitemap entries."""
+    out: Dict[str, Dict] = {}
+    for e in entries:
+        m = PRODUCT_RE.search(urlparse(e.loc).path)
+        if not m:
+            continue
+        pid = m.group("pid")
+        prev = out.get(pid)
+        if prev is None:
+            out[pid] = {"product_id": pid, "product_url": e.loc, "lastmod": e.lastmod}
+        elif (parse_lastmod(e.lastmod) or _EPOCH) > (parse_lastmod(prev["lastmod"]) or _EPOCH):
+            prev["lastmod"] = e.lastmod
+    return list(out.values())
+
+
+def collect_stale_targets(cat: WorksheetIndex, det: WorksheetIndex, lastmods: Dict[str, Optional[str]]) -> List[Tuple[str, str]]:
+    """
+    Detail targets for sitemap mode: products never scraped OK, plus products whose
+    sitemap <lastmod> is newer than their detail_scraped_at. Catalog row order.
+    """
+    targets = []
+    for pid, url in collect_detail_targets(cat, det, resume=False):
+        drow = det.row(pid)
+        if not _scraped_ok(det, drow):
+            targets.append((pid, url))
+            continue
+        changed = parse_lastmod(lastmods.get(pid))
+        scraped = det.get(drow, "detail_scraped_at")
+        scraped_at = parse_lastmod(str(scraped)) if scraped else None
+        if changed is not None and (scraped_at is None or changed > scraped_at):
+            targets.append((pid, url))
+    return targets
+
+
+def detail_candidates(cat: WorksheetIndex, det: WorksheetIndex, lastmods: Optional[Dict[str, Optional[str]]] = None) -> List[DetailCandidate]:
+    """Every catalog product with what the scheduler needs from both sheets, in catalog row order."""
+    out = []
+    for pid, url in collect_detail_targets(cat, det, resume=False):
+        crow = cat.row(pid)
+        drow = det.row(pid)
+        scraped = det.get(drow, "detail_scraped_at") if drow else None
+        out.append(
+            DetailCandidate(
+                product_id=pid,
+                url=url,
+                detail_status=det.get(drow, "detail_status") if drow else None,
+                detail_scraped_at=str(scraped) if scraped else None,
+                catalog_title=cat.get(crow, "catalog_title"),
+                catalog_price=cat.get(crow, "catalog_price"),
+                lastmod=(lastmods or {}).get(pid),
+            )
+        )
+    return out
+
+
+def upsert_detail_row(
+    det: WorksheetIndex,
+    pid: str,
+    url: str,
+    data: Dict,
+    ok: bool,
+    err: Optional[str] = None,
+    scraped_at: Optional[str] = None,
+):
+    det.require("product_id")
+    row = det.row(pid)
+    if row is None:
+        row = det.insert(pid)
 
     # common fields
-    if "product_url" in hm:
-        ws_detail.cell(row=row, column=hm["product_url"]).value = url
-    if "detail_scraped_at" in hm:
-        ws_detail.cell(row=row, column=hm["detail_scraped_at"]).value = now_iso()
-    if "detail_status" in hm:
-        ws_detail.cell(row=row, column=hm["detail_status"]).value = "OK" if ok else "ERR"
-    if "detail_error" in hm:
-        ws_detail.cell(row=row, column=hm["detail_error"]).value = err
+    det.set(row, "product_url", url)
+    det.set(row, "detail_scraped_at", scraped_at or now_iso())
+    det.set(row, "detail_status", "OK" if ok else "ERR")
+    det.set(row, "detail_error", err)
 
     # structured payloads
     if ok:
-        if "title" in hm and data.get("title_detail"):
-            ws_detail.cell(row=row, column=hm["title"]).value = data["title_detail"]
-        if "price" in hm and data.get("price_detail") is not None:
-            ws_detail.cell(row=row, column=hm["price"]).value = float(data["price_detail"])
-        if "model_code" in hm and data.get("model_code"):
-            ws_detail.cell(row=row, column=hm["model_code"]).value = data["model_code"]
-        if "glove_profile_json" in hm:
-            ws_detail.cell(row=row, column=hm["glove_profile_json"]).value = safe_json(data.get("glove_profile") or {})
-        if "description_snippet" in hm and data.get("description_snippet"):
-            ws_detail.cell(row=row, column=hm["description_snippet"]).value = data["description_snippet"]
-        if "images_json" in hm:
-            ws_detail.cell(row=row, column=hm["images_json"]).value = safe_json(data.get("images") or [])
+        if data.get("title_detail"):
+            det.set(row, "title", data["title_detail"])
+        if data.get("price_detail") is not None:
+            det.set(row, "price", float(data["price_detail"]))
+        if data.get("model_code"):
+            det.set(row, "model_code", data["model_code"])
+        det.set(row, "glove_profile_json", safe_json(data.get("glove_profile") or {}))
+        if data.get("description_snippet"):
+            det.set(row, "description_snippet", data["description_snippet"])
+        det.set(row, "images_json", safe_json(data.get("images") or []))
 
         # Also store a single merged spec_json for Codex
-        if "spec_json" in hm:
+        if det.col("spec_json"):
             merged = {
                 "model_code": data.get("model_code"),
                 "glove_profile": data.get("glove_profile") or {},
             }
-            ws_detail.cell(row=row, column=hm["spec_json"]).value = safe_json(merged)
+            det.set(row, "spec_json", safe_json(merged))
+
+
+def apply_detail_record(det: WorksheetIndex, rec: Dict) -> None:
+    """Write one journaled detail result ({pid, url, data, err, scraped_at}) into the detail sheet."""
+    if rec.get("err") is None:
+        upsert_detail_row(det, rec["pid"], rec["url"], rec.get("data") or {}, ok=True, err=None, scraped_at=rec.get("scraped_at"))
+    else:
+        upsert_detail_row(det, rec["pid"], rec["url"], data={}, ok=False, err=rec["err"], scraped_at=rec.get("scraped_at"))
+
+
+def reparse_from_archive(cat: WorksheetIndex, det: WorksheetIndex, runtime: ScraperRuntime) -> Tuple[int, int]:
+    """
+    Rebuild detail rows from the latest archived copy of each catalog product page.
+    No network I/O; rows keep the archived fetch time as detail_scraped_at.
+    Returns (reparsed, missing_from_archive).
+    """
+    results, missing = runtime.reparse_archive(collect_detail_targets(cat, det, resume=False))
+    for pid, url, data, err, fetched_at in results:
+        if err is None:
+            upsert_detail_row(det, pid, url, data, ok=True, err=None, scraped_at=fetched_at)
+        else:
+            upsert_detail_row(det, pid, url, data={}, ok=False, err=err, scraped_at=fetched_at)
+            print(f"[JBG REPARSE] Error on {pid}: {err}")
+    return len(results), missing
 
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--xlsx", required=True, help="Path to GloveIQ master template XLSX")
     ap.add_argument("--start-url", default=DEFAULT_START_URL, help="Catalog start URL")
-    ap.add_argument("--delay", type=float, default=1.25, help="Delay between requests (seconds)")
-    ap.add_argument("--max-pages", type=int, default=25, help="Max catalog pages to crawl (0 to skip catalog phase)")
+    ap.add_argument("--parser", choices=sorted(DETAIL_PARSERS), default="soup", help="DOM extractor behind the JSON-LD/page-state path: BeautifulSoup heuristics or the equivalent lxml/XPath fast path")
+    ap.add_argument("--max-pages", type=int, default=25, help="Max catalog pages to crawl this run (0 to skip catalog phase)")
+    ap.add_argument("--discover", choices=["catalog", "sitemap"], default="catalog", help="Find products by paginating --start-url or by streaming the site's XML sitemaps")
+    ap.add_argument("--sitemap-url", action="append", default=[], help="Sitemap/sitemap index to read (repeatable; default: from robots.txt)")
     ap.add_argument("--max-details", type=int, default=0, help="Max product detail pages to scrape (0 to skip details)")
     ap.add_argument("--resume", action="store_true", help="Skip already-scraped detail rows with detail_status=OK")
+    ap.add_argument("--schedule", choices=["sheet", "staleness"], default="sheet", help="Detail target order: catalog sheet order, or most-likely-changed first (--max-details is the per-run budget)")
+    ap.add_argument("--min-refresh-days", type=float, default=DEFAULT_MIN_AGE_DAYS, help="With --schedule staleness, don't refresh OK rows younger than this unless the catalog/sitemap shows a change")
+    add_runtime_args(ap, delay=1.25)
     args = ap.parse_args()
 
-    sess = get_session()
-    wb = load_wb(args.xlsx)
+    runtime = ScraperRuntime.from_args(args, make_adapter(args.parser))
+    with runtime.stages.stage("open_workbook"):
+        wb = open_workbook(args.xlsx, args.staging_db) if args.staging_db else load_wb(args.xlsx)
 
     if "JBG_Full_Catalog" not in wb.sheetnames or "JBG_Detail_Enrichment" not in wb.sheetnames:
         raise SystemExit("XLSX must contain sheets: JBG_Full_Catalog and JBG_Detail_Enrichment")
 
-    ws_cat = wb["JBG_Full_Catalog"]
-    ws_det = wb["JBG_Detail_Enrichment"]
+    cat = WorksheetIndex(wb["JBG_Full_Catalog"], "product_id")
+    det = WorksheetIndex(wb["JBG_Detail_Enrichment"], "product_id")
+
+    # detail results journaled by a run that crashed before its next workbook save
+    sink = JournalCheckpointer(wb, args.xlsx, lambda rec: apply_detail_record(det, rec), args.checkpoint_interval, runtime.metrics)
+    recovered = sink.recover()
+    if recovered:
+        print(f"[JBG DETAIL] Recovered {recovered} journaled results from an interrupted run")
+
+    if args.reparse_from_archive:
+        started = time.monotonic()
+        reparsed, missing = reparse_from_archive(cat, det, runtime)
+        save_workbook(wb, args.xlsx)
+        print(f"[JBG REPARSE] rows={reparsed} missing_from_archive={missing} seconds={time.monotonic() - started:.1f}")
+        print(f"[JBG REPORT] {runtime.write_run_report()}")
+        return
+
+    # -------------------
+    # Sitemap discovery
+    # -------------------
+    lastmods: Optional[Dict[str, Optional[str]]] = None
+    if args.discover == "sitemap" and args.max_pages > 0:
+        started = time.monotonic()
+        before = runtime.controller.stats["requests"]
+        try:
+            with runtime.stages.stage("sitemap") as st:
+                items = sitemap_products(iter_site_entries(runtime.session, runtime.controller, args.start_url, args.sitemap_url or None))
+                st.rows = len(items)
+        except (requests.RequestException, etree.XMLSyntaxError) as e:
+            raise SystemExit(f"[JBG SITEMAP] Discovery failed: {e}")
+        discovered, appended = write_catalog_rows(cat, items)
+        lastmods = {it["product_id"]: it["lastmod"] for it in items}
+        save_workbook(wb, args.xlsx)
+        print(
+            f"[JBG SITEMAP] products={discovered} appended_new={appended} "
+            f"requests={runtime.controller.stats['requests'] - before} seconds={time.monotonic() - started:.1f}"
+        )
 
     # -------------------
     # Catalog phase
     # -------------------
-    if args.max_pages > 0:
+    if args.discover == "catalog" and args.max_pages > 0:
         start = args.start_url
-        print(f"[JBG CATALOG] Start: {start}")
-        total_unique_before = len(build_existing_index(ws_cat, "product_id"))
-        total_discovered = 0
-        total_appended = 0
-
-        page = 1
-        url = start
-        while page <= args.max_pages:
-            if page == 1:
-                url = start
-            else:
-                url = set_query_param(start, "page", str(page))
-            print(f"[JBG CATALOG] Fetch page {page}: {url}")
-            resp = sess.get(url, timeout=30)
-            resp.raise_for_status()
-
-            items = extract_catalog_products(resp.text, url)
-            discovered, appended = write_catalog_rows(ws_cat, items)
-            total_discovered += discovered
-            total_appended += appended
-
-            total_unique_now = len(build_existing_index(ws_cat, "product_id"))
-            print(f"[JBG CATALOG] Page {page}: discovered={discovered} appended_new={appended} total_unique={total_unique_now}")
-
-            # stop if no new appended (likely end of pagination / filtered list exhausted)
-            if appended == 0 and page > 1:
-                print("[JBG CATALOG] No new items appended; stop.")
-                break
+        cursor_key = f"catalog:{start}"
+        cursor = runtime.cursors.get("JBG", cursor_key)
+        if cursor.get("next_page") and not cursor.get("next_url"):
+            # cursor saved before pagination moved into scraper_core
+            cursor["next_url"] = set_query_param(start, "page", str(cursor.pop("next_page")))
+            runtime.cursors.save("JBG", cursor_key, cursor)
 
-            time.sleep(args.delay)
-            page += 1
-
-        wb.save(args.xlsx)
-        print(f"[JBG CATALOG] Saved workbook after catalog phase: {args.xlsx} (new={total_appended}, was={total_unique_before})")
+        print(f"[JBG CATALOG] Start: {start}")
+        total_unique_before = len(cat)
+        stats = runtime.crawl_catalog(
+            start,
+            args.max_pages,
+            lambda items: write_catalog_rows(cat, items),
+            Checkpointer(wb, args.xlsx, every=1, metrics=runtime.metrics),
+            restart=args.restart_crawl,
+        )
+        print(
+            f"[JBG CATALOG] Saved workbook after catalog phase: {args.xlsx} "
+            f"(new={stats['appended']}, was={total_unique_before}, unchanged_pages={stats['unchanged_pages']})"
+        )
 
     # -------------------
     # Detail phase
     # -------------------
     if args.max_details > 0:
-        targets = collect_detail_targets(ws_cat, ws_det, resume=args.resume)
-        if args.resume:
-            # filter further: skip if detail already exists and is OK
-            pass
-        print(f"[JBG DETAIL] Targets: {len(targets)} (resume={args.resume})")
-        count = 0
-        for (pid, url) in targets:
-            if count >= args.max_details:
-                break
-            count += 1
-            print(f"[JBG DETAIL] ({count}/{min(len(targets), args.max_details)}) {pid}")
-            try:
-                resp = sess.get(url, timeout=30)
-                resp.raise_for_status()
-                data = parse_detail_page(resp.text, url)
-                upsert_detail_row(ws_det, pid, url, data, ok=True, err=None)
-            except Exception as e:
-                upsert_detail_row(ws_det, pid, url, data={}, ok=False, err=str(e))
-                print(f"[JBG DETAIL] Error on {pid}: {e}")
-
-            # checkpoint every 50
-            if count % 50 == 0:
-                wb.save(args.xlsx)
-                print(f"[JBG DETAIL] Checkpoint saved at {count} rows.")
-
-            time.sleep(args.delay)
-
-        wb.save(args.xlsx)
+        candidates = {c.product_id: c for c in detail_candidates(cat, det, lastmods)}
+        history = runtime.cursors.detail_history("JBG")
+        if args.schedule == "staleness":
+            scheduled = schedule_refresh(candidates.values(), history, args.max_details, args.min_refresh_days)
+            targets = [(t.product_id, t.url) for t in scheduled]
+            reasons = " ".join(f"{k}={v}" for k, v in sorted(reason_counts(scheduled).items()))
+            print(f"[JBG SCHEDULE] budget={args.max_details} picked={len(targets)} of {len(candidates)} ({reasons or 'nothing due'})")
+        elif lastmods is not None:
+            # sitemap mode: only new, failed, or changed-since-last-scrape products
+            targets = collect_stale_targets(cat, det, lastmods)
+        else:
+            targets = collect_detail_targets(cat, det, resume=args.resume)
+        print(f"[JBG DETAIL] Targets: {len(targets)} (resume={args.resume}, concurrency={runtime.concurrency}, parse_workers={runtime.parse_workers})")
+
+        changed = 0
+
+        def on_result(pid: str, url: str, data: Dict, err: Optional[str]) -> None:
+            nonlocal changed
+            # journaled now, written to the sheet by the background checkpoint;
+            # a failed page that succeeds on retry overwrites its ERR row in place
+            sink.submit({"pid": pid, "url": url, "data": data if err is None else {}, "err": err, "scraped_at": now_iso()})
+            if err is None:
+                # change history feeds --schedule staleness on later runs
+                c = candidates.get(pid)
+                sig = catalog_signature(c.catalog_title, c.catalog_price) if c else None
+                if runtime.cursors.record_detail("JBG", pid, detail_fingerprint(data), sig):
+                    changed += 1
+
+        with sink:
+            runtime.run_details(targets[: args.max_details], on_result)
+        print(f"[JBG DETAIL] content changed since previous scrape: {changed} (previously tracked: {len(history)})")
         print(f"[DONE] Final workbook saved: {args.xlsx}")
 
+    for line in runtime.summary():
+        print(line)
+    print(f"[JBG REPORT] {runtime.write_run_report()}")
+
 
 if __name__ == "__main__":
     main()
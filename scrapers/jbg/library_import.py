@@ -7,11 +7,21 @@ Reads scraper workbook XLSX and writes deterministic exports:
 - listings.raw.jsonl
 - media_manifest.jsonl
 - import_report.json
+- export_index.json, only with --compress/--shards (files per export; the
+  exports are gzip/zstd files split by listing_pk hash range, see
+  export_shards.py)
 
 Design goals:
 - stable listing primary key: source + source_listing_id
 - deterministic ordering and keys
-- resumable via input fingerprint checkpoint
+- resumable via input fingerprint checkpoint (workbook sha256)
+- incremental: rows whose content hash is unchanged since the last export
+  reuse their output lines (export_cache.py); only new/changed rows are
+  re-normalized
+- row normalization lives in glove_normalize.py (normalize_batch)
+- import_report.json "metrics": wall/CPU time, rows/sec, bytes/sec and peak
+  RSS per stage (run_stats.py); --trace-memory adds tracemalloc heap peaks and
+  top allocators, --profile DIR writes cProfile stats + collapsed stacks
 - no secret handling; optional B2 prefix only from env/CLI
 """
 
@@ -23,13 +33,17 @@ import hashlib
 import json
 import mimetypes
 import os
-import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
-from openpyxl import load_workbook
+from export_cache import ExportRowCache, row_hash
+from export_shards import COMPRESSIONS, INDEX_FILE as EXPORT_INDEX_FILE, check_compression, file_name, shard_of, write_export, write_index
+from glove_normalize import Normalized, SourceRow, clean, normalize_batch, normalize_row, safe_float, safe_json
+from run_stats import StageRecorder, add_profile_args, start_profiler
+from workbook_snapshot import DEFAULT_SNAPSHOT_DIR, SheetSnapshot, WorkbookSnapshot, content_hash, load_snapshot
 
 
 REQUIRED_SHEETS: Dict[str, List[str]] = {
@@ -70,48 +84,6 @@ REQUIRED_SHEETS: Dict[str, List[str]] = {
     ],
 }
 
-KNOWN_BRANDS = [
-    "Wilson",
-    "Rawlings",
-    "Mizuno",
-    "Easton",
-    "Marucci",
-    "Franklin",
-    "Louisville Slugger",
-    "Nike",
-    "Nokona",
-    "SSK",
-    "Adidas",
-    "All Star",
-    "Akadema",
-    "44 Pro",
-]
-
-REQUIRED_SPEC_FIELDS = [
-    "Item #",
-    "Back",
-    "Color",
-    "Fit",
-    "Leather",
-    "Level",
-    "Lining",
-    "Padding",
-    "Pattern",
-    "Series",
-    "Shell",
-    "Size",
-    "Special Feature",
-    "Sport",
-    "Throwing Hand",
-    "Usage",
-    "Used by",
-    "Web",
-    "Wrist",
-    "Age Group",
-    "Description",
-]
-
-
 @dataclass
 class ValidationResult:
     ok: bool
@@ -123,284 +95,47 @@ def _now_iso() -> str:
     return dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 
-def _clean(v: Any) -> Optional[str]:
-    if v is None:
-        return None
-    s = str(v).strip()
-    return s if s else None
-
-
-def _safe_float(v: Any) -> Optional[float]:
-    if v is None or v == "":
-        return None
-    try:
-        return float(v)
-    except Exception:
-        s = _clean(v)
-        if not s:
-            return None
-        m = re.search(r"([\d,]+(?:\.\d+)?)", s)
-        if not m:
-            return None
-        try:
-            return float(m.group(1).replace(",", ""))
-        except Exception:
-            return None
-
-
-def _safe_json(v: Any, fallback: Any) -> Any:
-    if v is None:
-        return fallback
-    if isinstance(v, (dict, list)):
-        return v
-    s = _clean(v)
-    if not s:
-        return fallback
-    try:
-        return json.loads(s)
-    except Exception:
-        return fallback
-
-
-def _header_map(ws) -> Dict[str, int]:
-    out: Dict[str, int] = {}
-    for c in range(1, ws.max_column + 1):
-        v = ws.cell(row=1, column=c).value
-        k = _clean(v)
-        if k:
-            out[k] = c
-    return out
-
-
-def validate_workbook(xlsx_path: str) -> ValidationResult:
+def validate_workbook(
+    xlsx_path: str,
+    snapshot_dir: Optional[str] = DEFAULT_SNAPSHOT_DIR,
+    stats: Optional[StageRecorder] = None,
+) -> ValidationResult:
     errors: List[str] = []
     warnings: List[str] = []
+    stats = stats or StageRecorder()
 
-    wb = load_workbook(xlsx_path, read_only=False, data_only=True)
+    with stats.stage("snapshot", bytes=os.path.getsize(xlsx_path)):
+        wb = load_snapshot(xlsx_path, snapshot_dir)
 
     for sheet, required_cols in REQUIRED_SHEETS.items():
-        if sheet not in wb.sheetnames:
+        if sheet not in wb:
             errors.append(f"Missing required sheet: {sheet}")
             continue
-        ws = wb[sheet]
-        headers = _header_map(ws)
+        headers = wb[sheet].headers
         for col in required_cols:
             if col not in headers:
                 errors.append(f"Sheet {sheet} missing required column: {col}")
+        if wb[sheet].uncached_formulas:
+            # values are read as Excel cached them (data_only); re-save the workbook in Excel/Sheets to fill them in
+            warnings.append(f"Sheet {sheet} has {wb[sheet].uncached_formulas} formula cells without cached values (read as empty)")
 
     if errors:
         return ValidationResult(ok=False, errors=errors, warnings=warnings)
 
     # Row-level checks
-    ws_catalog = wb["Catalog"]
-    hc = _header_map(ws_catalog)
-    for r in range(2, ws_catalog.max_row + 1):
-        listing_id = _clean(ws_catalog.cell(r, hc["listing_id"]).value)
-        url = _clean(ws_catalog.cell(r, hc["product_url"]).value)
-        if any(_clean(ws_catalog.cell(r, c).value) for c in hc.values()):
-            if not listing_id:
-                errors.append(f"Catalog row {r} missing listing_id")
-            if not url:
-                errors.append(f"Catalog row {r} missing product_url")
-
-    ws_jcat = wb["JBG_Full_Catalog"]
-    hjc = _header_map(ws_jcat)
-    for r in range(2, ws_jcat.max_row + 1):
-        pid = _clean(ws_jcat.cell(r, hjc["product_id"]).value)
-        url = _clean(ws_jcat.cell(r, hjc["product_url"]).value)
-        if any(_clean(ws_jcat.cell(r, c).value) for c in hjc.values()):
-            if not pid:
-                errors.append(f"JBG_Full_Catalog row {r} missing product_id")
-            if not url:
-                errors.append(f"JBG_Full_Catalog row {r} missing product_url")
-
-    ws_jdet = wb["JBG_Detail_Enrichment"]
-    hjd = _header_map(ws_jdet)
-    for r in range(2, ws_jdet.max_row + 1):
-        pid = _clean(ws_jdet.cell(r, hjd["product_id"]).value)
-        url = _clean(ws_jdet.cell(r, hjd["product_url"]).value)
-        if any(_clean(ws_jdet.cell(r, c).value) for c in hjd.values()):
-            if not pid:
-                errors.append(f"JBG_Detail_Enrichment row {r} missing product_id")
-            if not url:
-                errors.append(f"JBG_Detail_Enrichment row {r} missing product_url")
+    with stats.stage("rows") as st:
+        st.rows = 0
+        for sheet, key in (("Catalog", "listing_id"), ("JBG_Full_Catalog", "product_id"), ("JBG_Detail_Enrichment", "product_id")):
+            for r, row in wb[sheet].rows():
+                st.rows += 1
+                if not clean(row.get(key)):
+                    errors.append(f"{sheet} row {r} missing {key}")
+                if not clean(row.get("product_url")):
+                    errors.append(f"{sheet} row {r} missing product_url")
 
     return ValidationResult(ok=(len(errors) == 0), errors=errors, warnings=warnings)
 
 
-def _norm_throw(v: Optional[str]) -> Optional[str]:
-    s = (_clean(v) or "").lower()
-    if not s:
-        return None
-    if "rht" in s or "right" in s:
-        return "RHT"
-    if "lht" in s or "left" in s:
-        return "LHT"
-    return "UNK"
-
-
-def _norm_position(v: Optional[str]) -> Optional[str]:
-    s = (_clean(v) or "").lower()
-    if not s:
-        return None
-    if "outfield" in s or s == "of":
-        return "OF"
-    if "infield" in s or s == "if":
-        return "IF"
-    if "pitch" in s:
-        return "P"
-    if "catch" in s:
-        return "C"
-    if "1b" in s or "first" in s:
-        return "1B"
-    if "middle" in s or "ss" in s or "2b" in s:
-        return "MI"
-    if "utility" in s:
-        return "Utility"
-    return _clean(v)
-
-
-def _extract_size_in(text: Optional[str]) -> Optional[float]:
-    s = _clean(text)
-    if not s:
-        return None
-    m = re.search(r"(\d{1,2}\.\d{1,2})", s)
-    if m:
-        return _safe_float(m.group(1))
-    m = re.search(r"(\d{1,2})\s*[\-\s]\s*(\d)\s*/\s*(\d)", s)
-    if m:
-        return float(m.group(1)) + (float(m.group(2)) / float(m.group(3)))
-    m = re.search(r"(\d{1,2}(?:\.\d+)?)\s*\"", s)
-    if m:
-        return _safe_float(m.group(1))
-    return None
-
-
-def _infer_brand(title: Optional[str], explicit: Optional[str]) -> Optional[str]:
-    if _clean(explicit):
-        return _clean(explicit)
-    t = (_clean(title) or "").lower()
-    for brand in KNOWN_BRANDS:
-        if brand.lower() in t:
-            return brand
-    return None
-
-
-def _infer_model(title: Optional[str], explicit: Optional[str]) -> Optional[str]:
-    if _clean(explicit):
-        return _clean(explicit)
-    t = _clean(title)
-    if not t:
-        return None
-    m = re.search(r"\[Model:\s*([^\]]+)\]", t, re.I)
-    if m:
-        return _clean(m.group(1))
-    m = re.search(r"\(([A-Z0-9\-]{5,})\)\s*$", t)
-    if m:
-        return _clean(m.group(1))
-    return None
-
-
-def _infer_sport(title: Optional[str], profile: Dict[str, Any]) -> str:
-    title_l = (_clean(title) or "").lower()
-    text = " ".join(str(v) for v in profile.values()).lower()
-    merged = f"{title_l} {text}"
-    if "softball" in merged or "fastpitch" in merged:
-        return "softball"
-    return "baseball"
-
-
-def _norm_images(v: Any) -> List[str]:
-    arr = _safe_json(v, [])
-    out: List[str] = []
-    if not isinstance(arr, list):
-        return out
-    seen = set()
-    for item in arr:
-        u = _clean(item)
-        if not u or not (u.startswith("http://") or u.startswith("https://")):
-            continue
-        if u in seen:
-            continue
-        seen.add(u)
-        out.append(u)
-    return out
-
-
-def _slug(s: Optional[str]) -> str:
-    raw = (_clean(s) or "unknown").lower()
-    return re.sub(r"[^a-z0-9]+", "-", raw).strip("-") or "unknown"
-
-
-def _record_type_from_listing(*, source: str, condition: Optional[str], model_code: Optional[str], title: Optional[str]) -> str:
-    text = " ".join([source or "", condition or "", model_code or "", title or ""]).lower()
-    artifact_markers = ["custom", "one of one", "1/1", "game used", "player issued", "modified", "re-lace", "relace"]
-    if any(marker in text for marker in artifact_markers):
-        return "artifact"
-    if model_code and _clean(model_code) and _clean(model_code) != "Unknown":
-        return "variant"
-    if source.upper() in {"JBG", "JUSTBALLGLOVES"}:
-        return "variant"
-    return "artifact"
-
-
-def _build_spec_map(
-    title: Optional[str],
-    description: Optional[str],
-    model_code: Optional[str],
-    size_in: Optional[float],
-    throw_hand: Optional[str],
-    sport: Optional[str],
-    web_type: Optional[str],
-    glove_profile: Optional[Dict[str, Any]] = None,
-    spec_json: Optional[Dict[str, Any]] = None,
-) -> Tuple[Dict[str, Optional[str]], Dict[str, float]]:
-    by_lower: Dict[str, str] = {}
-    for container in (glove_profile or {}, spec_json or {}):
-        for k, v in container.items():
-            kk = _clean(k)
-            vv = _clean(v)
-            if kk and vv:
-                by_lower[kk.lower()] = vv
-
-    def from_any(*keys: str) -> Optional[str]:
-        for key in keys:
-            hit = by_lower.get(key.lower())
-            if hit:
-                return hit
-        return None
-
-    out: Dict[str, Optional[str]] = {
-        "Item #": _clean(model_code),
-        "Back": from_any("Back"),
-        "Color": from_any("Color"),
-        "Fit": from_any("Fit"),
-        "Leather": from_any("Leather"),
-        "Level": from_any("Level"),
-        "Lining": from_any("Lining"),
-        "Padding": from_any("Padding"),
-        "Pattern": from_any("Pattern"),
-        "Series": from_any("Series"),
-        "Shell": from_any("Shell"),
-        "Size": from_any("Size") or (f"{size_in:.2f}" if isinstance(size_in, (int, float)) else None),
-        "Special Feature": from_any("Special Feature"),
-        "Sport": from_any("Sport") or _clean(sport),
-        "Throwing Hand": from_any("Throwing Hand") or _clean(throw_hand),
-        "Usage": from_any("Usage"),
-        "Used by": from_any("Used by"),
-        "Web": from_any("Web") or _clean(web_type),
-        "Wrist": from_any("Wrist"),
-        "Age Group": from_any("Age Group"),
-        "Description": _clean(description) or _clean(title),
-    }
-
-    confidence: Dict[str, float] = {}
-    for field in REQUIRED_SPEC_FIELDS:
-        value = out.get(field)
-        confidence[field] = 0.92 if value else 0.0
-    return out, confidence
-
-
 def _guess_ext_and_ct(url: str) -> Tuple[str, str]:
     no_query = url.split("?", 1)[0]
     ct, _ = mimetypes.guess_type(no_query)
@@ -418,364 +153,134 @@ def _image_target_key(prefix: str, source: str, listing_id: str, index_1: int, i
     return key, ct
 
 
-def _iter_sheet_rows(ws, headers: Dict[str, int]) -> Iterable[Tuple[int, Dict[str, Any]]]:
-    for r in range(2, ws.max_row + 1):
-        row = {k: ws.cell(r, c).value for k, c in headers.items()}
-        if not any(_clean(v) for v in row.values()):
-            continue
-        yield r, row
-
-
-def _stable_key(source: str, listing_id: str) -> str:
-    return f"{source}:{listing_id}"
-
-
-def _build_jbg_catalog_index(ws) -> Dict[str, Dict[str, Any]]:
-    h = _header_map(ws)
+def _build_jbg_catalog_index(sheet: SheetSnapshot) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """Catalog rows keyed by product_id, plus the number of non-empty rows scanned."""
     out: Dict[str, Dict[str, Any]] = {}
-    for r, row in _iter_sheet_rows(ws, h):
-        pid = _clean(row.get("product_id"))
+    scanned = 0
+    for r, row in sheet.rows():
+        scanned += 1
+        pid = clean(row.get("product_id"))
         if not pid:
             continue
         out[pid] = {
-            "sheet": ws.title,
+            "sheet": sheet.title,
             "row": r,
-            "product_url": _clean(row.get("product_url")),
-            "source": _clean(row.get("source")) or "JBG",
-            "catalog_title": _clean(row.get("catalog_title")),
-            "catalog_price": _safe_float(row.get("catalog_price")),
-            "thumb_url": _clean(row.get("thumb_url")),
-            "catalog_scraped_at": _clean(row.get("catalog_scraped_at")),
+            "product_url": clean(row.get("product_url")),
+            "source": clean(row.get("source")) or "JBG",
+            "catalog_title": clean(row.get("catalog_title")),
+            "catalog_price": safe_float(row.get("catalog_price")),
+            "thumb_url": clean(row.get("thumb_url")),
+            "catalog_scraped_at": clean(row.get("catalog_scraped_at")),
             "raw": row,
         }
-    return out
-
-
-def build_exports(xlsx_path: str, b2_prefix: str) -> Dict[str, Any]:
-    wb = load_workbook(xlsx_path, read_only=False, data_only=True)
-
-    listings: List[Dict[str, Any]] = []
-    raw_rows: List[Dict[str, Any]] = []
-    media_rows: List[Dict[str, Any]] = []
-    errors: List[str] = []
-    defaults_applied: Dict[str, int] = {}
-
-    by_source = {"SS": 0, "JBG": 0}
-    rows_scanned = {"Catalog": 0, "JBG_Full_Catalog": 0, "JBG_Detail_Enrichment": 0}
-
+    return out, scanned
+
+
+def _iter_source_rows(
+    wb: WorkbookSnapshot,
+    errors: List[str],
+    rows_scanned: Dict[str, int],
+) -> Iterator[Tuple[str, int, Dict[str, Any], Dict[str, Any]]]:
+    """
+    Rows that become listings, in export order, as (sheet, sheet row, row,
+    JBG catalog entry). Rows that can't be exported are reported in `errors`.
+    """
     # SS / Catalog
-    ws_ss = wb["Catalog"]
-    hs = _header_map(ws_ss)
-    for r, row in _iter_sheet_rows(ws_ss, hs):
+    for r, row in wb["Catalog"].rows():
         rows_scanned["Catalog"] += 1
-        listing_id = _clean(row.get("listing_id"))
-        url = _clean(row.get("product_url"))
-        if not listing_id or not url:
+        if not clean(row.get("listing_id")) or not clean(row.get("product_url")):
             errors.append(f"Catalog row {r} missing listing_id/product_url")
             continue
-
-        norm = _safe_json(row.get("normalized_json"), {})
-        norm_raw = norm.get("raw", {}) if isinstance(norm, dict) else {}
-        norm_obj = norm.get("norm", {}) if isinstance(norm, dict) else {}
-
-        title = _clean(row.get("title")) or _clean(norm_obj.get("title"))
-        brand = _infer_brand(title, _clean(row.get("brand")))
-        model = _infer_model(title, _clean(row.get("model")))
-        size_in = _safe_float(norm_obj.get("size_in")) if isinstance(norm_obj, dict) else None
-        throw_hand = _norm_throw(_clean(norm_obj.get("throw_hand")) if isinstance(norm_obj, dict) else None)
-        position = _norm_position(_clean(norm_obj.get("position")) if isinstance(norm_obj, dict) else None)
-        web_type = _clean(norm_obj.get("web")) if isinstance(norm_obj, dict) else None
-        description = _clean(norm_obj.get("description")) if isinstance(norm_obj, dict) else None
-        record_type = _record_type_from_listing(
-            source="SS",
-            condition=_clean(row.get("condition")),
-            model_code=model,
-            title=title,
-        )
-        canonical_name = " ".join([x for x in [brand, model, f"{size_in:.2f}" if isinstance(size_in, (int, float)) else None] if x]).strip() or title or "Unknown"
-        glove_id = (
-            f"variant:{_slug(brand)}:{_slug(model)}:{_slug(str(size_in) if size_in is not None else 'na')}:{_slug(throw_hand or 'unk')}"
-            if record_type == "variant"
-            else f"artifact:SS:{listing_id}"
-        )
-        specs_raw, specs_conf = _build_spec_map(
-            title=title,
-            description=description,
-            model_code=model,
-            size_in=size_in,
-            throw_hand=throw_hand,
-            sport=_infer_sport(title, {}),
-            web_type=web_type,
-            glove_profile={},
-            spec_json=norm_raw if isinstance(norm_raw, dict) else {},
-        )
-
-        if not brand:
-            defaults_applied["brand_unknown"] = defaults_applied.get("brand_unknown", 0) + 1
-        if not model:
-            defaults_applied["model_unknown"] = defaults_applied.get("model_unknown", 0) + 1
-
-        images = _norm_images(row.get("images_json"))
-        listing = {
-            "listing_pk": _stable_key("SS", listing_id),
-            "glove_id": glove_id,
-            "record_type": record_type,
-            "source": "SS",
-            "source_listing_id": listing_id,
-            "url": url,
-            "title": title,
-            "canonical_name": canonical_name,
-            "brand": brand or "Unknown",
-            "model": model or "Unknown",
-            "model_code": model or "Unknown",
-            "size_in": size_in,
-            "hand": throw_hand or "UNK",
-            "throw_hand": throw_hand or "UNK",
-            "player_position": position or "Unknown",
-            "position": position or "Unknown",
-            "web_type": web_type or "Unknown",
-            "sport": _infer_sport(title, {}),
-            "condition": _clean(row.get("condition")) or "Unknown",
-            "price": _safe_float(row.get("price")),
-            "currency": _clean(row.get("currency")) or "USD",
-            "created_at": None,
-            "seen_at": None,
-            "item_number": model or None,
-            "pattern": _clean(norm_obj.get("pattern")) if isinstance(norm_obj, dict) else None,
-            "series": _clean(norm_obj.get("series")) if isinstance(norm_obj, dict) else None,
-            "level": _clean(norm_obj.get("level")) if isinstance(norm_obj, dict) else None,
-            "age_group": _clean(norm_obj.get("age_group")) if isinstance(norm_obj, dict) else None,
-            "market_origin": None,
-            "raw_specs": norm_raw if isinstance(norm_raw, dict) else {},
-            "spec_fields_raw": specs_raw,
-            "normalized_specs": {k: v for k, v in specs_raw.items() if v},
-            "normalized_confidence": specs_conf,
-            "raw_html": None,
-            "raw_text": title,
-            "images": images,
-        }
-        listings.append(listing)
-        by_source["SS"] += 1
-
-        raw_rows.append(
-            {
-                "listing_pk": listing["listing_pk"],
-                "source": "SS",
-                "source_sheet": "Catalog",
-                "source_row": r,
-                "source_columns": row,
-                "parsed_normalized_json": norm,
-                "raw_html": None,
-                "raw_text": title,
-            }
-        )
+        yield "Catalog", r, row, {}
 
     # JBG index + details
-    ws_jcat = wb["JBG_Full_Catalog"]
-    for _ in _iter_sheet_rows(ws_jcat, _header_map(ws_jcat)):
-        rows_scanned["JBG_Full_Catalog"] += 1
-    jbg_catalog_idx = _build_jbg_catalog_index(ws_jcat)
-
-    ws_jdet = wb["JBG_Detail_Enrichment"]
-    hd = _header_map(ws_jdet)
-    for r, row in _iter_sheet_rows(ws_jdet, hd):
+    jbg_catalog_idx, rows_scanned["JBG_Full_Catalog"] = _build_jbg_catalog_index(wb["JBG_Full_Catalog"])
+
+    for r, row in wb["JBG_Detail_Enrichment"].rows():
         rows_scanned["JBG_Detail_Enrichment"] += 1
-        pid = _clean(row.get("product_id"))
-        detail_url = _clean(row.get("product_url"))
+        pid = clean(row.get("product_id"))
         if not pid:
             errors.append(f"JBG_Detail_Enrichment row {r} missing product_id")
             continue
-
         cat = jbg_catalog_idx.get(pid, {})
-        source = _clean(cat.get("source")) or "JBG"
-        url = detail_url or _clean(cat.get("product_url"))
-        if not url:
+        if not (clean(row.get("product_url")) or clean(cat.get("product_url"))):
             errors.append(f"JBG listing {pid} missing URL in catalog+detail")
             continue
+        yield "JBG_Detail_Enrichment", r, row, cat
 
-        glove_profile = _safe_json(row.get("glove_profile_json"), {})
-        spec_json = _safe_json(row.get("spec_json"), {})
-
-        title = _clean(row.get("title")) or _clean(cat.get("catalog_title"))
-        price = _safe_float(row.get("price"))
-        if price is None:
-            price = _safe_float(cat.get("catalog_price"))
-            if price is not None:
-                defaults_applied["price_from_catalog"] = defaults_applied.get("price_from_catalog", 0) + 1
-
-        brand = _infer_brand(title, None)
-        model_code = _clean(row.get("model_code")) or _infer_model(title, None)
-        model = model_code or _infer_model(title, None)
-
-        size_text = None
-        throw_text = None
-        pos_text = None
-        web_text = None
-
-        if isinstance(glove_profile, dict):
-            for k, v in glove_profile.items():
-                lk = (_clean(k) or "").lower()
-                if "size" in lk and not size_text:
-                    size_text = _clean(v)
-                if ("throw" in lk or "hand" in lk) and not throw_text:
-                    throw_text = _clean(v)
-                if "position" in lk and not pos_text:
-                    pos_text = _clean(v)
-                if "web" in lk and not web_text:
-                    web_text = _clean(v)
-
-        size_in = _extract_size_in(size_text) or _extract_size_in(title)
-        throw_hand = _norm_throw(throw_text)
-        position = _norm_position(pos_text)
-
-        if not brand:
-            defaults_applied["brand_unknown"] = defaults_applied.get("brand_unknown", 0) + 1
-        if not model:
-            defaults_applied["model_unknown"] = defaults_applied.get("model_unknown", 0) + 1
-
-        images = _norm_images(row.get("images_json"))
-        description = _clean(row.get("description_snippet"))
-        sport = _infer_sport(title, glove_profile if isinstance(glove_profile, dict) else {})
-        condition = "New" if source == "JBG" else "Unknown"
-        record_type = _record_type_from_listing(
-            source=source,
-            condition=condition,
-            model_code=model_code,
-            title=title,
-        )
-        canonical_name = " ".join([x for x in [brand, model_code or model, f"{size_in:.2f}" if isinstance(size_in, (int, float)) else None] if x]).strip() or title or "Unknown"
-        glove_id = (
-            f"variant:{_slug(brand)}:{_slug(model_code or model)}:{_slug(str(size_in) if size_in is not None else 'na')}:{_slug(throw_hand or 'unk')}"
-            if record_type == "variant"
-            else f"artifact:{source}:{pid}"
-        )
-        specs_raw, specs_conf = _build_spec_map(
-            title=title,
-            description=description,
-            model_code=model_code or model,
-            size_in=size_in,
-            throw_hand=throw_hand,
-            sport=sport,
-            web_type=web_text,
-            glove_profile=glove_profile if isinstance(glove_profile, dict) else {},
-            spec_json=spec_json if isinstance(spec_json, dict) else {},
-        )
 
-        listing = {
-            "listing_pk": _stable_key(source, pid),
-            "glove_id": glove_id,
-            "record_type": record_type,
-            "source": source,
-            "source_listing_id": pid,
-            "url": url,
-            "title": title,
-            "canonical_name": canonical_name,
-            "brand": brand or "Unknown",
-            "model": model or "Unknown",
-            "model_code": model_code or "Unknown",
-            "size_in": size_in,
-            "hand": throw_hand or "UNK",
-            "throw_hand": throw_hand or "UNK",
-            "player_position": position or "Unknown",
-            "position": position or "Unknown",
-            "web_type": web_text or "Unknown",
-            "sport": sport,
-            "condition": condition,
-            "price": price,
-            "currency": "USD",
-            "created_at": _clean(cat.get("catalog_scraped_at")),
-            "seen_at": _clean(row.get("detail_scraped_at")),
-            "item_number": model_code or None,
-            "pattern": _clean(glove_profile.get("pattern")) if isinstance(glove_profile, dict) else None,
-            "series": _clean(glove_profile.get("series")) if isinstance(glove_profile, dict) else None,
-            "level": _clean(glove_profile.get("level")) if isinstance(glove_profile, dict) else None,
-            "age_group": _clean(glove_profile.get("age_group")) if isinstance(glove_profile, dict) else None,
-            "market_origin": _clean(glove_profile.get("country")) if isinstance(glove_profile, dict) else None,
-            "raw_specs": {
-                "glove_profile": glove_profile if isinstance(glove_profile, dict) else {},
-                "spec_json": spec_json if isinstance(spec_json, dict) else {},
-            },
-            "spec_fields_raw": specs_raw,
-            "normalized_specs": {k: v for k, v in specs_raw.items() if v},
-            "normalized_confidence": specs_conf,
-            "raw_html": None,
-            "raw_text": _clean(row.get("description_snippet")) or title,
-            "images": images,
-        }
-        listings.append(listing)
-        by_source["JBG"] += 1
+NORMALIZE_CHUNK_ROWS = 256
 
-        raw_rows.append(
-            {
-                "listing_pk": listing["listing_pk"],
-                "source": source,
-                "source_sheet": "JBG_Detail_Enrichment",
-                "source_row": r,
-                "source_columns": row,
-                "catalog_columns": cat.get("raw", {}),
-                "parsed_glove_profile_json": glove_profile,
-                "parsed_spec_json": spec_json,
-                "raw_html": None,
-                "raw_text": _clean(row.get("description_snippet")) or title,
-            }
-        )
 
-    # Deduplicate by listing key (last writer wins), then sorted deterministic output
-    dedup: Dict[str, Dict[str, Any]] = {}
-    for l in listings:
-        dedup[l["listing_pk"]] = l
-    listings_sorted = [dedup[k] for k in sorted(dedup.keys())]
-
-    # Keep raw rows only for retained listing keys (last raw for each key)
-    raw_dedup: Dict[str, Dict[str, Any]] = {}
-    for rr in raw_rows:
-        raw_dedup[rr["listing_pk"]] = rr
-    raw_sorted = [raw_dedup[k] for k in sorted(raw_dedup.keys())]
-
-    # Media manifest (one row per listing with ordered image list + deterministic b2 key mapping)
-    prefix = (b2_prefix or "gloveiq").strip().strip("/")
-    image_total = 0
-    for l in listings_sorted:
-        mappings = []
-        for idx, img_url in enumerate(l.get("images") or [], start=1):
-            target_key, content_type = _image_target_key(prefix, l["source"], l["source_listing_id"], idx, img_url)
-            mappings.append(
-                {
-                    "image_index": idx,
-                    "source_url": img_url,
-                    "target_storage_key": target_key,
-                    "content_type": content_type,
-                    "mapping_key": f"{l['source']}:{l['source_listing_id']}:{idx}",
-                }
-            )
-            image_total += 1
-
-        media_rows.append(
+def _map_chunks(fn: Callable[..., List[Any]], items: Sequence[Any], workers: int, *args: Any) -> List[Any]:
+    """
+    fn(chunk, *args) over NORMALIZE_CHUNK_ROWS-row chunks of `items`, in
+    `workers` processes when there is more than one chunk. Results come back
+    flattened in input order, so merging them is the same as a serial loop.
+    """
+    chunks = [items[i : i + NORMALIZE_CHUNK_ROWS] for i in range(0, len(items), NORMALIZE_CHUNK_ROWS)]
+    if workers <= 1 or len(chunks) <= 1:
+        return [res for chunk in chunks for res in fn(chunk, *args)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        parts = pool.map(fn, chunks, *([arg] * len(chunks) for arg in args))
+        return [res for part in parts for res in part]
+
+
+def _media_prefix(b2_prefix: str) -> str:
+    return (b2_prefix or "gloveiq").strip().strip("/")
+
+
+def _media_row(listing: Dict[str, Any], prefix: str) -> Dict[str, Any]:
+    """Manifest row for one listing: ordered image list + deterministic b2 key mapping."""
+    mappings = []
+    for idx, img_url in enumerate(listing.get("images") or [], start=1):
+        target_key, content_type = _image_target_key(prefix, listing["source"], listing["source_listing_id"], idx, img_url)
+        mappings.append(
             {
-                "listing_pk": l["listing_pk"],
-                "source": l["source"],
-                "source_listing_id": l["source_listing_id"],
-                "ordered_image_urls": l.get("images") or [],
-                "image_mappings": mappings,
+                "image_index": idx,
+                "source_url": img_url,
+                "target_storage_key": target_key,
+                "content_type": content_type,
+                "mapping_key": f"{listing['source']}:{listing['source_listing_id']}:{idx}",
             }
         )
+    return {
+        "listing_pk": listing["listing_pk"],
+        "source": listing["source"],
+        "source_listing_id": listing["source_listing_id"],
+        "ordered_image_urls": listing.get("images") or [],
+        "image_mappings": mappings,
+    }
 
+
+def _build_report(
+    xlsx_path: str,
+    rows_scanned: Dict[str, int],
+    kinds: Iterable[Tuple[Optional[str], Optional[str]]],
+    media_rows: int,
+    image_total: int,
+    errors: List[str],
+    defaults_applied: Dict[str, int],
+) -> Dict[str, Any]:
+    """`kinds` is (source, record_type) of every exported listing."""
+    listings_total = 0
     by_source_final: Dict[str, int] = {}
     by_record_type: Dict[str, int] = {}
-    for listing in listings_sorted:
-        src = listing.get("source") or "Unknown"
+    for source, record_type in kinds:
+        listings_total += 1
+        src = source or "Unknown"
         by_source_final[src] = by_source_final.get(src, 0) + 1
-        rtype = listing.get("record_type") or "artifact"
+        rtype = record_type or "artifact"
         by_record_type[rtype] = by_record_type.get(rtype, 0) + 1
 
-    report = {
+    return {
         "generated_at": _now_iso(),
         "input_xlsx": os.path.abspath(xlsx_path),
         "rows_scanned": rows_scanned,
-        "listings_total": len(listings_sorted),
+        "listings_total": listings_total,
         "listings_by_source": by_source_final,
         "listings_by_record_type": by_record_type,
-        "media_manifest_rows": len(media_rows),
+        "media_manifest_rows": media_rows,
         "media_manifest_images_total": image_total,
         "errors_count": len(errors),
         "errors": errors[:500],
@@ -784,6 +289,52 @@ def build_exports(xlsx_path: str, b2_prefix: str) -> Dict[str, Any]:
         "defaults_applied": defaults_applied,
     }
 
+
+def _new_counters() -> Tuple[List[str], Dict[str, int], Dict[str, int]]:
+    return [], {}, {"Catalog": 0, "JBG_Full_Catalog": 0, "JBG_Detail_Enrichment": 0}
+
+
+def build_exports(
+    xlsx_path: str,
+    b2_prefix: str,
+    snapshot_dir: Optional[str] = DEFAULT_SNAPSHOT_DIR,
+    workers: int = 1,
+    stats: Optional[StageRecorder] = None,
+) -> Dict[str, Any]:
+    stats = stats or StageRecorder()
+    with stats.stage("snapshot", bytes=os.path.getsize(xlsx_path)):
+        wb = load_snapshot(xlsx_path, snapshot_dir)
+    errors, defaults_applied, rows_scanned = _new_counters()
+    with stats.stage("rows") as st:
+        source_rows = list(_iter_source_rows(wb, errors, rows_scanned))
+        st.rows = len(source_rows)
+
+    # Deduplicate by listing key (last writer wins), then sorted deterministic output
+    dedup: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+    with stats.stage("normalize", rows=len(source_rows)):
+        for listing, raw, defaults in _map_chunks(normalize_batch, source_rows, workers):
+            for k in defaults:
+                defaults_applied[k] = defaults_applied.get(k, 0) + 1
+            dedup[listing["listing_pk"]] = (listing, raw)
+        keys = sorted(dedup.keys())
+        listings_sorted = [dedup[k][0] for k in keys]
+        raw_sorted = [dedup[k][1] for k in keys]
+
+    prefix = _media_prefix(b2_prefix)
+    with stats.stage("media", rows=len(listings_sorted)):
+        media_rows = [_media_row(l, prefix) for l in listings_sorted]
+        image_total = sum(len(m["image_mappings"]) for m in media_rows)
+
+    report = _build_report(
+        xlsx_path,
+        rows_scanned,
+        ((l.get("source"), l.get("record_type")) for l in listings_sorted),
+        len(media_rows),
+        image_total,
+        errors,
+        defaults_applied,
+    )
+    report["metrics"] = stats.report()
     return {
         "listings": listings_sorted,
         "raw_rows": raw_sorted,
@@ -792,12 +343,121 @@ def build_exports(xlsx_path: str, b2_prefix: str) -> Dict[str, Any]:
     }
 
 
-def _write_jsonl(path: Path, rows: Iterable[Dict[str, Any]]) -> None:
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        for row in rows:
-            f.write(json.dumps(row, ensure_ascii=False, sort_keys=True) + "\n")
-    tmp.replace(path)
+def _json_line(row: Dict[str, Any]) -> str:
+    return json.dumps(row, ensure_ascii=False, sort_keys=True) + "\n"
+
+
+def _export_row(normalized: Normalized, prefix: str, outputs: Sequence[str]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Cache metadata + JSONL lines (for `outputs`) of one normalized source row."""
+    listing, raw, defaults = normalized
+    meta = {
+        "pk": listing["listing_pk"],
+        "source": listing.get("source"),
+        "record_type": listing.get("record_type"),
+        "defaults": defaults,
+        "images": len(listing.get("images") or []),
+    }
+    lines = {}
+    if "normalized" in outputs:
+        lines["normalized"] = _json_line(listing)
+    if "raw" in outputs:
+        lines["raw"] = _json_line(raw)
+    if "manifest" in outputs:
+        lines["manifest"] = _json_line(_media_row(listing, prefix))
+    return meta, lines
+
+
+def _export_chunk(chunk: Sequence[SourceRow], prefix: str, outputs: Sequence[str]) -> List[Tuple[Dict[str, Any], Dict[str, str]]]:
+    return [_export_row(normalized, prefix, outputs) for normalized in normalize_batch(chunk)]
+
+
+def _normalizer_signature(b2_prefix: str) -> str:
+    """Changes whenever the normalizer code or the manifest key prefix does, invalidating cached rows."""
+    h = hashlib.sha256(Path(__file__).read_bytes())
+    for module in ("glove_normalize.py", "glove_taxonomy.py", "glove_taxonomy.json"):
+        h.update(Path(__file__).with_name(module).read_bytes())
+    h.update(_media_prefix(b2_prefix).encode("utf-8"))
+    return h.hexdigest()
+
+
+def build_export_lines(
+    xlsx_path: str,
+    b2_prefix: str,
+    cache: ExportRowCache,
+    outputs: Iterable[str] = ("normalized", "raw", "manifest"),
+    snapshot_dir: Optional[str] = DEFAULT_SNAPSHOT_DIR,
+    workers: int = 1,
+    stats: Optional[StageRecorder] = None,
+) -> Dict[str, Any]:
+    """
+    build_exports() as ready-to-write JSONL lines, incrementally: a row whose
+    hash `cache` already knows reuses last run's lines, so only new or changed
+    rows are normalized (in `workers` processes, see _map_chunks). Output is
+    identical to a full, single-process build.
+    """
+    stats = stats or StageRecorder()
+    with stats.stage("snapshot", bytes=os.path.getsize(xlsx_path)):
+        wb = load_snapshot(xlsx_path, snapshot_dir)
+    errors, defaults_applied, rows_scanned = _new_counters()
+    outputs = list(outputs)
+    prefix = _media_prefix(b2_prefix)
+
+    with stats.stage("rows") as st:
+        source_rows = list(_iter_source_rows(wb, errors, rows_scanned))
+        st.rows = len(source_rows)
+    with stats.stage("hash", rows=len(source_rows)):
+        hashes = [row_hash(sheet, r, row, cat.get("raw")) for sheet, r, row, cat in source_rows]
+        pending = [i for i, h in enumerate(hashes) if cache.meta(h) is None]
+    with stats.stage("normalize", rows=len(pending)) as st:
+        fresh_rows = dict(zip(pending, _map_chunks(_export_chunk, [source_rows[i] for i in pending], workers, prefix, outputs)))
+        st.bytes = sum(len(line) for _, lines in fresh_rows.values() for line in lines.values())
+    normalized = len(pending)
+
+    rows: Dict[str, Dict[str, Any]] = {}
+    # pk -> (row hash, fresh lines or None, index into source_rows); last writer wins
+    winners: Dict[str, Tuple[str, Optional[Dict[str, str]], int]] = {}
+    lines: Dict[str, List[str]] = {name: [] for name in outputs}
+    reused = 0
+    with stats.stage("assemble") as st:
+        for i, h in enumerate(hashes):
+            meta, fresh = fresh_rows[i] if i in fresh_rows else (cache.meta(h), None)
+            rows[h] = meta
+            for k in meta["defaults"]:
+                defaults_applied[k] = defaults_applied.get(k, 0) + 1
+            winners[meta["pk"]] = (h, fresh, i)
+
+        keys = sorted(winners.keys())
+        for pk in keys:
+            h, fresh, i = winners[pk]
+            got = fresh or cache.lines(pk, h, outputs)
+            if got is None:
+                # row unchanged but its lines aren't in the previous files (lost dedup, or output not emitted)
+                got = _export_row(normalize_row(*source_rows[i]), prefix, outputs)[1]
+                normalized += 1
+            elif fresh is None:
+                reused += 1
+            for name in outputs:
+                lines[name].append(got[name])
+        st.rows = len(keys)
+
+    report = _build_report(
+        xlsx_path,
+        rows_scanned,
+        ((rows[winners[k][0]]["source"], rows[winners[k][0]]["record_type"]) for k in keys),
+        len(keys),
+        sum(rows[winners[k][0]]["images"] for k in keys),
+        errors,
+        defaults_applied,
+    )
+    return {
+        "lines": lines,
+        "report": report,
+        "rows": rows,
+        "pks": keys,
+        "winners": {pk: winners[pk][0] for pk in keys},
+        "reused": reused,
+        "normalized": normalized,
+    }
 
 
 def _file_fingerprint(path: str) -> Dict[str, Any]:
@@ -806,9 +466,29 @@ def _file_fingerprint(path: str) -> Dict[str, Any]:
         "path": os.path.abspath(path),
         "size": st.st_size,
         "mtime": int(st.st_mtime),
+        "sha256": content_hash(path),
     }
 
 
+EXPORT_BASES = {"normalized": "listings.normalized", "raw": "listings.raw", "manifest": "media_manifest"}
+
+
+def _export_complete(out: Path, shards: int, compression: str) -> bool:
+    """The previous export in `out` has this layout and all of its files."""
+    if not (out / EXPORT_INDEX_FILE).exists():
+        # the default layout (plain files, one per export) writes no index
+        if shards != 1 or compression != "none":
+            return False
+        return all((out / file_name(EXPORT_BASES[name], 0, 1, "none")).exists() for name in ("normalized", "manifest"))
+    index = safe_json((out / EXPORT_INDEX_FILE).read_text(encoding="utf-8"), {})
+    if not isinstance(index, dict) or index.get("shards") != shards or index.get("compression") != compression:
+        return False
+    outputs = index.get("outputs") or {}
+    if "normalized" not in outputs or "manifest" not in outputs:
+        return False
+    return all((out / entry["file"]).exists() for entries in outputs.values() for entry in entries)
+
+
 def run_import(
     xlsx: str,
     out_dir: str,
@@ -816,42 +496,86 @@ def run_import(
     emit_raw: bool,
     resume: bool,
     force: bool,
+    snapshot_dir: Optional[str] = DEFAULT_SNAPSHOT_DIR,
+    row_cache: bool = True,
+    shards: int = 1,
+    compression: str = "none",
+    workers: int = 1,
+    profile_dir: Optional[str] = None,
+    trace_memory: bool = False,
 ) -> int:
+    try:
+        check_compression(compression)
+    except (ValueError, RuntimeError) as e:
+        print(f"[library_import] {e}")
+        return 2
+    shards = max(1, shards)
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
 
     checkpoint_path = out / ".library_import.checkpoint.json"
-    normalized_path = out / "listings.normalized.jsonl"
-    raw_path = out / "listings.raw.jsonl"
-    media_path = out / "media_manifest.jsonl"
     report_path = out / "import_report.json"
 
-    fingerprint = _file_fingerprint(xlsx)
-    if resume and not force and checkpoint_path.exists() and normalized_path.exists() and media_path.exists() and report_path.exists():
-        old = _safe_json(checkpoint_path.read_text(encoding="utf-8"), {})
-        if isinstance(old, dict) and old.get("input_fingerprint") == fingerprint:
+    stats = StageRecorder(trace_memory=trace_memory)
+    with stats.stage("fingerprint", bytes=os.path.getsize(xlsx)):
+        fingerprint = _file_fingerprint(xlsx)
+    if resume and not force and checkpoint_path.exists() and report_path.exists() and _export_complete(out, shards, compression):
+        old = safe_json(checkpoint_path.read_text(encoding="utf-8"), {})
+        old_fp = old.get("input_fingerprint") if isinstance(old, dict) else None
+        # content, not size/mtime: a touched workbook is still unchanged, a replaced one with the same stat is not
+        if isinstance(old_fp, dict) and old_fp.get("sha256") == fingerprint["sha256"] and old.get("b2_prefix") == b2_prefix:
             print("[library_import] unchanged input fingerprint, skipping export (use --force to regenerate)")
             return 0
 
-    validation = validate_workbook(xlsx)
+    profiler = start_profiler(profile_dir, "library_import")
+    with stats.stage("validate"):
+        validation = validate_workbook(xlsx, snapshot_dir, stats)
     if not validation.ok:
+        if profiler:
+            profiler.stop()
         print("[library_import] validation failed:")
         for e in validation.errors:
             print(f"  - {e}")
         return 2
 
-    exports = build_exports(xlsx, b2_prefix=b2_prefix)
-    _write_jsonl(normalized_path, exports["listings"])
-    if emit_raw:
-        _write_jsonl(raw_path, exports["raw_rows"])
-    _write_jsonl(media_path, exports["media_manifest"])
+    names = ["normalized"] + (["raw"] if emit_raw else []) + ["manifest"]
+    cache = ExportRowCache(out_dir, _normalizer_signature(b2_prefix))
+    if row_cache:
+        with stats.stage("cache_load"):
+            cache.load(names)
+    with stats.stage("build"):
+        exports = build_export_lines(xlsx, b2_prefix, cache, outputs=names, snapshot_dir=snapshot_dir, workers=workers, stats=stats)
+    pks = exports["pks"]
+    with stats.stage("write", rows=len(pks)) as st:
+        files = {name: write_export(out, EXPORT_BASES[name], pks, exports["lines"][name], shards, compression) for name in names}
+        index_path: Optional[Path] = None
+        if shards > 1 or compression != "none":
+            index_path = write_index(out, files, shards, compression)
+        else:
+            # an index left by an earlier --shards/--compress run would describe files that are gone
+            (out / EXPORT_INDEX_FILE).unlink(missing_ok=True)
+        st.bytes = sum(e["bytes"] for entries in files.values() for e in entries)
+    # line order across the files of one export: by shard, then listing_pk
+    file_order = pks if shards == 1 else sorted(pks, key=lambda pk: shard_of(pk, shards))
+    with stats.stage("cache_save"):
+        cache.save(exports["rows"], exports["winners"], file_order, {name: [out / e["file"] for e in entries] for name, entries in files.items()})
+
+    def _paths(name: str) -> Any:
+        if name not in files:
+            return None
+        paths = [str(out / e["file"]) for e in files[name]]
+        return paths[0] if len(paths) == 1 else paths
 
     report_payload = exports["report"]
     report_payload["output_files"] = {
-        "normalized": str(normalized_path),
-        "raw": str(raw_path) if emit_raw else None,
-        "manifest": str(media_path),
+        "normalized": _paths("normalized"),
+        "raw": _paths("raw"),
+        "manifest": _paths("manifest"),
+        "index": str(index_path) if index_path else None,
     }
+    report_payload["metrics"] = stats.report()
+    if profiler:
+        report_payload["profile"] = profiler.finish()
     report_path.write_text(json.dumps(report_payload, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
 
     checkpoint_path.write_text(
@@ -859,9 +583,10 @@ def run_import(
             {
                 "generated_at": _now_iso(),
                 "input_fingerprint": fingerprint,
+                "b2_prefix": b2_prefix,
                 "counts": {
-                    "listings": len(exports["listings"]),
-                    "media_rows": len(exports["media_manifest"]),
+                    "listings": len(pks),
+                    "media_rows": len(pks),
                 },
             },
             indent=2,
@@ -872,11 +597,19 @@ def run_import(
         encoding="utf-8",
     )
 
-    print(f"[library_import] wrote {normalized_path}")
-    if emit_raw:
-        print(f"[library_import] wrote {raw_path}")
-    print(f"[library_import] wrote {media_path}")
+    print(f"[library_import] {exports['reused']} listings unchanged, {exports['normalized']} rows normalized")
+    for name in names:
+        if len(files[name]) == 1:
+            print(f"[library_import] wrote {out / files[name][0]['file']}")
+        else:
+            print(f"[library_import] wrote {len(files[name])} shards of {EXPORT_BASES[name]} ({files[name][0]['file']} ...)")
+    if index_path:
+        print(f"[library_import] wrote {index_path}")
     print(f"[library_import] wrote {report_path}")
+    top = [st for st in report_payload["metrics"]["stages"] if "." not in st["name"]]
+    print("[library_import] stages: " + " ".join(f"{st['name']}={st['wall_s']:.2f}s" for st in top) + f" peak_rss={report_payload['metrics']['peak_rss_mb']}MB")
+    if profiler:
+        print(f"[library_import] wrote profile {report_payload['profile']['pstats']}")
     return 0
 
 
@@ -888,6 +621,13 @@ def main() -> None:
     p.add_argument("--no-raw", action="store_true", help="Disable listings.raw.jsonl output")
     p.add_argument("--no-resume", action="store_true", help="Always regenerate outputs")
     p.add_argument("--force", action="store_true", help="Force regeneration even if fingerprint unchanged")
+    p.add_argument("--compress", choices=COMPRESSIONS, default="none", help="Compress export files (zstd needs the zstandard package)")
+    p.add_argument("--shards", type=int, default=1, help="Split each export into N files by listing_pk hash range (see export_index.json)")
+    p.add_argument("--workers", type=int, default=1, help="Normalize rows in N worker processes (output is identical to 1)")
+    p.add_argument("--no-row-cache", action="store_true", help="Re-normalize every row instead of reusing unchanged rows from the previous export")
+    p.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR, help="Parsed-workbook cache shared with validate/QA tools (keyed by workbook sha256)")
+    p.add_argument("--no-snapshot-cache", action="store_true", help="Parse the workbook without reading or writing the snapshot cache")
+    add_profile_args(p)
     args = p.parse_args()
 
     code = run_import(
@@ -897,6 +637,13 @@ def main() -> None:
         emit_raw=not args.no_raw,
         resume=not args.no_resume,
         force=args.force,
+        snapshot_dir=None if args.no_snapshot_cache else args.snapshot_dir,
+        row_cache=not args.no_row_cache,
+        shards=args.shards,
+        compression=args.compress,
+        workers=args.workers,
+        profile_dir=args.profile or None,
+        trace_memory=args.trace_memory,
     )
     raise SystemExit(code)
 
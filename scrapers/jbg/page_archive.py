@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Compressed raw-HTML archive for scraper fetches.
+
+Every fetched page is stored once by content (sha256 of the body, gzip on disk)
+and indexed by (url, fetched_at) in a small SQLite file, so parser fixes can be
+replayed over past crawls with `--reparse-from-archive` instead of re-fetching.
+
+Layout:
+    <archive_dir>/index.sqlite
+    <archive_dir>/objects/ab/ab12...ef.html.gz
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".page_archive")
+
+
+@dataclass
+class ArchivedPage:
+    url: str
+    kind: str
+    source_key: Optional[str]
+    fetched_at: str
+    sha256: str
+    html: str
+
+
+def _now_iso() -> str:
+    return dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+
+class PageArchive:
+    def __init__(self, archive_dir: str = DEFAULT_ARCHIVE_DIR):
+        self.root = archive_dir
+        self.objects = os.path.join(archive_dir, "objects")
+        os.makedirs(self.objects, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(archive_dir, "index.sqlite"), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                source_key TEXT,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (url, fetched_at)
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_pages_kind_url ON pages(kind, url, fetched_at)")
+
+    def _object_path(self, sha: str) -> str:
+        return os.path.join(self.objects, sha[:2], f"{sha}.html.gz")
+
+    def put(self, url: str, body: Union[str, bytes], kind: str, source_key: Optional[str] = None, fetched_at: Optional[str] = None) -> str:
+        """Archive one fetched page; identical bodies share a single object file."""
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        sha = hashlib.sha256(data).hexdigest()
+        path = self._object_path(sha)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp, "wb", compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp, path)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (url, fetched_at, kind, source_key, sha256, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, fetched_at or _now_iso(), kind, source_key, sha, len(data)),
+            )
+        return sha
+
+    def _load(self, sha: str) -> str:
+        with gzip.open(self._object_path(sha), "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+
+    def latest(self, url: str, kind: Optional[str] = None) -> Optional[ArchivedPage]:
+        """Most recent archived fetch of `url` (optionally restricted to one page kind)."""
+        sql = "SELECT url, kind, source_key, fetched_at, sha256 FROM pages WHERE url = ?"
+        params = [url]
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY fetched_at DESC LIMIT 1"
+        with self._lock:
+            row = self._db.execute(sql, params).fetchone()
+        if not row:
+            return None
+        return ArchivedPage(url=row[0], kind=row[1], source_key=row[2], fetched_at=row[3], sha256=row[4], html=self._load(row[4]))
+
+    def iter_latest(self, kind: str) -> Iterator[ArchivedPage]:
+        """Latest archived fetch per URL for one page kind, ordered by URL."""
+        with self._lock:
+            rows = self._db.execute(
+                """
+                SELECT url, kind, source_key, MAX(fetched_at), sha256
+                FROM pages WHERE kind = ?
+                GROUP BY url ORDER BY url
+                """,
+                (kind,),
+            ).fetchall()
+        for url, k, key, fetched_at, sha in rows:
+            yield ArchivedPage(url=url, kind=k, source_key=key, fetched_at=fetched_at, sha256=sha, html=self._load(sha))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 from library_import import build_exports
+from workbook_snapshot import DEFAULT_SNAPSHOT_DIR
 
 
 DEFAULT_FIXTURE = Path(__file__).resolve().parent / "fixtures" / "golden_listings_10.jsonl"
@@ -63,10 +64,13 @@ def main() -> None:
     p.add_argument("--xlsx", required=True)
     p.add_argument("--fixture", default=str(DEFAULT_FIXTURE))
     p.add_argument("--update-fixture", action="store_true")
+    p.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR, help="Parsed-workbook cache shared with library_import (keyed by workbook sha256)")
+    p.add_argument("--no-snapshot-cache", action="store_true", help="Parse the workbook without reading or writing the snapshot cache")
     args = p.parse_args()
+    snapshot_dir = None if args.no_snapshot_cache else args.snapshot_dir
 
     fixture_path = Path(args.fixture)
-    exports = build_exports(args.xlsx, b2_prefix="gloveiq")
+    exports = build_exports(args.xlsx, b2_prefix="gloveiq", snapshot_dir=snapshot_dir)
     current = canonicalize(exports["listings"], n=10)
 
     if args.update_fixture:
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Staleness-aware ordering of detail refreshes under a fixed per-run budget.
+
+Each catalog product gets a score for "how likely is its detail row out of date":
+- never scraped, or last scrape failed      -> always first
+- catalog title/price moved since the last detail scrape, or the sitemap
+  <lastmod> is newer than detail_scraped_at -> next (the site told us it changed)
+- otherwise the probability it changed since detail_scraped_at, from the
+  product's own change rate: P = 1 - exp(-rate * age_days), where
+  rate = (changes + PRIOR_CHANGES) / (observed_days + PRIOR_DAYS)
+  so a product with no history is assumed to change about once a month and a
+  product whose price moved on every past refresh climbs ahead of stable ones.
+
+The change history lives in the crawl state store (CrawlCursorStore.detail_history):
+after every successful scrape the caller records a fingerprint of the parsed
+detail plus the catalog title/price it was scraped against.
+
+Usage:
+    history = runtime.cursors.detail_history("JBG")
+    for t in schedule_refresh(candidates, history, budget=500):
+        print(t.product_id, t.reason, round(t.score, 3))
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from sitemaps import parse_lastmod
+
+
+PRIOR_CHANGES = 1.0
+PRIOR_DAYS = 30.0
+DEFAULT_MIN_AGE_DAYS = 1.0
+
+# lower tier runs first; score orders products inside a tier
+_TIER = {"new": 0, "failed": 0, "catalog_changed": 1, "lastmod": 1, "stale": 2}
+
+
+@dataclass
+class DetailCandidate:
+    product_id: str
+    url: str
+    detail_status: Optional[str] = None
+    detail_scraped_at: Optional[str] = None
+    catalog_title: Optional[str] = None
+    catalog_price: Optional[float] = None
+    lastmod: Optional[str] = None
+
+
+@dataclass
+class ScheduledTarget:
+    product_id: str
+    url: str
+    reason: str
+    score: float
+    age_days: Optional[float]
+
+
+def detail_fingerprint(data: Dict[str, Any]) -> str:
+    """Hash of the parsed detail fields that end up in the sheet."""
+    payload = {
+        "title": data.get("title_detail"),
+        "price": data.get("price_detail"),
+        "model_code": data.get("model_code"),
+        "glove_profile": data.get("glove_profile") or {},
+        "description": data.get("description_snippet"),
+        "images": data.get("images") or [],
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _float(v: Any) -> Optional[float]:
+    if v in (None, ""):
+        return None
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def catalog_signature(title: Optional[str], price: Any) -> str:
+    p = _float(price)
+    return f"{str(title or '').strip()}|{'' if p is None else f'{p:.2f}'}"
+
+
+def _days_between(earlier: Optional[str], now: dt.datetime) -> Optional[float]:
+    ts = parse_lastmod(earlier)
+    return None if ts is None else max(0.0, (now - ts).total_seconds() / 86400.0)
+
+
+def change_rate(hist: Optional[Dict[str, Any]], now: dt.datetime) -> float:
+    """Smoothed changes per day for one product."""
+    if not hist:
+        return PRIOR_CHANGES / PRIOR_DAYS
+    observed = _days_between(hist.get("first_seen_at"), now) or 0.0
+    return (float(hist.get("changes") or 0) + PRIOR_CHANGES) / (observed + PRIOR_DAYS)
+
+
+def _catalog_changed(c: DetailCandidate, hist: Optional[Dict[str, Any]]) -> bool:
+    # Only comparable against what the catalog said when we scraped the detail;
+    # catalog vs detail price differ legitimately (card promo text, sale prices).
+    if not hist or not hist.get("catalog_signature"):
+        return False
+    return hist["catalog_signature"] != catalog_signature(c.catalog_title, c.catalog_price)
+
+
+def score_candidate(
+    c: DetailCandidate,
+    hist: Optional[Dict[str, Any]],
+    now: dt.datetime,
+) -> ScheduledTarget:
+    status = str(c.detail_status or "").upper()
+    age = _days_between(c.detail_scraped_at, now)
+    if not status:
+        return ScheduledTarget(c.product_id, c.url, "new", 1.0, age)
+    if not status.startswith("OK") or age is None:
+        return ScheduledTarget(c.product_id, c.url, "failed", 1.0, age)
+    if _catalog_changed(c, hist):
+        return ScheduledTarget(c.product_id, c.url, "catalog_changed", 1.0, age)
+    changed = parse_lastmod(c.lastmod)
+    scraped = parse_lastmod(c.detail_scraped_at)
+    if changed is not None and scraped is not None and changed > scraped:
+        return ScheduledTarget(c.product_id, c.url, "lastmod", 1.0, age)
+    return ScheduledTarget(c.product_id, c.url, "stale", 1.0 - math.exp(-change_rate(hist, now) * age), age)
+
+
+def schedule_refresh(
+    candidates: Iterable[DetailCandidate],
+    history: Dict[str, Dict[str, Any]],
+    budget: int,
+    min_age_days: float = DEFAULT_MIN_AGE_DAYS,
+    now: Optional[dt.datetime] = None,
+) -> List[ScheduledTarget]:
+    """
+    Highest-priority `budget` targets (all of them if budget <= 0). Products with
+    no change signal that were scraped less than `min_age_days` ago are left out.
+    Ties keep catalog order.
+    """
+    now = now or dt.datetime.now(dt.timezone.utc)
+    scored = []
+    for n, c in enumerate(candidates):
+        t = score_candidate(c, history.get(c.product_id), now)
+        if t.reason == "stale" and (t.age_days or 0.0) < min_age_days:
+            continue
+        scored.append((_TIER[t.reason], -t.score, n, t))
+    scored.sort(key=lambda s: s[:3])
+    out = [t for _, _, _, t in scored]
+    return out[:budget] if budget > 0 else out
+
+
+def reason_counts(targets: Iterable[ScheduledTarget]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for t in targets:
+        counts[t.reason] = counts.get(t.reason, 0) + 1
+    return counts
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Shared request controller for the scrapers: per-host rate limit, adaptive
+concurrency and retry with backoff.
+
+- HostRateLimiter: token bucket per host (the `--delay` politeness budget).
+- RequestController: AIMD window of in-flight requests per host. The window
+  grows by ~1 per window's worth of healthy responses and is halved on 429/5xx
+  (or a latency spike); a `Retry-After` header pauses the whole host. Callers
+  get the highest concurrency the site tolerates up to their `--concurrency` cap.
+- RetryQueue: failed URLs wait here with jittered exponential backoff and are
+  retried after the main pass instead of being dropped.
+
+Usage:
+    controller = RequestController(HostRateLimiter.from_delay(1.5), max_concurrency=8)
+    resp = controller.get(sess, url)      # one attempt, raises TransientHTTPError on 429/5xx
+    resp = controller.fetch(sess, url)    # retries inline (serial callers)
+"""
+
+from __future__ import annotations
+
+import email.utils
+import heapq
+import itertools
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+
+TRANSIENT_STATUS = frozenset((429, 500, 502, 503, 504))
+DEFAULT_MAX_ATTEMPTS = 4
+
+
+class TransientHTTPError(requests.HTTPError):
+    """429/5xx response worth retrying later; `retry_after` is in seconds when the server sent one."""
+
+    def __init__(self, message: str, response: Optional[requests.Response] = None, retry_after: Optional[float] = None):
+        super().__init__(message, response=response)
+        self.retry_after = retry_after
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP-date form)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def is_transient(exc: BaseException) -> bool:
+    return isinstance(exc, (TransientHTTPError, requests.ConnectionError, requests.Timeout))
+
+
+class HostRateLimiter:
+    """
+    Token bucket per host.
+
+    Each host refills at `rate` tokens/sec up to `burst`. acquire() blocks until
+    a token is free, so any number of worker threads share one politeness budget
+    (requests/sec) instead of each sleeping a fixed delay after its request.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # host -> (tokens, last_refill)
+
+    @classmethod
+    def from_delay(cls, delay: float) -> "HostRateLimiter":
+        # --delay N used to mean "one request every N seconds"; keep that budget.
+        return cls(rate=(1.0 / delay) if delay > 0 else 0.0)
+
+    def acquire(self, url: str) -> None:
+        if self.rate <= 0:
+            return
+        host = _host(url)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (float(self.burst), now))
+                tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+                if tokens >= 1.0:
+                    self._buckets[host] = (tokens - 1.0, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1.0 - tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class _HostState:
+    window: float
+    in_flight: int = 0
+    paused_until: float = 0.0
+    latency_ewma: Optional[float] = None
+    latency_floor: Optional[float] = None
+    last_decrease: float = 0.0
+
+
+class RequestController:
+    """
+    AIMD concurrency + backoff per host. Thread-safe; share one per run.
+
+    The window starts at `initial_concurrency` and never leaves
+    [min_concurrency, max_concurrency]. A response counts as healthy when its
+    latency EWMA stays under `latency_factor` x the best EWMA seen for the host.
+    """
+
+    def __init__(
+        self,
+        limiter: Optional[HostRateLimiter] = None,
+        max_concurrency: int = 1,
+        min_concurrency: int = 1,
+        initial_concurrency: Optional[int] = None,
+        latency_factor: float = 2.0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        self.limiter = limiter or HostRateLimiter(rate=0.0)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.initial_concurrency = initial_concurrency or self.min_concurrency
+        self.latency_factor = latency_factor
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._cond = threading.Condition()
+        self._hosts: Dict[str, _HostState] = {}
+        self._failures: Dict[str, Tuple[int, Optional[BaseException]]] = {}  # url -> (attempts, last error)
+        self.stats = {"requests": 0, "throttled": 0, "server_errors": 0, "network_errors": 0, "retries": 0, "gave_up": 0}
+
+    # ---- window bookkeeping ----
+
+    def _state(self, host: str) -> _HostState:
+        st = self._hosts.get(host)
+        if st is None:
+            st = self._hosts[host] = _HostState(window=float(min(self.initial_concurrency, self.max_concurrency)))
+        return st
+
+    def _acquire_slot(self, host: str) -> None:
+        with self._cond:
+            while True:
+                st = self._state(host)
+                wait = st.paused_until - time.monotonic()
+                if wait <= 0 and st.in_flight < int(st.window):
+                    st.in_flight += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def _release_slot(self, host: str) -> None:
+        with self._cond:
+            self._state(host).in_flight -= 1
+            self._cond.notify_all()
+
+    def _on_success(self, host: str, latency: float) -> None:
+        with self._cond:
+            st = self._state(host)
+            st.latency_ewma = latency if st.latency_ewma is None else 0.8 * st.latency_ewma + 0.2 * latency
+            st.latency_floor = st.latency_ewma if st.latency_floor is None else min(st.latency_floor, st.latency_ewma)
+            if st.latency_ewma > self.latency_factor * st.latency_floor:
+                # server is slowing down: ease off before it starts refusing
+                self._decrease(st, 0.75)
+            else:
+                st.window = min(float(self.max_concurrency), st.window + 1.0 / st.window)
+            self._cond.notify_all()
+
+    def _decrease(self, st: _HostState, factor: float) -> None:
+        now = time.monotonic()
+        # at most one decrease per round trip, so a burst of failures from one window halves once
+        if now - st.last_decrease < (st.latency_ewma or 1.0):
+            return
+        st.window = max(float(self.min_concurrency), st.window * factor)
+        st.last_decrease = now
+
+    def _on_backoff(self, host: str, pause: float) -> None:
+        with self._cond:
+            st = self._state(host)
+            self._decrease(st, 0.5)
+            st.paused_until = max(st.paused_until, time.monotonic() + pause)
+            self._cond.notify_all()
+
+    def window(self, url: str) -> int:
+        with self._cond:
+            return int(self._state(_host(url)).window)
+
+    # ---- requests ----
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff; never shorter than the server's Retry-After."""
+        delay = random.uniform(0.0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max * 5))
+        return delay
+
+    def get(self, sess: requests.Session, url: str, timeout: float = 30, **kwargs: Any) -> requests.Response:
+        """
+        One GET under the host's window and rate budget.
+        Raises TransientHTTPError on 429/5xx, requests errors on network failures,
+        and HTTPError on other 4xx.
+        """
+        host = _host(url)
+        self._acquire_slot(host)
+        try:
+            self.limiter.acquire(url)
+            started = time.monotonic()
+            with self._cond:
+                self.stats["requests"] += 1
+            try:
+                resp = sess.get(url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                with self._cond:
+                    self.stats["network_errors"] += 1
+                self._record_failure(url, e)
+                self._on_backoff(host, self.backoff_delay(0))
+                raise
+            except requests.RequestException as e:
+                # e.g. ChunkedEncodingError: not retried, but it replaces any earlier 5xx as the URL's last error
+                self._record_failure(url, e)
+                raise
+            latency = time.monotonic() - started
+        finally:
+            self._release_slot(host)
+
+        if resp.status_code in TRANSIENT_STATUS:
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            with self._cond:
+                self.stats["throttled" if resp.status_code == 429 else "server_errors"] += 1
+            err = TransientHTTPError(f"{resp.status_code} {resp.reason} for url: {url}", response=resp, retry_after=retry_after)
+            self._record_failure(url, err)
+            self._on_backoff(host, retry_after if retry_after is not None else self.backoff_delay(0))
+            raise err
+        try:
+            resp.raise_for_status()
+        except requests.HTTPError as e:
+            # a 404 after an earlier 503 must not be retried as if it were still the 503
+            self._record_failure(url, e)
+            raise
+        with self._cond:
+            self._failures.pop(url, None)
+        self._on_success(host, latency)
+        return resp
+
+    def fetch(self, sess: requests.Session, url: str, timeout: float = 30, **kwargs: Any) -> requests.Response:
+        """get() with inline retries for transient failures (for serial callers)."""
+        while True:
+            try:
+                return self.get(sess, url, timeout=timeout, **kwargs)
+            except requests.RequestException:
+                delay = self.retry_delay(url)
+                if delay is None:
+                    raise
+                print(f"[RETRY] {url} in {delay:.1f}s ({self._failures[url][1]})")
+                time.sleep(delay)
+
+    def _record_failure(self, url: str, exc: BaseException) -> None:
+        with self._cond:
+            attempts = self._failures.get(url, (0, None))[0] + 1
+            self._failures[url] = (attempts, exc)
+
+    def retry_delay(self, url: str) -> Optional[float]:
+        """
+        Seconds to wait before retrying `url` after a failed get(), or None if the
+        last failure is not retryable or the URL is out of attempts.
+        """
+        with self._cond:
+            attempts, exc = self._failures.get(url, (0, None))
+            if exc is None or not is_transient(exc):
+                self._failures.pop(url, None)
+                return None
+            if attempts >= self.max_attempts:
+                # forget the URL so a later, separate fetch of it starts with a fresh budget
+                del self._failures[url]
+                self.stats["gave_up"] += 1
+                return None
+            self.stats["retries"] += 1
+        return self.backoff_delay(attempts, getattr(exc, "retry_after", None))
+
+    def summary(self) -> str:
+        s = self.stats
+        with self._cond:
+            windows = ",".join(f"{h}={int(st.window)}" for h, st in sorted(self._hosts.items()))
+        return (
+            f"requests={s['requests']} throttled(429)={s['throttled']} server_errors={s['server_errors']} "
+            f"network_errors={s['network_errors']} retries={s['retries']} gave_up={s['gave_up']} window=[{windows}]"
+        )
+
+
+class RetryQueue:
+    """Items waiting for a retry, ordered by the time they become ready."""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: Any, delay: float) -> None:
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), item))
+
+    def pop_ready(self) -> List[Any]:
+        """Block until the earliest item is due, then return every item due by now (in push order)."""
+        if not self._heap:
+            return []
+        wait = self._heap[0][0] - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        now = time.monotonic()
+        ready = []
+        while self._heap and self._heap[0][0] <= now:
+            ready.append(heapq.heappop(self._heap))
+        return [item for _, _, item in sorted(ready, key=lambda r: r[1])]
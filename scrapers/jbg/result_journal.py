@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Append-only JSONL write-ahead journal for scraper results.
+
+Every parsed result is appended here before it is applied to the workbook, so a
+crash between workbook saves loses nothing: the next run replays the journal
+into the workbook first. Lines are flushed to the OS on every append (a killed
+process loses nothing) and fsync'd at most every `fsync_interval` seconds
+(power loss loses at most that window).
+
+The journal is a sequence of segment files: the active one (`<path>`) and
+rotated ones (`<path>.<seq>`) that a checkpoint is folding into the workbook.
+A segment is deleted only after the workbook holding its records was saved.
+
+Usage:
+    journal = ResultJournal("master.xlsx.journal.jsonl")
+    for rec in journal.replay():
+        apply(rec)
+    journal.append({"pid": "123", ...})
+    seg = journal.rotate(); save_workbook(); journal.discard(seg)
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class ResultJournal:
+    def __init__(self, path: str, fsync_interval: float = 1.0):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._fh = None
+        self._last_sync = 0.0
+        self._dirty = False
+
+    def _segments(self) -> List[str]:
+        rotated = []
+        for p in glob.glob(glob.escape(self.path) + ".*"):
+            suffix = p[len(self.path) + 1:]
+            if suffix.isdigit():
+                rotated.append((int(suffix), p))
+        return [p for _, p in sorted(rotated)] + ([self.path] if os.path.exists(self.path) else [])
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Records from every segment, oldest first. A torn last line (crash mid-write) is skipped."""
+        for seg in self._segments():
+            with open(seg, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(rec, dict):
+                        yield rec
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write(line)
+            self._fh.flush()
+            self._dirty = True
+            now = time.monotonic()
+            if now - self._last_sync >= self.fsync_interval:
+                os.fsync(self._fh.fileno())
+                self._last_sync = now
+                self._dirty = False
+
+    def _close_active(self) -> None:
+        if self._fh is not None:
+            if self._dirty:
+                os.fsync(self._fh.fileno())
+                self._dirty = False
+            self._fh.close()
+            self._fh = None
+
+    def rotate(self) -> Optional[str]:
+        """Seal the active segment (renamed to <path>.<seq>) and return it; None if there is nothing to seal."""
+        with self._lock:
+            self._close_active()
+            if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                return None
+            sealed = f"{self.path}.{time.time_ns()}"
+            os.replace(self.path, sealed)
+            return sealed
+
+    def discard(self, segment: Optional[str]) -> None:
+        if segment and os.path.exists(segment):
+            os.remove(segment)
+
+    def clear(self) -> None:
+        """Drop every segment (after the workbook holding all replayed records was saved)."""
+        with self._lock:
+            self._close_active()
+            for seg in self._segments():
+                os.remove(seg)
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_active()
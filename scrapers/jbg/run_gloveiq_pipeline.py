@@ -10,6 +10,9 @@ Runs selectable steps:
 5) Optional Backblaze ingest for discovered images
 
 You can run steps individually by flags.
+
+With --staging-db the scrapers and the B2 ingest write to a SQLite staging store
+(staging_store.py) and the XLSX is exported from it once, before validation.
 """
 import argparse
 import os
@@ -48,8 +51,11 @@ def main():
     p.add_argument("--skip-regression", action="store_true", help="Skip regression fixture check")
     p.add_argument("--no-resume-export", action="store_true", help="Disable fingerprint resume in library import")
     p.add_argument("--force-export", action="store_true", help="Force regeneration of export artifacts")
+    p.add_argument("--export-workers", type=int, default=1, help="Worker processes for library import normalization")
     p.add_argument("--resume", action="store_true")
     p.add_argument("--catalog-only", action="store_true")
+    p.add_argument("--staging-db", default="", help="Scrape into this SQLite staging store; the XLSX is exported from it before validation")
+    p.add_argument("--profile", default="", help="Profile the scrape, export and B2 steps into this folder (cProfile + collapsed stacks per step)")
     args = p.parse_args()
     args.xlsx = os.path.abspath(args.xlsx)
     args.out_dir = os.path.abspath(args.out_dir)
@@ -57,6 +63,8 @@ def main():
     if args.library_only:
         args.ss = False
         args.jbg = False
+    staging = ["--staging-db", os.path.abspath(args.staging_db)] if args.staging_db else []
+    profile = ["--profile", os.path.abspath(args.profile)] if args.profile else []
 
     # Default: run full pipeline except B2 unless explicitly requested.
     if not (args.ss or args.jbg or args.b2 or args.library_only):
@@ -64,33 +72,38 @@ def main():
 
     if args.ss:
         if args.catalog_only:
-            run([sys.executable, "ss_master_scraper.py", "--xlsx", args.xlsx, "--max-pages", str(args.ss_pages), "--max-details", "0", "--delay", str(args.delay)])
+            run([sys.executable, "ss_master_scraper.py", "--xlsx", args.xlsx, "--max-pages", str(args.ss_pages), "--max-details", "0", "--delay", str(args.delay)] + staging + profile)
         else:
             # catalog+details in one go
-            cmd = [sys.executable, "ss_master_scraper.py", "--xlsx", args.xlsx, "--max-pages", str(args.ss_pages), "--max-details", str(args.details), "--delay", str(args.delay)]
+            cmd = [sys.executable, "ss_master_scraper.py", "--xlsx", args.xlsx, "--max-pages", str(args.ss_pages), "--max-details", str(args.details), "--delay", str(args.delay)] + staging + profile
             if args.resume:
                 cmd.append("--resume")
             run(cmd)
 
     if args.jbg:
         if args.catalog_only:
-            run([sys.executable, "jbg_master_scraper.py", "--xlsx", args.xlsx, "--max-pages", str(args.jbg_pages), "--max-details", "0", "--delay", str(args.delay)])
+            run([sys.executable, "jbg_master_scraper.py", "--xlsx", args.xlsx, "--max-pages", str(args.jbg_pages), "--max-details", "0", "--delay", str(args.delay)] + staging + profile)
         else:
-            cmd = [sys.executable, "jbg_master_scraper.py", "--xlsx", args.xlsx, "--max-pages", str(args.jbg_pages), "--max-details", str(args.details), "--delay", str(args.delay)]
+            cmd = [sys.executable, "jbg_master_scraper.py", "--xlsx", args.xlsx, "--max-pages", str(args.jbg_pages), "--max-details", str(args.details), "--delay", str(args.delay)] + staging + profile
             if args.resume:
                 cmd.append("--resume")
             run(cmd)
 
+    if args.staging_db and (args.ss or args.jbg):
+        run([sys.executable, "staging_store.py", "--db", os.path.abspath(args.staging_db), "export", "--xlsx", args.xlsx])
+
     if not args.skip_validate:
         validate_cmd = [sys.executable, "validate_library_xlsx.py", "--xlsx", args.xlsx]
         run(validate_cmd)
 
     if not args.skip_export:
-        export_cmd = [sys.executable, "library_import.py", "--xlsx", args.xlsx, "--out-dir", args.out_dir]
+        export_cmd = [sys.executable, "library_import.py", "--xlsx", args.xlsx, "--out-dir", args.out_dir] + profile
         if args.no_resume_export:
             export_cmd.append("--no-resume")
         if args.force_export:
             export_cmd.append("--force")
+        if args.export_workers > 1:
+            export_cmd += ["--workers", str(args.export_workers)]
         run(export_cmd)
 
     if not args.skip_regression:
@@ -100,8 +113,10 @@ def main():
     if args.b2:
         if has_b2_env():
             # resume is safe here too
-            cmd = [sys.executable, "b2_ingest_images.py", "--xlsx", args.xlsx, "--resume", "--delay", "0.5"]
+            cmd = [sys.executable, "b2_ingest_images.py", "--xlsx", args.xlsx, "--resume", "--delay", "0.5"] + staging + profile
             run(cmd)
+            if args.staging_db:
+                run([sys.executable, "staging_store.py", "--db", os.path.abspath(args.staging_db), "export", "--xlsx", args.xlsx])
         else:
             print("[pipeline] B2 env not configured; skipping b2_ingest_images.py (set B2_KEY_ID, B2_APP_KEY, B2_BUCKET).")
 
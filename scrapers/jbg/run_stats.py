@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing, throughput and memory for one run, plus optional profiling.
+
+`StageRecorder` times named stages (nested stages get dotted names,
+"build.normalize") and `report()` returns a JSON-ready dict that the tools put
+into their run report (library_import: import_report.json "metrics"; the
+scrapers and b2_ingest_images: their run report file):
+
+- wall and CPU seconds per stage (CPU of this process's threads, plus worker
+  processes that finished inside the stage as `cpu_children_s`)
+- rows/sec and bytes/sec when the stage sets `rows` / `bytes`
+- peak RSS of the process (and of its reaped children) as of the end of each
+  stage; the stage where it jumps is the one that allocated
+- with trace_memory=True, the Python-heap peak per stage and the top allocating
+  source lines from tracemalloc (this slows the run down noticeably, so it is
+  opt-in: --trace-memory)
+
+`Profiler` (--profile DIR) runs cProfile over the run and writes
+`<name>.pstats` (load with `python -m pstats`, snakeviz, ...) and
+`<name>.collapsed`: main-thread stacks sampled every few ms of CPU time, one
+"frame;frame;... count" line per stack, the input format of flamegraph.pl /
+speedscope / inferno. Worker threads and processes are not sampled. Sampling
+needs SIGPROF (Unix); elsewhere only the .pstats file is written.
+
+Usage:
+    stats = StageRecorder(trace_memory=args.trace_memory)
+    with stats.stage("normalize") as st:
+        rows = normalize(...)
+        st.rows = len(rows)
+    report["metrics"] = stats.report()
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # not on Windows: no peak RSS
+    resource = None
+
+
+TOP_ALLOCATORS = 10
+TOP_FUNCTIONS = 25
+SAMPLE_INTERVAL = 0.005
+
+
+def add_profile_args(ap: argparse.ArgumentParser) -> None:
+    """--profile / --trace-memory, shared by every tool that writes a run report."""
+    ap.add_argument("--profile", default="", metavar="DIR", help="Write cProfile stats (.pstats) and sampled collapsed stacks (.collapsed, for flamegraphs) to DIR")
+    ap.add_argument("--trace-memory", action="store_true", help="Record the Python-heap peak per stage and the top allocating lines (tracemalloc; slows the run)")
+
+
+def peak_rss_mb(who: int = 0) -> Optional[float]:
+    """High-water resident set size of this process (who=0) or its reaped children (who=1)."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if who else resource.RUSAGE_SELF)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / scale, 1)
+
+
+def _children_cpu() -> float:
+    t = os.times()
+    return t.children_user + t.children_system
+
+
+def _rate(n: Optional[int], seconds: float) -> Optional[float]:
+    if n is None or seconds <= 0:
+        return None
+    return round(n / seconds, 1)
+
+
+@dataclass
+class Stage:
+    name: str
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    cpu_children_s: float = 0.0
+    rss_peak_mb: Optional[float] = None
+    py_peak_bytes: int = 0
+
+    def as_dict(self, traced: bool) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "name": self.name,
+            "wall_s": round(self.wall_s, 4),
+            "cpu_s": round(self.cpu_s, 4),
+            "rss_peak_mb": self.rss_peak_mb,
+        }
+        if self.cpu_children_s:
+            out["cpu_children_s"] = round(self.cpu_children_s, 4)
+        if self.rows is not None:
+            out["rows"] = self.rows
+            out["rows_per_s"] = _rate(self.rows, self.wall_s)
+        if self.bytes is not None:
+            out["bytes"] = self.bytes
+            out["bytes_per_s"] = _rate(self.bytes, self.wall_s)
+        if traced:
+            out["py_peak_mb"] = round(self.py_peak_bytes / (1024 * 1024), 2)
+        return out
+
+
+class StageRecorder:
+    """Wall/CPU time, throughput and memory per named stage of one run."""
+
+    def __init__(self, trace_memory: bool = False, top: int = TOP_ALLOCATORS):
+        self.trace_memory = trace_memory
+        self.top = top
+        self.stages: List[Stage] = []
+        self._open: List[Stage] = []
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._children0 = _children_cpu()
+        self._started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def _fold_py_peak(self) -> None:
+        """Credit the heap peak since the last fold to every open stage, then start a new window."""
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for st in self._open:
+            st.py_peak_bytes = max(st.py_peak_bytes, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None, bytes: Optional[int] = None) -> Iterator[Stage]:
+        """Time the block; set `.rows` / `.bytes` on the yielded Stage to get throughput."""
+        self._fold_py_peak()
+        st = Stage(".".join([s.name for s in self._open[-1:]] + [name]), rows=rows, bytes=bytes)
+        self.stages.append(st)
+        self._open.append(st)
+        wall, cpu, children = time.perf_counter(), time.process_time(), _children_cpu()
+        try:
+            yield st
+        finally:
+            st.wall_s = time.perf_counter() - wall
+            st.cpu_s = time.process_time() - cpu
+            st.cpu_children_s = _children_cpu() - children
+            st.rss_peak_mb = peak_rss_mb()
+            self._fold_py_peak()
+            self._open.pop()
+
+    def _top_allocators(self) -> List[Dict[str, Any]]:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"))
+        )
+        out = []
+        for stat in snapshot.statistics("lineno")[: self.top]:
+            frame = stat.traceback[0]
+            out.append({"where": f"{Path(frame.filename).name}:{frame.lineno}", "size_kb": round(stat.size / 1024, 1), "count": stat.count})
+        return out
+
+    def report(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "stages": [st.as_dict(self.trace_memory) for st in self.stages],
+            "wall_s": round(time.perf_counter() - self._wall0, 4),
+            "cpu_s": round(time.process_time() - self._cpu0, 4),
+            "cpu_children_s": round(_children_cpu() - self._children0, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_rss_children_mb": peak_rss_mb(1),
+        }
+        if self.trace_memory and tracemalloc.is_tracing():
+            self._fold_py_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            out["tracemalloc"] = {
+                "current_mb": round(current / (1024 * 1024), 2),
+                "peak_mb": round(max([st.py_peak_bytes for st in self.stages] + [current]) / (1024 * 1024), 2),
+                "top_allocators": self._top_allocators(),
+            }
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        return out
+
+
+def _frame_label(code: Any) -> str:
+    return f"{Path(code.co_filename).name}:{code.co_name}:{code.co_firstlineno}"
+
+
+class Profiler:
+    """cProfile + SIGPROF stack sampling for one run; finish() writes the files and returns their summary."""
+
+    def __init__(self, out_dir: str, name: str, interval: float = SAMPLE_INTERVAL):
+        self.out_dir = Path(out_dir)
+        self.name = name
+        self.interval = interval
+        self.samples: Dict[str, int] = {}
+        self._profile = cProfile.Profile()
+        self._sampling = hasattr(signal, "SIGPROF") and hasattr(signal, "setitimer")
+        self._previous_handler: Any = None
+        self._running = False
+
+    def _sample(self, signum: int, frame: Any) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        key = ";".join(reversed(stack))
+        self.samples[key] = self.samples.get(key, 0) + 1
+
+    def start(self) -> "Profiler":
+        if self._sampling:
+            try:
+                self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+                signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            except ValueError:  # not the main thread
+                self._sampling = False
+        self._profile.enable()
+        self._running = True
+        return self
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        self._profile.disable()
+        if self._sampling:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        self._running = False
+
+    def finish(self) -> Dict[str, Any]:
+        """Stop, write <name>.pstats / <name>.collapsed / <name>.txt, and summarize them for the run report."""
+        self.stop()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        pstats_path = self.out_dir / f"{self.name}.pstats"
+        self._profile.dump_stats(str(pstats_path))
+
+        text = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=text)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        text_path = self.out_dir / f"{self.name}.txt"
+        text_path.write_text(text.getvalue(), encoding="utf-8")
+
+        top = []
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in sorted(stats.stats.items(), key=lambda kv: -kv[1][3])[:TOP_FUNCTIONS]:
+            top.append({"function": f"{Path(filename).name}:{func}:{line}", "calls": calls, "tottime_s": round(tottime, 4), "cumtime_s": round(cumtime, 4)})
+
+        out: Dict[str, Any] = {"pstats": str(pstats_path), "text": str(text_path), "top_cumulative": top}
+        if self._sampling:
+            collapsed_path = self.out_dir / f"{self.name}.collapsed"
+            with collapsed_path.open("w", encoding="utf-8") as f:
+                for stack, count in sorted(self.samples.items()):
+                    f.write(f"{stack} {count}\n")
+            out["collapsed"] = str(collapsed_path)
+            out["samples"] = sum(self.samples.values())
+            out["sample_interval_s"] = self.interval
+        return out
+
+
+def start_profiler(out_dir: Optional[str], name: str) -> Optional[Profiler]:
+    """A running Profiler writing to `out_dir`, or None when profiling is off."""
+    return Profiler(out_dir, name).start() if out_dir else None
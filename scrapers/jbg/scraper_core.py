@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Shared scraper runtime: everything a source scraper needs except parsing.
+
+A source supplies a SourceAdapter (catalog extraction, next-page link, detail
+parsing, page kinds); ScraperRuntime provides the rest:
+- one pooled keep-alive requests.Session (optionally behind the HTTP cache)
+- RequestController: per-host rate budget, adaptive concurrency, retries
+- raw-HTML archive + crawl cursors (fingerprint skip / resume)
+- ordered concurrent detail fetching with an optional parse process pool
+- workbook checkpointing (XLSX or the SQLite staging store), a result journal
+  folded into the workbook in the background, and run metrics
+- a JSON run report (<state-dir>/<source>_run_report.json): request/cache
+  counters plus per-stage time, throughput and memory (run_stats.py), and
+  cProfile output with --profile
+
+Each scraper keeps its own workbook layout; the runtime only calls back with
+extracted items / parsed details. New sources (e.g. EBAY) only need an adapter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from crawl_cursors import DEFAULT_STATE_DIR, CrawlCursorStore, page_fingerprint
+from http_cache import DEFAULT_CACHE_DIR, HttpCache, mount_cache
+from page_archive import DEFAULT_ARCHIVE_DIR, PageArchive
+from request_controller import DEFAULT_MAX_ATTEMPTS, HostRateLimiter, RequestController, RetryQueue
+from result_journal import ResultJournal
+from run_stats import Stage, StageRecorder, add_profile_args, start_profiler
+
+
+Target = Tuple[Any, str]  # (key, url); str(key) is the archive source_key
+DetailResult = Tuple[Any, str, Dict, Optional[str]]  # (key, url, data, error)
+
+
+@dataclass
+class SourceAdapter:
+    """
+    What a source plugs into the runtime. Parse functions must be module-level
+    (picklable) so they can run in the parse process pool.
+    """
+
+    source: str  # cursor/metrics name, e.g. "JBG", "SS"
+    catalog_kind: str  # page kinds in the archive
+    detail_kind: str
+    id_field: str  # key of the item id in extract_catalog() dicts
+    extract_catalog: Callable[[str, str], List[Dict]]  # (html, page_url) -> items
+    next_page: Callable[[str, str], Optional[str]]  # (html, page_url) -> next catalog page
+    parse_detail: Callable[[str, str], Dict]  # (html, url) -> detail dict
+    headers: Dict[str, str] = field(default_factory=dict)
+    stop_when_no_new: bool = False  # stop paginating at the first page that adds nothing
+    checkpoint_pages: int = 1  # catalog pages between workbook saves
+
+
+def add_runtime_args(ap: argparse.ArgumentParser, delay: float = 1.5) -> None:
+    """CLI flags shared by every scraper."""
+    ap.add_argument("--delay", type=float, default=delay, help="Per-host request budget: one request every N seconds")
+    ap.add_argument("--concurrency", type=int, default=1, help="Max detail pages in flight; the adaptive window grows up to this while the site stays healthy")
+    ap.add_argument("--max-retries", type=int, default=DEFAULT_MAX_ATTEMPTS - 1, help="Retries per URL after 429/5xx/network errors (jittered backoff, honours Retry-After)")
+    ap.add_argument("--parse-workers", type=int, default=0, help="Parse detail pages in N worker processes (0 = inline on the fetch thread)")
+    ap.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="On-disk HTTP cache (ETag/Last-Modified revalidation)")
+    ap.add_argument("--cache-max-mb", type=int, default=256, help="HTTP cache size bound; least recently used pages evicted first")
+    ap.add_argument("--no-cache", action="store_true", help="Disable the HTTP cache and always download full pages")
+    ap.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR, help="Compressed raw-HTML archive of fetched pages")
+    ap.add_argument("--no-archive", action="store_true", help="Do not archive fetched pages")
+    ap.add_argument("--reparse-from-archive", action="store_true", help="Rebuild detail data from archived pages only (no network)")
+    ap.add_argument("--state-dir", default=DEFAULT_STATE_DIR, help="Crawl cursor store (page fingerprints + resume point)")
+    ap.add_argument("--restart-crawl", action="store_true", help="Ignore a saved interrupted-crawl cursor and start at page 1")
+    ap.add_argument("--checkpoint-interval", type=float, default=30.0, help="Seconds between background workbook saves in the detail phase (results are journaled meanwhile)")
+    ap.add_argument("--staging-db", default="", help="Write rows to this SQLite staging store instead of rewriting --xlsx (seeded from --xlsx; export with staging_store.py)")
+    ap.add_argument("--run-report", default="", help="Where to write the JSON run report (default: <state-dir>/<source>_run_report.json)")
+    add_profile_args(ap)
+
+
+class Metrics:
+    """Counters + accumulated timings for one run."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def summary(self) -> str:
+        parts = [f"{k}={v}" for k, v in sorted(self.counts.items())]
+        parts += [f"{k}_s={v:.1f}" for k, v in sorted(self.seconds.items())]
+        return " ".join(parts)
+
+
+class Checkpointer:
+    """
+    Saves the workbook every `every` ticks (and on demand). A staging-store sink
+    (commits_per_row) is saved on every tick: that commits the touched rows only.
+    """
+
+    def __init__(self, wb, path: str, every: int, metrics: Optional[Metrics] = None):
+        self.wb = wb
+        self.path = path
+        self.row_commits = bool(getattr(wb, "commits_per_row", False))
+        self.every = 1 if self.row_commits else max(1, every)
+        self.metrics = metrics
+        self.ticks = 0
+
+    def save(self) -> None:
+        started = time.monotonic()
+        save_workbook(self.wb, self.path)
+        if self.metrics is not None:
+            self.metrics.incr("saves")
+            self.metrics.add_time("save", time.monotonic() - started)
+
+    def tick(self) -> bool:
+        self.ticks += 1
+        if self.ticks % self.every == 0:
+            self.save()
+            return True
+        return False
+
+
+def save_workbook(wb, path: str) -> None:
+    """Save via temp file + rename, so a crash mid-save never leaves a truncated workbook."""
+    if getattr(wb, "commits_per_row", False):
+        wb.save(path)
+        return
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.saving{ext}"
+    wb.save(tmp)
+    os.replace(tmp, path)
+
+
+class JournalCheckpointer:
+    """
+    Detail-phase sink: results are appended to a JSONL journal (cheap, fsync
+    batched) and a background thread folds them into the workbook every
+    `interval` seconds with an atomic save. Scraping never waits on a save, and
+    a crash loses nothing: recover() replays the journal on the next start.
+
+    `apply(record)` writes one record into the workbook; it only ever runs on one
+    thread at a time (the folder thread, or the caller in recover()/close()).
+    A staging-store sink already commits per row, so records are applied and
+    committed immediately there and no journal is kept.
+    """
+
+    def __init__(
+        self,
+        wb,
+        path: str,
+        apply: Callable[[Dict[str, Any]], None],
+        interval: float = 30.0,
+        metrics: Optional[Metrics] = None,
+        journal_path: Optional[str] = None,
+    ):
+        self.wb = wb
+        self.path = path
+        self.apply = apply
+        self.interval = max(0.1, interval)
+        self.metrics = metrics
+        self.row_commits = bool(getattr(wb, "commits_per_row", False))
+        self.journal = None if self.row_commits else ResultJournal(journal_path or path + ".journal.jsonl")
+        self._lock = threading.Lock()
+        self._fold_lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[BaseException] = None
+
+    def _save(self) -> None:
+        started = time.monotonic()
+        save_workbook(self.wb, self.path)
+        if self.metrics is not None:
+            self.metrics.incr("saves")
+            self.metrics.add_time("save", time.monotonic() - started)
+
+    def recover(self) -> int:
+        """Apply results journaled by an earlier run that never reached a saved workbook."""
+        if self.journal is None:
+            return 0
+        n = 0
+        for rec in self.journal.replay():
+            self.apply(rec)
+            n += 1
+        if n:
+            self._save()
+        self.journal.clear()
+        return n
+
+    def start(self) -> "JournalCheckpointer":
+        if self.journal is not None and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="journal-checkpointer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        if self.error is not None:
+            raise RuntimeError(f"background checkpoint failed: {self.error}") from self.error
+        if self.journal is None:
+            self.apply(record)
+            self._save()
+            return
+        with self._lock:
+            self.journal.append(record)
+            self._pending.append(record)
+
+    def fold(self) -> int:
+        """Apply pending records and save; their journal segment is dropped once the save succeeded."""
+        with self._fold_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                segment = self.journal.rotate() if self.journal is not None else None
+            if not batch:
+                return 0
+            for rec in batch:
+                self.apply(rec)
+            self._save()
+            if self.journal is not None:
+                self.journal.discard(segment)
+            return len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.fold()
+            except BaseException as e:  # surfaced to the scraping thread on its next submit()
+                self.error = e
+                return
+
+    def close(self) -> None:
+        """Stop the folder thread and fold whatever is left."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.fold()
+        if self.journal is not None:
+            self.journal.close()
+
+    def __enter__(self) -> "JournalCheckpointer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def parse_safe(parse: Callable[[str, str], Dict], html: str, url: str) -> Tuple[Dict, Optional[str]]:
+    """Detail parse that reports errors instead of raising (safe to run in a worker process)."""
+    try:
+        return parse(html, url), None
+    except Exception as e:
+        return {}, str(e)
+
+
+def _chain_parse(fetch_fut: Future, parse_pool: ProcessPoolExecutor, parse: Callable, url: str) -> Future:
+    """
+    Future for (data, error) that hands the fetched body to the parse pool as soon
+    as the fetch finishes, so fetch threads go straight back to the network.
+    """
+    out: Future = Future()
+
+    def _parsed(parse_fut: Future) -> None:
+        try:
+            out.set_result(parse_fut.result())
+        except Exception as e:  # worker crashed / pool broken
+            out.set_result(({}, str(e)))
+
+    def _fetched(f: Future) -> None:
+        html, err = f.result()
+        if err is not None:
+            out.set_result(({}, err))
+            return
+        try:
+            parse_pool.submit(parse_safe, parse, html, url).add_done_callback(_parsed)
+        except Exception as e:
+            out.set_result(({}, str(e)))
+
+    fetch_fut.add_done_callback(_fetched)
+    return out
+
+
+class ScraperRuntime:
+    def __init__(
+        self,
+        adapter: SourceAdapter,
+        delay: float = 1.5,
+        concurrency: int = 1,
+        max_retries: int = DEFAULT_MAX_ATTEMPTS - 1,
+        parse_workers: int = 0,
+        cache: Optional[HttpCache] = None,
+        archive: Optional[PageArchive] = None,
+        state_dir: str = DEFAULT_STATE_DIR,
+        run_report: str = "",
+        trace_memory: bool = False,
+        profile_dir: Optional[str] = None,
+    ):
+        self.adapter = adapter
+        self.concurrency = max(1, concurrency)
+        self.parse_workers = max(0, parse_workers)
+        self.cache = cache
+        self.archive = archive
+        self.state_dir = state_dir
+        self._cursors: Optional[CrawlCursorStore] = None
+        self.metrics = Metrics()
+        self.stages = StageRecorder(trace_memory=trace_memory)
+        self.run_report = run_report or os.path.join(state_dir, f"{adapter.source.lower()}_run_report.json")
+        self.profiler = start_profiler(profile_dir, f"{adapter.source.lower()}_scraper")
+        self.controller = RequestController(
+            HostRateLimiter.from_delay(delay),
+            max_concurrency=self.concurrency,
+            max_attempts=max_retries + 1,
+        )
+        self.session = requests.Session()
+        self.session.headers.update(adapter.headers)
+        # keep one pooled keep-alive connection per worker thread
+        pool_size = max(10, self.concurrency)
+        if cache is not None:
+            mount_cache(self.session, cache, pool_size=pool_size)
+        else:
+            http = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("https://", http)
+            self.session.mount("http://", http)
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace, adapter: SourceAdapter) -> "ScraperRuntime":
+        """Runtime configured from add_runtime_args() flags (no network resources in reparse mode)."""
+        offline = getattr(args, "reparse_from_archive", False)
+        cache = None if (args.no_cache or offline) else HttpCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+        archive = None if (args.no_archive and not offline) else PageArchive(args.archive_dir)
+        return cls(
+            adapter,
+            delay=args.delay,
+            concurrency=args.concurrency,
+            max_retries=args.max_retries,
+            parse_workers=args.parse_workers,
+            cache=cache,
+            archive=archive,
+            state_dir=args.state_dir,
+            run_report=getattr(args, "run_report", ""),
+            trace_memory=getattr(args, "trace_memory", False),
+            profile_dir=getattr(args, "profile", "") or None,
+        )
+
+    @property
+    def cursors(self) -> CrawlCursorStore:
+        if self._cursors is None:
+            self._cursors = CrawlCursorStore(self.state_dir)
+        return self._cursors
+
+    # ---- fetching ----
+
+    def fetch(self, url: str, kind: Optional[str] = None, source_key: Optional[str] = None, retry: bool = True) -> str:
+        """
+        GET a page through the controller and archive it under `kind`.
+        retry=False makes a single attempt; callers can then queue the URL via
+        self.controller.retry_delay(url).
+        """
+        started = time.monotonic()
+        if retry:
+            resp = self.controller.fetch(self.session, url, timeout=30)
+        else:
+            resp = self.controller.get(self.session, url, timeout=30)
+        self.metrics.add_time("fetch", time.monotonic() - started)
+        self.metrics.incr("pages")
+        self.metrics.incr("bytes_fetched", len(resp.content))
+        if getattr(resp, "from_cache", False):
+            self.metrics.incr("pages_from_cache")
+        html = resp.text
+        if self.archive is not None and kind:
+            self.archive.put(url, html, kind=kind, source_key=source_key)
+        return html
+
+    def fetch_html(self, key: Any, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Fetch one detail page (single attempt). Returns (html, error); never raises."""
+        try:
+            return self.fetch(url, kind=self.adapter.detail_kind, source_key=str(key), retry=False), None
+        except Exception as e:
+            return None, str(e)
+
+    def fetch_detail(self, key: Any, url: str) -> Tuple[Dict, Optional[str]]:
+        """Fetch + parse one detail page inline. Returns (data, error); never raises."""
+        html, err = self.fetch_html(key, url)
+        if err is not None:
+            return {}, err
+        started = time.monotonic()
+        result = parse_safe(self.adapter.parse_detail, html, url)
+        self.metrics.add_time("parse", time.monotonic() - started)
+        return result
+
+    @contextmanager
+    def _fetch_stage(self, name: str) -> Iterator[Stage]:
+        """A run stage whose `bytes` is what fetch() downloaded while it was open."""
+        before = self.metrics.counts.get("bytes_fetched", 0)
+        with self.stages.stage(name) as st:
+            try:
+                yield st
+            finally:
+                st.bytes = self.metrics.counts.get("bytes_fetched", 0) - before
+
+    # ---- catalog ----
+
+    def crawl_catalog(
+        self,
+        start_url: str,
+        max_pages: int,
+        write_items: Callable[[List[Dict]], Tuple[int, int]],
+        checkpointer: Checkpointer,
+        restart: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Paginate the catalog from `start_url` (or the saved cursor) for up to
+        `max_pages` fetches. Pages whose body fingerprint matches the last saved
+        crawl are skipped without parsing. write_items(items) -> (discovered, appended).
+
+        Rows are saved before pages are recorded and the cursor advanced, so a
+        crash only re-does pages, never skips them. A run stopped by max_pages
+        keeps the cursor "running" so the next run continues where it left off.
+        """
+        ad = self.adapter
+        tag = f"[{ad.source} CATALOG]"
+        cursors = self.cursors
+        cursor_key = f"catalog:{start_url}"
+        cursor = cursors.get(ad.source, cursor_key)
+        unsaved: List[Tuple[str, str, List[str], Optional[str]]] = []
+        last_ids: List[str] = []
+        stats = {"pages": 0, "discovered": 0, "appended": 0, "unchanged_pages": 0}
+
+        def checkpoint(next_url: Optional[str]) -> None:
+            checkpointer.save()
+            for page_url, fp, ids, nxt in unsaved:
+                cursors.record_page(ad.source, page_url, fp, ids, nxt)
+            unsaved.clear()
+            cursors.save(
+                ad.source,
+                cursor_key,
+                {"status": "running" if next_url else "complete", "next_url": next_url, "last_seen_ids": last_ids},
+            )
+
+        url: Optional[str] = start_url
+        if cursor.get("status") == "running" and cursor.get("next_url") and not restart:
+            url = cursor["next_url"]
+            print(f"{tag} Resuming interrupted crawl at {url}")
+
+        with self._fetch_stage("catalog") as st:
+            while url and stats["pages"] < max_pages:
+                stats["pages"] += 1
+                print(f"{tag} Page {stats['pages']}: {url}")
+                try:
+                    html = self.fetch(url, kind=ad.catalog_kind)
+                except requests.RequestException as e:
+                    # keep what we have; the cursor still points at this page for the next run
+                    print(f"{tag} Giving up on {url}: {e}")
+                    break
+
+                fp = page_fingerprint(html)
+                known = cursors.get_page(ad.source, url)
+                if known and known["fingerprint"] == fp:
+                    # identical page body since the last saved crawl: rows are already in the sheet
+                    last_ids = known["product_ids"]
+                    next_url = known["next_url"] or ad.next_page(html, url)
+                    discovered, appended = len(last_ids), 0
+                    stats["unchanged_pages"] += 1
+                    print(f"{tag} unchanged since {known['seen_at']} ({discovered} items); skipped")
+                else:
+                    started = time.monotonic()
+                    items = ad.extract_catalog(html, url)
+                    next_url = ad.next_page(html, url)
+                    self.metrics.add_time("parse", time.monotonic() - started)
+                    discovered, appended = write_items(items)
+                    last_ids = [str(it[ad.id_field]) for it in items]
+                    unsaved.append((url, fp, last_ids, next_url))
+                    print(f"{tag} discovered={discovered} appended_new={appended}")
+                stats["discovered"] += discovered
+                stats["appended"] += appended
+
+                if ad.stop_when_no_new and appended == 0 and url != start_url:
+                    # likely end of pagination / filtered list exhausted
+                    print(f"{tag} No new items appended; stop.")
+                    url = None
+                    break
+                url = next_url
+                if stats["pages"] % ad.checkpoint_pages == 0:
+                    checkpoint(url)
+
+            checkpoint(url)
+            st.rows = stats["discovered"]
+        return stats
+
+    # ---- details ----
+
+    def iter_details(self, targets: Iterable[Target]) -> Iterator[DetailResult]:
+        """
+        Yield (key, url, data, error) for each target, in target order.
+
+        With concurrency > 1 a bounded worker pool keeps up to `concurrency` requests
+        in flight (the controller's adaptive window and rate budget decide how many
+        actually run), but results are still yielded in input order so rows land in
+        the workbook exactly where a serial run puts them.
+
+        With parse_workers > 0, fetch threads only download; bodies are parsed by a
+        process pool of that size so parsing scales with cores and never holds up a
+        fetch. Parsed dicts are identical to the inline path (same parse function).
+        """
+        concurrency, parse_workers = self.concurrency, self.parse_workers
+        if concurrency <= 1 and parse_workers <= 0:
+            for key, url in targets:
+                data, err = self.fetch_detail(key, url)
+                yield key, url, data, err
+            return
+
+        it = iter(targets)
+        pending = deque()
+        parse_pool = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 0 else None
+
+        def submit(pool: ThreadPoolExecutor, key: Any, url: str) -> Future:
+            if parse_pool is None:
+                return pool.submit(self.fetch_detail, key, url)
+            return _chain_parse(pool.submit(self.fetch_html, key, url), parse_pool, self.adapter.parse_detail, url)
+
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"{self.adapter.source.lower()}-detail") as pool:
+                # small look-ahead window so workers never idle while the head result is consumed
+                for key, url in itertools.islice(it, concurrency * 2 + parse_workers):
+                    pending.append((key, url, submit(pool, key, url)))
+                while pending:
+                    key, url, fut = pending.popleft()
+                    data, err = fut.result()
+                    nxt = next(it, None)
+                    if nxt is not None:
+                        pending.append((nxt[0], nxt[1], submit(pool, nxt[0], nxt[1])))
+                    yield key, url, data, err
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown(wait=True, cancel_futures=True)
+
+    def run_details(
+        self,
+        targets: List[Target],
+        on_result: Callable[[Any, str, Dict, Optional[str]], None],
+        checkpointer: Optional[Checkpointer] = None,
+    ) -> int:
+        """
+        Fetch + parse every target, calling on_result(key, url, data, error) in
+        target order. Transient failures are reported, then retried after the main
+        pass with jittered backoff; on_result is called again with the retry outcome.
+        Returns the number of targets processed (each once, retries not counted);
+        the "detail_errors" metric counts only targets whose last attempt failed.
+        """
+        tag = f"[{self.adapter.source} DETAIL]"
+        retry = RetryQueue()
+        count = 0
+        retries = 0
+
+        def run(items: List[Target], retrying: bool) -> None:
+            nonlocal count, retries
+            for key, url, data, err in self.iter_details(items):
+                if retrying:
+                    retries += 1
+                    self.metrics.incr("detail_retries")
+                    print(f"{tag} (retry {retries}) {key}")
+                else:
+                    count += 1
+                    print(f"{tag} ({count}/{len(targets)}) {key}")
+                on_result(key, url, data, err)
+                if err is not None:
+                    delay = self.controller.retry_delay(url)
+                    if delay is not None:
+                        retry.push((key, url), delay)
+                        print(f"{tag} Error on {key}: {err} (retry in {delay:.1f}s)")
+                    else:
+                        self.metrics.incr("detail_errors")
+                        print(f"{tag} Error on {key}: {err}")
+                if checkpointer is not None and checkpointer.tick() and not checkpointer.row_commits:
+                    print(f"{tag} Checkpoint saved at {count + retries} results.")
+
+        with self._fetch_stage("details") as st:
+            run(targets, retrying=False)
+            while retry:
+                ready = retry.pop_ready()
+                print(f"{tag} Retrying {len(ready)} failed pages ({len(retry)} still waiting)")
+                run(ready, retrying=True)
+            st.rows = count
+        return count
+
+    def reparse_archive(self, targets: List[Target]) -> Tuple[List[Tuple[Any, str, Dict, Optional[str], str]], int]:
+        """
+        Parse the latest archived copy of each target's detail page (no network).
+        Returns ([(key, url, data, error, fetched_at)], missing_from_archive).
+        """
+        if self.archive is None:
+            raise RuntimeError("reparse_archive needs a page archive")
+        pages = []
+        missing = 0
+        for key, url in targets:
+            page = self.archive.latest(url, kind=self.adapter.detail_kind)
+            if page is None:
+                missing += 1
+                continue
+            pages.append((key, url, page))
+
+        parse = self.adapter.parse_detail
+        htmls = [p.html for _, _, p in pages]
+        urls = [url for _, url, _ in pages]
+        with self.stages.stage("reparse", rows=len(pages), bytes=sum(len(h) for h in htmls)):
+            if self.parse_workers > 0:
+                with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+                    results = list(pool.map(parse_safe, [parse] * len(pages), htmls, urls, chunksize=16))
+            else:
+                results = [parse_safe(parse, h, u) for h, u in zip(htmls, urls)]
+        return [(key, url, data, err, page.fetched_at) for (key, url, page), (data, err) in zip(pages, results)], missing
+
+    def write_run_report(self) -> str:
+        """
+        Write counters, request stats and per-stage metrics (plus the profile
+        with --profile) to self.run_report. Call once, at the end of the run.
+        """
+        report: Dict[str, Any] = {
+            "source": self.adapter.source,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "argv": sys.argv[1:],
+            "counts": dict(self.metrics.counts),
+            "seconds": {k: round(v, 4) for k, v in self.metrics.seconds.items()},
+            "requests": dict(self.controller.stats),
+            "metrics": self.stages.report(),
+        }
+        if self.cache is not None:
+            report["cache"] = dict(self.cache.stats)
+        if self.profiler is not None:
+            report["profile"] = self.profiler.finish()
+        os.makedirs(os.path.dirname(os.path.abspath(self.run_report)), exist_ok=True)
+        with open(self.run_report, "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, indent=2, ensure_ascii=False, sort_keys=True) + "\n")
+        return self.run_report
+
+    def summary(self) -> List[str]:
+        lines = [f"[{self.adapter.source} RUNTIME] {self.metrics.summary()}", f"[{self.adapter.source} REQUESTS] {self.controller.summary()}"]
+        if self.cache is not None:
+            lines.append(f"[{self.adapter.source} CACHE] {self.cache.summary()}")
+        if self.stages.stages:
+            stages = " ".join(f"{st.name}={st.wall_s:.1f}s" for st in self.stages.stages if "." not in st.name)
+            lines.append(f"[{self.adapter.source} STAGES] {stages}")
+        return lines
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Streaming XML sitemap reader for product discovery.
+
+Finds sitemaps from robots.txt (`Sitemap:` lines, falling back to /sitemap.xml),
+follows <sitemapindex> files recursively and yields every <url> entry with its
+<lastmod>. Responses are parsed incrementally with lxml iterparse straight off
+the socket, and parsed elements are dropped as soon as they are read, so a
+50k-URL sitemap never sits in memory as a tree.
+
+Usage:
+    for entry in iter_site_entries(sess, controller, "https://www.justballgloves.com/"):
+        print(entry.loc, entry.lastmod)
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Set
+from urllib.parse import urljoin, urlparse
+
+import requests
+from lxml import etree
+
+from request_controller import RequestController
+
+
+@dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: Optional[str]
+
+
+def _local(tag) -> str:
+    return etree.QName(tag).localname if isinstance(tag, str) else ""
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[dt.datetime]:
+    """W3C datetime (2026-01-31, 2026-01-31T10:00:00+00:00, ...Z) -> aware UTC datetime."""
+    if not value:
+        return None
+    v = value.strip()
+    if v.endswith("Z"):
+        v = v[:-1] + "+00:00"
+    try:
+        parsed = dt.datetime.fromisoformat(v)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+    return parsed.astimezone(dt.timezone.utc)
+
+
+def discover_sitemaps(sess: requests.Session, controller: RequestController, site_url: str) -> List[str]:
+    """Sitemap URLs advertised in robots.txt, or the conventional /sitemap.xml."""
+    u = urlparse(site_url)
+    root = f"{u.scheme}://{u.netloc}/"
+    found = []
+    try:
+        resp = controller.fetch(sess, urljoin(root, "robots.txt"), timeout=30)
+        for line in resp.text.splitlines():
+            key, _, value = line.partition(":")
+            if key.strip().lower() == "sitemap" and value.strip():
+                found.append(urljoin(root, value.strip()))
+    except requests.RequestException as e:
+        print(f"[SITEMAP] robots.txt unavailable ({e}); trying /sitemap.xml")
+    return found or [urljoin(root, "sitemap.xml")]
+
+
+def iter_sitemap(
+    sess: requests.Session,
+    controller: RequestController,
+    url: str,
+    _seen: Optional[Set[str]] = None,
+) -> Iterator[SitemapEntry]:
+    """Yield <url> entries from one sitemap, descending into <sitemapindex> children."""
+    seen = _seen if _seen is not None else set()
+    if url in seen:
+        return
+    seen.add(url)
+
+    resp = controller.fetch(sess, url, timeout=60, stream=True)
+    children: List[str] = []
+    try:
+        resp.raw.decode_content = True
+        stream = gzip.GzipFile(fileobj=resp.raw) if urlparse(url).path.endswith(".gz") else resp.raw
+        for _, el in etree.iterparse(stream, events=("end",), resolve_entities=False, no_network=True, huge_tree=True):
+            name = _local(el.tag)
+            if name not in ("url", "sitemap"):
+                continue
+            loc = lastmod = None
+            for child in el:
+                cname = _local(child.tag)
+                if cname == "loc":
+                    loc = (child.text or "").strip()
+                elif cname == "lastmod":
+                    lastmod = (child.text or "").strip() or None
+            # free what we've read so far
+            el.clear()
+            while el.getprevious() is not None:
+                del el.getparent()[0]
+            if not loc:
+                continue
+            if name == "sitemap":
+                children.append(urljoin(url, loc))
+            else:
+                yield SitemapEntry(loc=urljoin(url, loc), lastmod=lastmod)
+    finally:
+        resp.close()
+
+    for child in children:
+        yield from iter_sitemap(sess, controller, child, seen)
+
+
+def iter_site_entries(
+    sess: requests.Session,
+    controller: RequestController,
+    site_url: str,
+    sitemap_urls: Optional[List[str]] = None,
+) -> Iterator[SitemapEntry]:
+    """All <url> entries reachable from the site's sitemaps."""
+    seen: Set[str] = set()
+    for sm in sitemap_urls or discover_sitemaps(sess, controller, site_url):
+        print(f"[SITEMAP] {sm}")
+        yield from iter_sitemap(sess, controller, sm, seen)
@@ -1,6 +1,16 @@
 #!/usr/bin/env python3
 """
 SidelineSwap Master Scraper — GloveIQ Structured Edition
+
+Re-runs only do new work: catalog listings are upserted by listing_id, and
+--resume skips listings whose normalized_json is already filled:
+python ss_master_scraper.py --xlsx "GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --max-pages 5 --max-details 500 --resume
+
+Rebuild normalized_json from archived detail pages after a parser fix (no network):
+python ss_master_scraper.py --xlsx "GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --reparse-from-archive
+
+Write to the SQLite staging store instead of rewriting the workbook (export with staging_store.py):
+python ss_master_scraper.py --xlsx "GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --staging-db .staging/gloveiq.sqlite --max-pages 5 --max-details 500 --resume
 """
 
 import argparse
@@ -8,86 +18,160 @@ import re
 import json
 import time
 from urllib.parse import urljoin
-import requests
 from bs4 import BeautifulSoup
-from openpyxl import load_workbook
+from scraper_core import Checkpointer, JournalCheckpointer, ScraperRuntime, SourceAdapter, add_runtime_args, save_workbook
+from staging_store import open_workbook
+from worksheet_index import WorksheetIndex
+from structured_data import find_product, product_properties, product_text
+from glove_normalize import collapse_ws as clean, normalize_specs
 
 DEFAULT_START_URL = "https://sidelineswap.com/shop/baseball/baseball-gloves/l78"
 SHEET_NAME = "Catalog"
 
-def clean(s):
-    return re.sub(r"\s+", " ", (s or "").strip())
-
-def extract_size_inches(text):
-    t = clean(text)
-    if not t:
-        return None
-    m = re.search(r"(\d{1,2}\.\d{1,2})", t)
-    if m:
-        return float(m.group(1))
-    m = re.search(r"(\d{1,2})\s*(?:-|\s)\s*(\d)\s*/\s*(\d)", t)
-    if m:
-        whole = float(m.group(1))
-        num = float(m.group(2))
-        den = float(m.group(3))
-        return whole + (num / den)
-    return None
-
-def norm_throw(v):
-    v = clean(v).lower()
-    if "right" in v and "throw" in v:
-        return "RHT"
-    if "left" in v and "throw" in v:
-        return "LHT"
-    return "UNK"
-
-def norm_position(v):
-    v = clean(v).lower()
-    if "outfield" in v or v == "of":
-        return "OF"
-    if "infield" in v or v == "if":
-        return "IF"
-    if "pitch" in v:
-        return "P"
-    if "catch" in v:
-        return "C"
-    if "first" in v or "1b" in v:
-        return "1B"
-    if "middle" in v or "ss" in v or "2b" in v:
-        return "MI"
-    return clean(v).upper() if v else None
-
-def normalize_specs(specs, title):
-    lower = { clean(k).lower(): v for k, v in (specs or {}).items() }
-
-    def get(*keys):
-        for k in keys:
-            if k in lower and lower[k]:
-                return lower[k]
-        return None
-
-    size_raw = get("size", "glove size")
-    throw_raw = get("throwing hand", "throws")
-    pos_raw = get("position")
-    web_raw = get("web", "web type")
-
-    return {
-        "raw": specs,
-        "norm": {
-            "size_in": extract_size_inches(str(size_raw)) if size_raw else None,
-            "throw_hand": norm_throw(str(throw_raw)) if throw_raw else "UNK",
-            "position": norm_position(str(pos_raw)) if pos_raw else None,
-            "web": clean(str(web_raw)) if web_raw else None,
-            "title": clean(str(title)) if title else None,
-            "source": "SS"
-        }
-    }
-
-def fetch(url):
-    headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(url, headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.text
+def parse_detail_page_dom(html):
+    soup = BeautifulSoup(html, "lxml")
+
+    specs = {}
+    for li in soup.select("li"):
+        if ":" in li.get_text():
+            parts = li.get_text().split(":", 1)
+            specs[clean(parts[0])] = clean(parts[1])
+
+    title = soup.find("h1").get_text(strip=True) if soup.find("h1") else None
+    return specs, title
+
+def parse_detail_page(html):
+    # listing attributes from the page's schema.org Product (JSON-LD / page state) when
+    # it has them; otherwise every "Label: value" <li> in the DOM
+    product = find_product(html)
+    specs = product_properties(product) if product else {}
+    if specs:
+        return normalize_specs(specs, product_text(product, "name"))
+    specs, title = parse_detail_page_dom(html)
+    if not title and product:
+        title = product_text(product, "name")
+    return normalize_specs(specs, title)
+
+def parse_listing_page(html, url):
+    return parse_detail_page(html)
+
+def extract_listings(html, page_url):
+    soup = BeautifulSoup(html, "lxml")
+    items = []
+    seen = set()
+    for a in soup.select("a[href*='/gear/']"):
+        href = a.get("href")
+        if not href:
+            continue
+        full = urljoin(page_url, href)
+        if "sidelineswap.com/gear/" not in full:
+            continue
+        m = re.search(r"/gear/.+?/(\d+)-", full)
+        if not m or m.group(1) in seen:
+            continue
+        seen.add(m.group(1))
+        items.append({"listing_id": m.group(1), "url": full, "title": clean(a.get_text())})
+    return items
+
+def next_listing_page(html, page_url):
+    soup = BeautifulSoup(html, "lxml")
+    next_link = soup.find("a", string=re.compile("Next", re.I))
+    return urljoin(page_url, next_link.get("href")) if next_link else None
+
+ADAPTER = SourceAdapter(
+    source="SS",
+    catalog_kind="ss_catalog",
+    detail_kind="ss_detail",
+    id_field="listing_id",
+    extract_catalog=extract_listings,
+    next_page=next_listing_page,
+    parse_detail=parse_listing_page,
+    headers={"User-Agent": "Mozilla/5.0"},
+)
+
+class ListingSheet:
+    """
+    Catalog sheet with a listing_id -> rows index and header-aware writes.
+    Rows without a listing_id are keyed by their URL.
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.index = WorksheetIndex(ws, required=("listing_id", "product_url", "normalized_json"))
+        self.cols = self.index.headers
+        self.rows = {}  # key -> [sheet rows], first row first
+        self.order = []  # keys in first-seen row order
+        self.url = {}
+        self.filled = set()  # keys with normalized_json on every row
+        partial = set()
+        c_id, c_url, c_norm = self.cols["listing_id"] - 1, self.cols["product_url"] - 1, self.cols["normalized_json"] - 1
+        for r, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+            url = row[c_url] if c_url < len(row) else None
+            if not url:
+                continue
+            key = str(row[c_id]) if row[c_id] is not None else url
+            self._add(key, url, r)
+            norm = row[c_norm] if c_norm < len(row) else None
+            (self.filled if norm else partial).add(key)
+        self.filled -= partial
+
+    def _add(self, key, url, row):
+        if key not in self.rows:
+            self.rows[key] = []
+            self.order.append(key)
+            self.url[key] = url
+        self.rows[key].append(row)
+
+    def upsert(self, item):
+        """Insert a catalog listing, or refresh url/title on its existing rows. Returns True if new."""
+        key = str(item["listing_id"])
+        values = {"listing_id": key, "product_url": item["url"], "title": item.get("title")}
+        if key in self.rows:
+            for r in self.rows[key]:
+                for name in ("product_url", "title"):
+                    if values[name]:
+                        self.index.set(r, name, values[name])
+            self.url[key] = item["url"]
+            return False
+        r = self.index.append()
+        for name, value in values.items():
+            if value is not None:
+                self.index.set(r, name, value)
+        self._add(key, item["url"], r)
+        return True
+
+    def targets(self, max_details=None, resume=False):
+        """[(key, url)] in sheet order; resume skips listings whose normalized_json is already filled."""
+        out = []
+        for key in self.order:
+            if resume and key in self.filled:
+                continue
+            if max_details is not None and len(out) >= max_details:
+                break
+            out.append((key, self.url[key]))
+        return out
+
+    def apply_record(self, rec):
+        """Write one journaled detail result ({key, norm}); listings no longer in the sheet are ignored."""
+        if rec.get("key") in self.rows:
+            self.write_normalized(rec["key"], rec["norm"])
+
+    def write_normalized(self, key, norm):
+        value = json.dumps(norm, ensure_ascii=False)
+        for r in self.rows[key]:
+            self.index.set(r, "normalized_json", value)
+        self.filled.add(key)
+
+def reparse_from_archive(ws, runtime):
+    """Rewrite normalized_json for every Catalog row from its latest archived detail page."""
+    sheet = ListingSheet(ws)
+    results, missing = runtime.reparse_archive(sheet.targets())
+    for key, url, norm, err, fetched_at in results:
+        if err is None:
+            sheet.write_normalized(key, norm)
+        else:
+            print(f"[REPARSE] Error on {key}: {err}")
+    return len(results), missing
 
 def main():
     parser = argparse.ArgumentParser()
@@ -95,76 +179,63 @@ def main():
     parser.add_argument("--start-url", default=DEFAULT_START_URL)
     parser.add_argument("--max-pages", type=int, default=5)
     parser.add_argument("--max-details", type=int, default=0)
-    parser.add_argument("--delay", type=float, default=1.5)
+    parser.add_argument("--resume", action="store_true", help="Skip listings whose normalized_json is already filled")
+    add_runtime_args(parser, delay=1.5)
     args = parser.parse_args()
 
-    wb = load_workbook(args.xlsx)
+    runtime = ScraperRuntime.from_args(args, ADAPTER)
+    with runtime.stages.stage("open_workbook"):
+        wb = open_workbook(args.xlsx, args.staging_db)
     ws = wb[SHEET_NAME]
+    sheet = ListingSheet(ws)
+
+    # detail results journaled by a run that crashed before its next workbook save
+    sink = JournalCheckpointer(wb, args.xlsx, sheet.apply_record, args.checkpoint_interval, runtime.metrics)
+    recovered = sink.recover()
+    if recovered:
+        print(f"[DETAIL] Recovered {recovered} journaled results from an interrupted run")
+
+    if args.reparse_from_archive:
+        started = time.monotonic()
+        reparsed, missing = reparse_from_archive(ws, runtime)
+        save_workbook(wb, args.xlsx)
+        print(f"[REPARSE] rows={reparsed} missing_from_archive={missing} seconds={time.monotonic() - started:.1f}")
+        print(f"[REPORT] {runtime.write_run_report()}")
+        return
 
     # Catalog Phase
-    current_url = args.start_url
-    for page in range(1, args.max_pages + 1):
-        print(f"[CATALOG] Page {page}: {current_url}")
-        html = fetch(current_url)
-        soup = BeautifulSoup(html, "lxml")
-
-        for a in soup.select("a[href*='/gear/']"):
-            href = a.get("href")
-            if not href:
-                continue
-            full = urljoin(current_url, href)
-            if "sidelineswap.com/gear/" not in full:
-                continue
-            m = re.search(r"/gear/.+?/(\d+)-", full)
-            if not m:
-                continue
-            listing_id = m.group(1)
-            title = clean(a.get_text())
-            ws.append([listing_id, full, title])
-
-        wb.save(args.xlsx)
-
-        next_link = soup.find("a", string=re.compile("Next", re.I))
-        if not next_link:
-            break
-        current_url = urljoin(current_url, next_link.get("href"))
-        time.sleep(args.delay)
+    def write_items(items):
+        appended = sum(1 for it in items if sheet.upsert(it))
+        return len(items), appended
+
+    if args.max_pages > 0:
+        runtime.crawl_catalog(
+            args.start_url,
+            args.max_pages,
+            write_items,
+            Checkpointer(wb, args.xlsx, every=1, metrics=runtime.metrics),
+            restart=args.restart_crawl,
+        )
 
     # Detail Phase
     if args.max_details == 0:
         print("Skipping detail phase.")
-        wb.save(args.xlsx)
+        save_workbook(wb, args.xlsx)
+        print(f"[REPORT] {runtime.write_run_report()}")
         return
 
-    for idx, row in enumerate(ws.iter_rows(min_row=2), start=1):
-        if idx > args.max_details:
-            break
-
-        listing_id = row[0].value
-        url = row[1].value
-        print(f"[DETAIL] {listing_id}")
-
-        html = fetch(url)
-        soup = BeautifulSoup(html, "lxml")
-
-        specs = {}
-        for li in soup.select("li"):
-            if ":" in li.get_text():
-                parts = li.get_text().split(":", 1)
-                specs[clean(parts[0])] = clean(parts[1])
-
-        title = soup.find("h1").get_text(strip=True) if soup.find("h1") else None
-
-        norm = normalize_specs(specs, title)
-
-        ws.cell(row=idx+1, column=10, value=json.dumps(norm, ensure_ascii=False))
-
-        if idx % 25 == 0:
-            wb.save(args.xlsx)
+    targets = sheet.targets(args.max_details, resume=args.resume)
+    print(f"[DETAIL] Targets: {len(targets)} (resume={args.resume})")
 
-        time.sleep(args.delay)
+    def on_result(key, url, norm, err):
+        if err is None:
+            sink.submit({"key": key, "norm": norm})
 
-    wb.save(args.xlsx)
+    with sink:
+        runtime.run_details(targets, on_result)
+    for line in runtime.summary():
+        print(line)
+    print(f"[REPORT] {runtime.write_run_report()}")
     print("Done.")
 
 if __name__ == "__main__":
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+SQLite (WAL) staging store for the scraper sheets.
+
+The scrapers and the B2 ingest used the master XLSX as their database: load the
+whole workbook, mutate cells, rewrite the full zip on every checkpoint. With
+`--staging-db` they write here instead:
+
+- one table per sheet (JBG_Full_Catalog, JBG_Detail_Enrichment, Catalog, ...)
+  whose columns are the sheet's header row, in order; `_row` is the sheet row
+- columns a stage adds to a sheet header (the B2 columns b2_images_json /
+  b2_status / b2_error / ...) become table columns (ALTER TABLE ADD COLUMN)
+- every written row is committed in its own transaction, and only the cells a
+  stage actually set are written, so the JBG scraper, the SS scraper and the B2
+  ingest can run at the same time without overwriting each other's work
+- the XLSX is produced on demand by `export`, for humans and library_import.py
+- the sha256 of the XLSX is recorded at seed / export time; if the workbook
+  has changed since (e.g. a run without `--staging-db` wrote to it), opening
+  the store and `export` refuse instead of silently dropping those rows
+
+StagingWorkbook / StagingSheet expose the small part of the openpyxl API the
+scrapers use (sheetnames, wb[name], ws.cell(), ws.iter_rows(), max_row,
+max_column, wb.save()), so their sheet code runs unchanged on either sink.
+
+Usage:
+# seed the store from the workbook once (scrapers also do this on first use)
+python staging_store.py import --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx"
+
+# scrape into the store
+python jbg_master_scraper.py --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx" --staging-db .staging/gloveiq.sqlite --max-details 500
+
+# write the workbook back out
+python staging_store.py export --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx"
+
+# the workbook was edited outside the store: reload it (drops staged rows), or overwrite it
+python staging_store.py import --replace --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx"
+python staging_store.py export --force --xlsx "../jbg/GloveIQ_Library_Master_Template_GOOGLE_NATIVE_FULLCAT_READY.xlsx"
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import openpyxl
+
+from workbook_snapshot import content_hash
+
+
+DEFAULT_STAGING_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".staging", "gloveiq.sqlite")
+ROW_COL = "_row"
+
+
+def _now_iso() -> str:
+    return dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class StaleWorkbookError(RuntimeError):
+    """The XLSX changed since the store was seeded from (or last exported to) it."""
+
+
+class StagingStore:
+    def __init__(self, path: str = DEFAULT_STAGING_DB):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=60)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS staging_sheets (
+                name TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                seeded_from TEXT,
+                seeded_sha256 TEXT,
+                seeded_at TEXT NOT NULL
+            )
+            """
+        )
+        # stores created before seeded_sha256 existed: their sheets are not checked until re-seeded
+        if "seeded_sha256" not in {r[1] for r in self._db.execute("PRAGMA table_info(staging_sheets)")}:
+            self._db.execute("ALTER TABLE staging_sheets ADD COLUMN seeded_sha256 TEXT")
+
+    # ---- schema ----
+
+    def sheet_names(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT name FROM staging_sheets ORDER BY position, name")]
+
+    def columns(self, sheet: str) -> List[str]:
+        with self._lock:
+            return [r[1] for r in self._db.execute(f"PRAGMA table_info({_q(sheet)})") if r[1] != ROW_COL]
+
+    def create_sheet(
+        self,
+        sheet: str,
+        headers: List[str],
+        seeded_from: Optional[str] = None,
+        seeded_sha256: Optional[str] = None,
+    ) -> None:
+        # untyped columns keep whatever the scraper wrote (str / float / int) as-is
+        cols = ", ".join(_q(h) for h in headers)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(f"CREATE TABLE IF NOT EXISTS {_q(sheet)} ({_q(ROW_COL)} INTEGER PRIMARY KEY{', ' + cols if cols else ''})")
+                position = self._db.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM staging_sheets").fetchone()[0]
+                self._db.execute(
+                    "INSERT OR IGNORE INTO staging_sheets (name, position, seeded_from, seeded_sha256, seeded_at) VALUES (?, ?, ?, ?, ?)",
+                    (sheet, position, seeded_from, seeded_sha256, _now_iso()),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def add_column(self, sheet: str, name: str) -> None:
+        with self._lock:
+            existing = {r[1] for r in self._db.execute(f"PRAGMA table_info({_q(sheet)})")}
+            if name in existing:
+                return
+            try:
+                self._db.execute(f"ALTER TABLE {_q(sheet)} ADD COLUMN {_q(name)}")
+            except sqlite3.OperationalError as e:
+                # another stage added it between our check and ALTER
+                if "duplicate column" not in str(e):
+                    raise
+
+    # ---- rows ----
+
+    def read_rows(self, sheet: str) -> Tuple[List[str], Dict[int, List[Any]]]:
+        """(headers, {sheet_row: [values in header order]})"""
+        cols = self.columns(sheet)
+        select = ", ".join([_q(ROW_COL)] + [_q(c) for c in cols])
+        with self._lock:
+            rows = self._db.execute(f"SELECT {select} FROM {_q(sheet)} ORDER BY {_q(ROW_COL)}").fetchall()
+        return cols, {r[0]: list(r[1:]) for r in rows}
+
+    def write_row(self, sheet: str, row: int, values: Dict[str, Any]) -> None:
+        """Upsert only the given cells of one sheet row, in its own transaction."""
+        if not values:
+            return
+        names = list(values)
+        cols = ", ".join(_q(n) for n in names)
+        marks = ", ".join("?" for _ in names)
+        updates = ", ".join(f"{_q(n)} = excluded.{_q(n)}" for n in names)
+        with self._lock:
+            self._db.execute(
+                f"INSERT INTO {_q(sheet)} ({_q(ROW_COL)}, {cols}) VALUES (?, {marks}) "
+                f"ON CONFLICT({_q(ROW_COL)}) DO UPDATE SET {updates}",
+                [row] + [values[n] for n in names],
+            )
+
+    def row_count(self, sheet: str) -> int:
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM {_q(sheet)}").fetchone()[0]
+
+    # ---- workbook import / export ----
+
+    def stale_sheets(self, xlsx_path: str) -> List[str]:
+        """Staged sheets seeded from xlsx_path whose file no longer has the sha256 recorded at seed / export time."""
+        path = os.path.abspath(xlsx_path)
+        if not os.path.exists(path):
+            return []
+        with self._lock:
+            recorded = self._db.execute(
+                "SELECT name, seeded_sha256 FROM staging_sheets WHERE seeded_from = ? AND seeded_sha256 IS NOT NULL ORDER BY position, name",
+                (path,),
+            ).fetchall()
+        if not recorded:
+            return []
+        digest = content_hash(path)
+        return [name for name, sha in recorded if sha != digest]
+
+    def check_xlsx(self, xlsx_path: str) -> None:
+        """Raise StaleWorkbookError if xlsx_path changed since the store last saw it."""
+        stale = self.stale_sheets(xlsx_path)
+        if stale:
+            raise StaleWorkbookError(
+                f"{xlsx_path} changed since {self.path} was seeded from or exported to it "
+                f"(sheets: {', '.join(stale)}). Reload it with `staging_store.py import --replace` "
+                f"(drops staged rows not yet exported) or overwrite it with `staging_store.py export --force`."
+            )
+
+    def seed_from_xlsx(self, xlsx_path: str, replace: bool = False) -> List[str]:
+        """Create a table per sheet from the workbook. Sheets already in the store are kept unless replace=True."""
+        source = os.path.abspath(xlsx_path)
+        digest = content_hash(source)
+        wb = openpyxl.load_workbook(xlsx_path, read_only=True)
+        known = set(self.sheet_names())
+        seeded = []
+        try:
+            for ws in wb.worksheets:
+                if ws.title in known and not replace:
+                    continue
+                rows = ws.iter_rows(values_only=True)
+                header_row = next(rows, ())
+                headers = [str(v).strip() for v in header_row if v is not None and str(v).strip()]
+                positions = [i for i, v in enumerate(header_row) if v is not None and str(v).strip()]
+                with self._lock:
+                    self._db.execute(f"DROP TABLE IF EXISTS {_q(ws.title)}")
+                    self._db.execute("DELETE FROM staging_sheets WHERE name = ?", (ws.title,))
+                self.create_sheet(ws.title, headers, seeded_from=source, seeded_sha256=digest)
+                batch = []
+                for r, row in enumerate(rows, start=2):
+                    vals = [row[i] if i < len(row) else None for i in positions]
+                    if any(v is not None for v in vals):
+                        batch.append([r] + vals)
+                if batch:
+                    marks = ", ".join("?" for _ in range(len(headers) + 1))
+                    with self._lock:
+                        self._db.execute("BEGIN")
+                        self._db.executemany(f"INSERT INTO {_q(ws.title)} VALUES ({marks})", batch)
+                        self._db.execute("COMMIT")
+                seeded.append(ws.title)
+        finally:
+            wb.close()
+        return seeded
+
+    def export_xlsx(self, out_path: str, template: Optional[str] = None, force: bool = False) -> None:
+        """
+        Write every staged sheet into a copy of `template` (default: `out_path`
+        itself if it exists), replacing each sheet's header + data rows. Sheets
+        the store doesn't have are left as they are. Atomic replace of out_path.
+
+        Refuses (StaleWorkbookError) if `template` changed since the store was
+        seeded from / exported to it, unless force=True.
+        """
+        template = template or (out_path if os.path.exists(out_path) else None)
+        if template and not force:
+            self.check_xlsx(template)
+        wb = openpyxl.load_workbook(template) if template else openpyxl.Workbook()
+        if not template:
+            wb.remove(wb.active)
+        for sheet in self.sheet_names():
+            headers, rows = self.read_rows(sheet)
+            if sheet in wb.sheetnames:
+                ws = wb[sheet]
+                if ws.max_row > 1:
+                    ws.delete_rows(2, ws.max_row - 1)
+                for col in range(1, ws.max_column + 1):
+                    ws.cell(row=1, column=col).value = None
+            else:
+                ws = wb.create_sheet(sheet)
+            for col, name in enumerate(headers, start=1):
+                ws.cell(row=1, column=col).value = name
+            for r, values in rows.items():
+                for col, v in enumerate(values, start=1):
+                    if v is not None:
+                        ws.cell(row=r, column=col).value = v
+        tmp = out_path + ".tmp"
+        wb.save(tmp)
+        os.replace(tmp, out_path)
+        # the store and out_path agree again: the next seed / export checks against this version
+        with self._lock:
+            self._db.execute(
+                "UPDATE staging_sheets SET seeded_sha256 = ? WHERE seeded_from = ?",
+                (content_hash(out_path), os.path.abspath(out_path)),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# -------------------
+# openpyxl-shaped view
+# -------------------
+
+
+class _StagedCell:
+    __slots__ = ("_sheet", "row", "column")
+
+    def __init__(self, sheet: "StagingSheet", row: int, column: int):
+        self._sheet = sheet
+        self.row = row
+        self.column = column
+
+    @property
+    def value(self) -> Any:
+        return self._sheet._get(self.row, self.column)
+
+    @value.setter
+    def value(self, v: Any) -> None:
+        self._sheet._set(self.row, self.column, v)
+
+
+class StagingSheet:
+    """
+    One staged sheet, read once into memory. Cell writes are buffered per row
+    and committed (only the written cells) by flush().
+    """
+
+    def __init__(self, store: StagingStore, title: str):
+        self.store = store
+        self.title = title
+        self._headers, self._rows = store.read_rows(title)
+        self._dirty: Dict[int, Set[int]] = {}
+
+    @property
+    def max_row(self) -> int:
+        return max(self._rows) if self._rows else 1
+
+    @property
+    def max_column(self) -> int:
+        return max(1, len(self._headers))
+
+    def _get(self, row: int, column: int) -> Any:
+        if column < 1:
+            return None
+        if row == 1:
+            return self._headers[column - 1] if column <= len(self._headers) else None
+        values = self._rows.get(row)
+        return values[column - 1] if values is not None and column <= len(values) else None
+
+    def _set(self, row: int, column: int, value: Any) -> None:
+        if row == 1:
+            if column <= len(self._headers):
+                if self._headers[column - 1] != value:
+                    raise ValueError(f"{self.title}: renaming column {self._headers[column - 1]!r} is not supported in the staging store")
+                return
+            if column != len(self._headers) + 1 or not value:
+                raise ValueError(f"{self.title}: new columns must be appended after the last header")
+            self.store.add_column(self.title, str(value))
+            self._headers.append(str(value))
+            for values in self._rows.values():
+                values.append(None)
+            return
+        if column > len(self._headers):
+            raise ValueError(f"{self.title}: column {column} has no header")
+        values = self._rows.get(row)
+        if values is None:
+            values = self._rows[row] = [None] * len(self._headers)
+        values[column - 1] = value
+        self._dirty.setdefault(row, set()).add(column)
+
+    def cell(self, row: int, column: int, value: Any = None) -> _StagedCell:
+        c = _StagedCell(self, row, column)
+        if value is not None:
+            c.value = value
+        return c
+
+    def iter_rows(
+        self,
+        min_row: int = 1,
+        max_row: Optional[int] = None,
+        min_col: int = 1,
+        max_col: Optional[int] = None,
+        values_only: bool = False,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Rows as tuples of cells, or of values with values_only=True (openpyxl's signature and defaults)."""
+        cols = range(min_col, (max_col or self.max_column) + 1)
+        for r in range(min_row, (max_row or self.max_row) + 1):
+            if values_only:
+                yield tuple(self._get(r, c) for c in cols)
+            else:
+                yield tuple(_StagedCell(self, r, c) for c in cols)
+
+    def flush(self) -> int:
+        """Commit buffered cells, one transaction per row. Returns rows written."""
+        dirty, self._dirty = self._dirty, {}
+        for row in sorted(dirty):
+            values = self._rows[row]
+            self.store.write_row(self.title, row, {self._headers[c - 1]: values[c - 1] for c in dirty[row]})
+        return len(dirty)
+
+
+class StagingWorkbook:
+    """Workbook-shaped handle on a StagingStore; save() commits instead of rewriting a file."""
+
+    # Checkpointer saves on every tick: a save is a few row commits, not a full rewrite
+    commits_per_row = True
+
+    def __init__(self, store: StagingStore):
+        self.store = store
+        self._sheets: Dict[str, StagingSheet] = {}
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return self.store.sheet_names()
+
+    def __getitem__(self, name: str) -> StagingSheet:
+        if name not in self._sheets:
+            if name not in self.sheetnames:
+                raise KeyError(f"Worksheet {name} does not exist in {self.store.path}")
+            self._sheets[name] = StagingSheet(self.store, name)
+        return self._sheets[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sheetnames
+
+    def save(self, path: Optional[str] = None) -> None:
+        # path is accepted for drop-in use where openpyxl's wb.save(xlsx) was called
+        for ws in self._sheets.values():
+            ws.flush()
+
+
+def open_workbook(xlsx_path: str, staging_db: Optional[str] = None):
+    """
+    The scrapers' sink: the openpyxl workbook at xlsx_path, or, with staging_db,
+    a StagingWorkbook (seeded from xlsx_path for any sheet the store lacks).
+    Raises StaleWorkbookError if xlsx_path changed since the store last saw it.
+    """
+    if not staging_db:
+        return openpyxl.load_workbook(xlsx_path)
+    store = StagingStore(staging_db)
+    store.check_xlsx(xlsx_path)
+    seeded = store.seed_from_xlsx(xlsx_path) if os.path.exists(xlsx_path) else []
+    if seeded:
+        print(f"[STAGING] seeded {', '.join(seeded)} from {xlsx_path}")
+    return StagingWorkbook(store)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="SQLite staging store for the GloveIQ scraper sheets")
+    ap.add_argument("--db", default=DEFAULT_STAGING_DB, help="Staging database path")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="Load workbook sheets into the store")
+    imp.add_argument("--xlsx", required=True)
+    imp.add_argument("--replace", action="store_true", help="Reload sheets already in the store (drops staged rows)")
+    exp = sub.add_parser("export", help="Write staged sheets to an XLSX")
+    exp.add_argument("--xlsx", required=True, help="Output workbook (its other sheets/formatting are kept)")
+    exp.add_argument("--template", default=None, help="Workbook to start from (default: --xlsx itself)")
+    exp.add_argument("--force", action="store_true", help="Export even if the workbook changed since it was seeded/exported (its changes to staged sheets are lost)")
+    sub.add_parser("status", help="Row counts per staged sheet")
+    args = ap.parse_args()
+
+    store = StagingStore(args.db)
+    if args.cmd == "import":
+        seeded = store.seed_from_xlsx(args.xlsx, replace=args.replace)
+        print(f"[STAGING] imported {', '.join(seeded) or 'nothing (all sheets already staged; use --replace)'} into {args.db}")
+        stale = store.stale_sheets(args.xlsx)
+        if stale:
+            print(f"[STAGING] WARNING: {args.xlsx} changed since {', '.join(stale)} were staged; use --replace to reload them")
+    elif args.cmd == "export":
+        try:
+            store.export_xlsx(args.xlsx, template=args.template, force=args.force)
+        except StaleWorkbookError as e:
+            raise SystemExit(f"[STAGING] {e}")
+        print(f"[STAGING] exported {', '.join(store.sheet_names())} to {args.xlsx}")
+    for sheet in store.sheet_names():
+        print(f"[STAGING] {sheet}: rows={store.row_count(sheet)} columns={len(store.columns(sheet))}")
+
+
+if __name__ == "__main__":
+    main()
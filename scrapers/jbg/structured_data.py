@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Embedded structured data (schema.org JSON-LD / serialized page state) for product pages.
+
+Product pages usually carry the facts we want as JSON: a
+<script type="application/ld+json"> Product/Offer block, or the framework's page
+state (<script id="__NEXT_DATA__">). Those are found with a targeted regex scan
+of the raw HTML and json-decoded, so no DOM is built at all. The scrapers use
+this first and keep their DOM heuristics as the fallback.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urljoin
+
+
+_JSON_LD_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.I | re.S,
+)
+_NEXT_DATA_RE = re.compile(r"<script\b[^>]*\bid\s*=\s*[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script\s*>", re.I | re.S)
+_MONEY_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+
+def _loads(text: str) -> Any:
+    text = text.strip()
+    if text.startswith("<!--"):
+        text = text[4:]
+    if text.endswith("-->"):
+        text = text[:-3]
+    try:
+        return json.loads(text)
+    except ValueError:
+        # some templates leave raw newlines/tabs inside JSON strings
+        try:
+            return json.loads(text, strict=False)
+        except ValueError:
+            return None
+
+
+def _walk(node: Any) -> Iterator[Dict]:
+    """Every dict in a JSON document (depth-first, document order)."""
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            yield cur
+            stack.extend(reversed(list(cur.values())))
+        elif isinstance(cur, list):
+            stack.extend(reversed(cur))
+
+
+def _is_type(node: Dict, name: str) -> bool:
+    t = node.get("@type")
+    if isinstance(t, list):
+        return any(isinstance(x, str) and x.split("/")[-1] == name for x in t)
+    return isinstance(t, str) and t.split("/")[-1] == name
+
+
+def iter_json_ld(html: str) -> Iterator[Any]:
+    for m in _JSON_LD_RE.finditer(html):
+        doc = _loads(m.group(1))
+        if doc is not None:
+            yield doc
+
+
+def embedded_state(html: str) -> Optional[Any]:
+    m = _NEXT_DATA_RE.search(html)
+    return _loads(m.group(1)) if m else None
+
+
+def find_product(html: str) -> Optional[Dict]:
+    """First schema.org Product in the page's JSON-LD, else in its serialized page state."""
+    for doc in iter_json_ld(html):
+        for node in _walk(doc):
+            if _is_type(node, "Product"):
+                return node
+    state = embedded_state(html)
+    if state is not None:
+        for node in _walk(state):
+            if _is_type(node, "Product"):
+                return node
+    return None
+
+
+def _money(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        m = _MONEY_RE.search(value)
+        if m:
+            try:
+                return float(m.group(0).replace(",", ""))
+            except ValueError:
+                return None
+    return None
+
+
+def offer_price(product: Dict) -> Optional[float]:
+    """Price of the first Offer (or AggregateOffer lowPrice) on a Product."""
+    offers = product.get("offers")
+    for offer in offers if isinstance(offers, list) else [offers]:
+        if not isinstance(offer, dict):
+            continue
+        for key in ("price", "lowPrice"):
+            price = _money(offer.get(key))
+            if price is not None:
+                return price
+        spec = offer.get("priceSpecification")
+        for s in spec if isinstance(spec, list) else [spec]:
+            if isinstance(s, dict):
+                price = _money(s.get("price"))
+                if price is not None:
+                    return price
+    return None
+
+
+def product_images(product: Dict, base_url: str) -> List[str]:
+    raw = product.get("image")
+    out: List[str] = []
+    for img in raw if isinstance(raw, list) else [raw]:
+        if isinstance(img, dict):
+            img = img.get("contentUrl") or img.get("url")
+        if isinstance(img, str) and img.strip():
+            full = urljoin(base_url, img.strip())
+            if full not in out:
+                out.append(full)
+    return out
+
+
+def product_properties(product: Dict) -> Dict[str, str]:
+    """schema.org additionalProperty PropertyValue list -> {name: value}."""
+    props = product.get("additionalProperty")
+    out: Dict[str, str] = {}
+    for p in props if isinstance(props, list) else [props]:
+        if not isinstance(p, dict):
+            continue
+        name = p.get("name")
+        value = p.get("value")
+        if isinstance(value, list):
+            value = " ".join(str(v) for v in value)
+        if isinstance(name, str) and name.strip() and value not in (None, ""):
+            out[name.strip()] = str(value).strip()
+    return out
+
+
+def product_text(product: Dict, key: str) -> Optional[str]:
+    value = product.get(key)
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value or None
+    return None
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Seeded generator for synthetic scraper workbooks at any size.
+
+Writes an XLSX with exactly the REQUIRED_SHEETS layout of library_import.py
+(same sheets, same column order) and rows shaped like the bundled
+GloveIQ_Library_Master_Template workbook, so validate_workbook /
+build_exports / library_import see realistic input at 10k, 100k or 1M
+listings:
+
+- ~30% of source rows are SidelineSwap Catalog rows, about half of them
+  re-listings of a recent listing_id (deduplicated on export), with free-form
+  marketplace titles ("Wilson A2K 1786 RH Infield Baseball Glove 11.5" (Used)"),
+  ~8% naming no known brand, and normalized_json on ~90% of rows
+- the rest are JBG products: one JBG_Full_Catalog row (price on ~1/3, thumb
+  URL) and one JBG_Detail_Enrichment row each, with catalog-style titles
+  ("Rawlings R9 12" Baseball Glove: R9206-9SH"), glove_profile / spec JSON,
+  and images_json lists of ~33-124 URLs (page chrome, product shots, videos,
+  related-product thumbnails; median ~92 like the real pages)
+- brand, series, pattern and web names come from glove_taxonomy.json, weighted
+  toward Wilson / Rawlings as in the scraped data
+
+The same --rows / --seed always produce the same cell values (the XLSX bytes
+differ only in the file timestamps openpyxl writes).
+
+Usage:
+python synthetic_workbook.py --rows 10000 --out /tmp/synthetic_10k.xlsx
+python synthetic_workbook.py --rows 1000000 --seed 7 --out /tmp/synthetic_1m.xlsx
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from openpyxl import Workbook
+
+from glove_taxonomy import TAXONOMY_PATH
+from library_import import REQUIRED_SHEETS
+
+
+# bump when the generated rows change, so cached benchmark workbooks are rebuilt
+GENERATOR_VERSION = 1
+
+SS_SHARE = 0.3
+SS_RELIST_SHARE = 0.5
+SS_UNBRANDED_SHARE = 0.08
+SS_NORMALIZED_SHARE = 0.9
+JBG_CATALOG_PRICE_SHARE = 0.32
+JBG_ERROR_SHARE = 0.01
+JBG_DESCRIPTION_SHARE = 0.01
+RELIST_WINDOW = 5000
+RELATED_POOL = 500
+
+BRAND_WEIGHTS = {"Wilson": 30, "Rawlings": 30, "Mizuno": 10, "Marucci": 6, "44 Pro": 4, "All Star": 3, "Nokona": 3}
+MINOR_BRAND_WEIGHT = 0.2
+
+# category, sizes (inches), share
+CATEGORIES: List[Tuple[str, List[float], int]] = [
+    ("Baseball Glove", [11.0, 11.25, 11.5, 11.75, 12.0, 12.25, 12.5, 12.75], 45),
+    ("Youth Baseball Glove", [9.5, 10.0, 10.5, 11.0, 11.5, 12.0], 12),
+    ("Baseball First Base Mitt", [12.0, 12.5, 12.75, 13.0], 9),
+    ("Baseball Catcher's Mitt", [31.5, 32.0, 32.5, 33.0, 33.5, 34.0, 34.5], 12),
+    ("Fastpitch Softball Glove", [11.5, 12.0, 12.5, 13.0], 12),
+    ("Slow Pitch Softball Glove", [13.0, 14.0, 15.0], 6),
+    ("Infield Training Glove", [8.0, 9.0, 9.5], 4),
+]
+SS_POSITIONS = {
+    "Baseball Glove": ["Infield", "Outfield", "Pitcher's", ""],
+    "Baseball First Base Mitt": ["First Base"],
+    "Baseball Catcher's Mitt": ["Catcher's"],
+}
+SS_CONDITIONS = ["(Used)"] * 6 + ["(New)"] * 3 + [""]
+SS_UNBRANDED = [
+    '{size}" Pro Grade US KIP Training Glove',
+    "{school} college issue {hand}",
+    'New {size}” Solid Webbing',
+    "Custom {hand} glove {size} kip leather",
+]
+SCHOOLS = ["Fullerton", "Vanderbilt", "LSU", "Stanford", "Oregon State", "Texas"]
+AGES = [("13+", 434), ("10+", 295), ("10-15", 66), ("7-12", 56), ("4-9", 38), ("7-15", 35), ("15+", 35), ("7+", 20), ("4-12", 7)]
+FEELS = [("Game Ready Stiff", 446), ("Game Ready Soft", 351), ("Game Ready Game Ready", 108), ("Game Ready Extra Stiff", 88)]
+SKU_PREFIX = {"Wilson": "WBW10", "Rawlings": "PRO", "Mizuno": "GXF", "Marucci": "MFG", "44 Pro": "BB", "All Star": "CM"}
+
+CDN = "https://dac8r2vkxfv8c.cloudfront.net"
+PAGE_CHROME = [
+    f"{CDN}/content/images/justballgloves/justballgloves-logo.svg",
+    f"{CDN}/content/images/help-glove-coach-white.png",
+    f"{CDN}/content/images/cross-sell-bat.png",
+    f"{CDN}/content/images/justbats/justbats-logo.svg",
+] + [f"{CDN}/content/images/social-icons/social-logo_{s}.svg" for s in ("facebook", "x", "instagram", "pinterest", "youtube", "tiktok")] + [
+    f"{CDN}/content/images/pro-athlete.png",
+    f"{CDN}/content/images/help-glove-coach.png",
+]
+PAGE_FOOTER = [
+    f"{CDN}/content/images/glove_assurance_badge.png",
+    f"{CDN}/images/products/32493/justgloves-trusted-glove-prep-service-32493_001_s-2c00-09-25.jpg",
+    f"{CDN}/images/products/9906/justgloves-glove-care-kit-9906_001_s-f3aa-09-25.jpg",
+    f"{CDN}/content/images/personalize-glove-icon.png",
+    f"{CDN}/content/images/icons/ups.svg",
+]
+DESCRIPTION = (
+    "Take control of the field with a glove built for serious players. Premium leather, a game-ready feel and a "
+    "pocket shaped for quick transfers help you make every play with confidence. Glove Benefits Designed for "
+    "competitive players who need high-level performance, durability and comfort."
+)
+
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def slug(text: str) -> str:
+    return _SLUG.sub("-", text.lower()).strip("-")
+
+
+def _load_vocabulary() -> Dict[str, Any]:
+    data = json.loads(TAXONOMY_PATH.read_text(encoding="utf-8"))
+    names = {b["key"]: b["name"] for b in data["brands"]}
+    series: Dict[str, List[str]] = {}
+    patterns: Dict[str, List[str]] = {}
+    for s in data["series"]:
+        series.setdefault(names[s["brand"]], []).append(s["name"])
+    for p in data["patterns"]:
+        patterns.setdefault(names[p["brand"]], []).append(p["code"])
+    brands = list(names.values())
+    return {
+        "brands": brands,
+        "weights": [BRAND_WEIGHTS.get(b, MINOR_BRAND_WEIGHT) for b in brands],
+        "series": series,
+        "patterns": patterns,
+        "webs": [w["name"] for w in data["webs"]],
+    }
+
+
+class _Generator:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.vocab = _load_vocabulary()
+        self.category_weights = [c[2] for c in CATEGORIES]
+        self.related: Deque[str] = deque(maxlen=RELATED_POOL)
+        self.recent_ss: Deque[Tuple[Any, ...]] = deque(maxlen=RELIST_WINDOW)
+
+    def _size(self, size: float) -> str:
+        return f"{size:g}"
+
+    def _model(self) -> Tuple[str, Optional[str], Optional[str], str, float]:
+        rng, v = self.rng, self.vocab
+        brand = rng.choices(v["brands"], v["weights"])[0]
+        series = rng.choice(v["series"][brand]) if brand in v["series"] and rng.random() < 0.97 else None
+        pattern = rng.choice(v["patterns"][brand]) if brand in v["patterns"] and rng.random() < 0.5 else None
+        category, sizes, _ = rng.choices(CATEGORIES, self.category_weights)[0]
+        return brand, series, pattern, category, rng.choice(sizes)
+
+    def _sku(self, brand: str) -> str:
+        rng = self.rng
+        prefix = SKU_PREFIX.get(brand) or "".join(rng.choice("ABCDEFGHKMNPRSTW") for _ in range(rng.randint(2, 4)))
+        return f"{prefix}{rng.randint(100, 999999)}" + (f"-{rng.randint(1, 9)}{rng.choice('BCHNT')}" if rng.random() < 0.4 else "")
+
+    def _timestamp(self, i: int) -> str:
+        # rows two seconds apart from a fixed start (output must not depend on the clock)
+        seconds = 23 * 3600 + 2 * i
+        return f"2026-02-{13 + seconds // 86400 % 15:02d}T{seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}Z"
+
+    # ---- SidelineSwap ----
+
+    def ss_row(self, i: int) -> List[Any]:
+        rng = self.rng
+        if self.recent_ss and rng.random() < SS_RELIST_SHARE:
+            return list(rng.choice(self.recent_ss))
+        listing_id = str(11_600_000 + i * 7 + rng.randint(0, 6))
+        hand = rng.choice(["RH", "RH", "RH", "LH", "RHT", "LHT"])
+        if rng.random() < SS_UNBRANDED_SHARE:
+            size = self._size(rng.choice([9.5, 11.5, 12.0, 33.0]))
+            title = rng.choice(SS_UNBRANDED).format(size=size, hand=hand, school=rng.choice(SCHOOLS))
+        else:
+            brand, series, pattern, category, size_in = self._model()
+            size = self._size(size_in)
+            position = rng.choice(SS_POSITIONS.get(category, [""]))
+            name = " ".join(p for p in (brand, series, pattern) if p)
+            style = rng.random()
+            if style < 0.6:
+                kind = "First Base Baseball Glove" if position == "First Base" else f"{position} Baseball Glove".strip()
+                title = f'{name} {hand} {kind} {size}" {rng.choice(SS_CONDITIONS)}'.strip()
+            elif style < 0.75:
+                title = f'Brand New {name} {size}" {category} {self._sku(brand)} Never used'
+            elif style < 0.9:
+                title = f'{rng.randint(2019, 2025)} {name} {hand} {category} {size}" {rng.choice(SS_CONDITIONS)}'.strip()
+            else:
+                web = rng.choice(self.vocab["webs"])
+                title = f"{name} {size} {web} {rng.choice(['mocha', 'black', 'tan', 'camel'])}"
+        url = f"https://sidelineswap.com/gear/baseball/baseball-gloves/{listing_id}-{slug(title)[:90]}"
+        normalized = None
+        if rng.random() < SS_NORMALIZED_SHARE:
+            raw = {"Estimated Delivery": f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d} - {rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}"} if rng.random() < 0.92 else {}
+            norm = {"size_in": None, "throw_hand": "UNK", "position": None, "web": None, "title": title, "source": "SS"}
+            normalized = json.dumps({"raw": raw, "norm": norm})
+        # listing_id, product_url, title, price, currency, condition, brand, model, images_json, normalized_json
+        row = (listing_id, url, title, None, None, None, None, None, None, normalized)
+        self.recent_ss.append(row)
+        return list(row)
+
+    # ---- JustBallGloves ----
+
+    def jbg_rows(self, i: int) -> Tuple[List[Any], List[Any]]:
+        rng = self.rng
+        pid = str(30000 + i)
+        brand, series, pattern, category, size_in = self._model()
+        name = " ".join(p for p in (brand, series, pattern) if p)
+        sku = self._sku(brand)
+        title = f'{name} {self._size(size_in)}" {category}: {sku}'
+        product_slug = slug(title.replace('"', "-"))
+        url = f"https://www.justballgloves.com/product/{product_slug}/{pid}/"
+        stamp = f"{rng.randint(0, 0xFFFF):04x}-{rng.randint(1, 12):02d}-{rng.randint(21, 25)}"
+        thumb = f"{CDN}/images/products/{stamp}-{product_slug}-{pid}-1_s.jpg"
+        scraped_at = self._timestamp(i)
+        catalog = [
+            pid,
+            url,
+            "JBG",
+            None,
+            round(rng.choice([99.95, 129.95, 199.95, 249.95, 329.95, 379.95, 449.95]), 2) if rng.random() < JBG_CATALOG_PRICE_SHARE else None,
+            thumb if rng.random() < 0.999 else None,
+            scraped_at,
+        ]
+
+        if rng.random() < JBG_ERROR_SHARE:
+            detail = [pid, url, scraped_at, "ERR", "HTTP 404", None, None, None, None, None, None, None]
+            return catalog, detail
+
+        shots = rng.randint(4, 9)
+        images = list(PAGE_CHROME) + [f"{CDN}/images/logos/{slug(brand)}_tr.png"]
+        images += [f"{CDN}/images/products/{stamp}-{product_slug}-{pid}-{n}_m.jpg" for n in range(1, shots + 1)]
+        images += [f"{CDN}/images/products/{stamp}-{product_slug}-{pid}-{n}_s.jpg" for n in range(1, shots + 1)]
+        images += [f"https://img.youtube.com/vi/{rng.randint(0, 36 ** 11):011x}/mqdefault.jpg" for _ in range(rng.choice([0, 1, 2, 4, 4]))]
+        target = max(33, min(124, int(rng.gauss(95, 15))))
+        related = max(0, target - len(images) - len(PAGE_FOOTER))
+        if self.related:
+            images += rng.choices(self.related, k=related)
+        images += PAGE_FOOTER
+        self.related.append(thumb)
+
+        profile: Dict[str, str] = {}
+        if rng.random() < 0.975:
+            age = rng.choices([a for a, _ in AGES], [w for _, w in AGES])[0]
+            profile = {"Age": f"{age} Extra Stiff", "Feel": rng.choices([f for f, _ in FEELS], [w for _, w in FEELS])[0]}
+        profile_json = json.dumps(profile, ensure_ascii=False, separators=(",", ":"))
+        spec_json = json.dumps({"model_code": None, "glove_profile": profile}, ensure_ascii=False, separators=(",", ":"))
+        description = f"{title} {DESCRIPTION}"[:500] if rng.random() < JBG_DESCRIPTION_SHARE else None
+        detail = [
+            pid,
+            url,
+            scraped_at,
+            "OK",
+            None,
+            title,
+            "0",
+            None,
+            profile_json,
+            description,
+            json.dumps(images, ensure_ascii=False, separators=(",", ":")),
+            spec_json,
+        ]
+        return catalog, detail
+
+
+def generate_rows(rows: int, seed: int = 0) -> Iterator[Tuple[str, List[Any]]]:
+    """(sheet, row values in REQUIRED_SHEETS column order) for `rows` source rows: Catalog rows first, then JBG."""
+    gen = _Generator(seed)
+    ss_rows = int(round(rows * SS_SHARE))
+    for i in range(ss_rows):
+        yield "Catalog", gen.ss_row(i)
+    for i in range(rows - ss_rows):
+        catalog, detail = gen.jbg_rows(i)
+        yield "JBG_Full_Catalog", catalog
+        yield "JBG_Detail_Enrichment", detail
+
+
+def generate_workbook(path: str, rows: int, seed: int = 0) -> Dict[str, int]:
+    """
+    Write a synthetic workbook with `rows` source rows (Catalog +
+    JBG_Detail_Enrichment) to `path`. Returns the row count per sheet.
+    """
+    wb = Workbook(write_only=True)
+    sheets = {}
+    for name, columns in REQUIRED_SHEETS.items():
+        sheets[name] = wb.create_sheet(name)
+        sheets[name].append(columns)
+    counts = {name: 0 for name in REQUIRED_SHEETS}
+    for sheet, values in generate_rows(rows, seed):
+        sheets[sheet].append(values)
+        counts[sheet] += 1
+    wb.save(path)
+    return counts
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Write a seeded synthetic workbook in the library_import REQUIRED_SHEETS layout")
+    p.add_argument("--rows", type=int, required=True, help="Source rows (Catalog + JBG_Detail_Enrichment); about 30%% are SidelineSwap")
+    p.add_argument("--seed", type=int, default=0, help="Random seed; the same seed and row count give the same rows")
+    p.add_argument("--out", required=True, help="XLSX path to write")
+    args = p.parse_args()
+
+    counts = generate_workbook(args.out, args.rows, args.seed)
+    print(f"[synthetic] wrote {args.out}: " + " ".join(f"{k}={v}" for k, v in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""The scrapers/jbg modules are flat scripts; put them on sys.path for the tests."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,20 @@
+"""
+safe_float must never hand a non-finite value to the export: json.dumps would
+write NaN / Infinity, which is not JSON.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from glove_normalize import safe_float
+
+
+@pytest.mark.parametrize("text", ["nan", "NaN", "inf", "-Infinity", float("nan"), float("inf")])
+def test_non_finite_is_none(text):
+    assert safe_float(text) is None
+
+
+@pytest.mark.parametrize("text, value", [("249.95", 249.95), ("$1,299.00", 1299.0), (12, 12.0), ("", None), ("n/a", None)])
+def test_prices(text, value):
+    assert safe_float(text) == value
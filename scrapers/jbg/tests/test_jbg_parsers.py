@@ -0,0 +1,33 @@
+"""
+The lxml fast path (--parser lxml) must extract exactly what the default
+BeautifulSoup parsers do from the saved pages in fixtures/pages/.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("requests")
+
+from bench_jbg_parsers import DEFAULT_PAGES_DIR, PARSERS, load_pages  # noqa: E402
+from jbg_master_scraper import parse_detail_structured, parse_detail_structured_lxml  # noqa: E402
+
+
+PAGES = load_pages(DEFAULT_PAGES_DIR, "", 0)
+DETAIL_PAGES = [page for page in PAGES if page[1] == "detail"]
+
+
+def test_fixture_pages_cover_both_kinds():
+    assert {kind for _, kind, _, _ in PAGES} == {"catalog", "detail"}
+
+
+@pytest.mark.parametrize("label, kind, url, html", PAGES, ids=[page[0] for page in PAGES])
+def test_lxml_matches_soup(label, kind, url, html):
+    soup_fn, lxml_fn = PARSERS[kind]
+    assert lxml_fn(html, url) == soup_fn(html, url)
+
+
+@pytest.mark.parametrize("label, kind, url, html", DETAIL_PAGES, ids=[page[0] for page in DETAIL_PAGES])
+def test_structured_detail_lxml_matches_soup(label, kind, url, html):
+    assert parse_detail_structured_lxml(html, url) == parse_detail_structured(html, url)
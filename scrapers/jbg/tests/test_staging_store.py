@@ -0,0 +1,65 @@
+"""
+A staging store must not export over (or keep writing next to) an XLSX that
+changed since it was seeded from / exported to it.
+"""
+
+from __future__ import annotations
+
+import openpyxl
+import pytest
+
+from staging_store import StaleWorkbookError, StagingStore, open_workbook
+
+
+def _workbook(path, rows):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "JBG_Full_Catalog"
+    ws.append(["listing_id", "title"])
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def _append_direct(path, row):
+    wb = openpyxl.load_workbook(path)
+    wb["JBG_Full_Catalog"].append(row)
+    wb.save(path)
+
+
+def test_export_then_direct_write_is_refused(tmp_path):
+    xlsx, db = str(tmp_path / "w.xlsx"), str(tmp_path / "s.sqlite")
+    _workbook(xlsx, [["JBG:1", "first"]])
+
+    wb = open_workbook(xlsx, db)
+    wb["JBG_Full_Catalog"].cell(row=3, column=1, value="JBG:2")
+    wb.save()
+    wb.store.export_xlsx(xlsx)
+    assert wb.store.stale_sheets(xlsx) == []
+
+    # a run without --staging-db writes to the workbook directly
+    _append_direct(xlsx, ["JBG:3", "direct"])
+
+    with pytest.raises(StaleWorkbookError):
+        open_workbook(xlsx, db)
+    with pytest.raises(StaleWorkbookError):
+        StagingStore(db).export_xlsx(xlsx)
+
+    store = StagingStore(db)
+    store.seed_from_xlsx(xlsx, replace=True)
+    _, rows = store.read_rows("JBG_Full_Catalog")
+    assert [values[0] for values in rows.values()] == ["JBG:1", "JBG:2", "JBG:3"]
+    open_workbook(xlsx, db)
+
+
+def test_force_export_overwrites(tmp_path):
+    xlsx, db = str(tmp_path / "w.xlsx"), str(tmp_path / "s.sqlite")
+    _workbook(xlsx, [["JBG:1", "first"]])
+    store = StagingStore(db)
+    store.seed_from_xlsx(xlsx)
+    _append_direct(xlsx, ["JBG:3", "direct"])
+
+    store.export_xlsx(xlsx, force=True)
+    assert store.stale_sheets(xlsx) == []
+    ws = openpyxl.load_workbook(xlsx)["JBG_Full_Catalog"]
+    assert [r[0] for r in ws.iter_rows(min_row=2, values_only=True)] == ["JBG:1"]
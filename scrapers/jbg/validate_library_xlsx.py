@@ -8,6 +8,7 @@ import json
 from pathlib import Path
 
 from library_import import build_exports, validate_workbook
+from workbook_snapshot import DEFAULT_SNAPSHOT_DIR
 
 
 def main() -> None:
@@ -16,9 +17,12 @@ def main() -> None:
     p.add_argument("--manifest", help="Optional media_manifest.jsonl to validate")
     p.add_argument("--normalized", help="Optional listings.normalized.jsonl to validate")
     p.add_argument("--b2-prefix", default="gloveiq")
+    p.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR, help="Parsed-workbook cache shared with library_import (keyed by workbook sha256)")
+    p.add_argument("--no-snapshot-cache", action="store_true", help="Parse the workbook without reading or writing the snapshot cache")
     args = p.parse_args()
+    snapshot_dir = None if args.no_snapshot_cache else args.snapshot_dir
 
-    vr = validate_workbook(args.xlsx)
+    vr = validate_workbook(args.xlsx, snapshot_dir)
     for w in vr.warnings:
         print(f"[WARN] {w}")
     if not vr.ok:
@@ -26,7 +30,7 @@ def main() -> None:
             print(f"[ERROR] {e}")
         raise SystemExit(2)
 
-    exports = build_exports(args.xlsx, b2_prefix=args.b2_prefix)
+    exports = build_exports(args.xlsx, b2_prefix=args.b2_prefix, snapshot_dir=snapshot_dir)
     expected_listings = len(exports["listings"])
     expected_manifest_rows = len(exports["media_manifest"])
 
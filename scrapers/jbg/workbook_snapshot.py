@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Parse-once snapshot of a scraper workbook for the library tools.
+
+validate_library_xlsx.py, library_import.py and qa_regression_check.py all read
+the same XLSX; in one pipeline run that used to mean four or more full openpyxl
+parses. A snapshot is the values of every sheet (header map + non-empty rows,
+projected onto the header columns), pickled and zlib-compressed under the
+sha256 of the workbook bytes in `.workbook_snapshots/`. The first tool to ask
+pays for the parse; every later tool (and every later run, until the workbook
+changes) loads the snapshot instead.
+
+Within one process the last snapshot is also kept in memory, so
+validate_workbook() followed by build_exports() doesn't even re-hash the file.
+
+Cells are read with data_only=True, as library_import always has: a formula
+cell gives the value Excel cached when it last saved the file, not the formula
+text. A workbook written by a tool that doesn't compute formulas (openpyxl,
+pandas) has no cached values, and such cells read as None; the snapshot counts
+them per sheet (`uncached_formulas`) and validate_workbook() warns about them.
+
+Usage:
+    snap = load_snapshot("master.xlsx")
+    for r, row in snap["Catalog"].rows():
+        print(r, row["listing_id"])
+
+    python workbook_snapshot.py --xlsx master.xlsx
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import pickle
+import zipfile
+import zlib
+from xml.etree.ElementTree import iterparse
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from openpyxl import load_workbook
+
+
+SNAPSHOT_VERSION = 2
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".workbook_snapshots")
+DEFAULT_KEEP = 4
+
+# (abspath, size, mtime_ns) -> snapshot; only the last workbook is kept
+_MEMO: Dict[Tuple[str, int, int], "WorkbookSnapshot"] = {}
+
+
+def _clean(v: Any) -> Optional[str]:
+    if v is None:
+        return None
+    s = str(v).strip()
+    return s if s else None
+
+
+class SheetSnapshot:
+    def __init__(self, title: str, headers: Dict[str, int], rows: List[Tuple[int, Tuple[Any, ...]]], uncached_formulas: int = 0):
+        self.title = title
+        self.headers = headers  # header -> 1-based column
+        self._names = list(headers)
+        self._rows = rows  # (sheet row, values in header order), empty rows dropped
+        self.uncached_formulas = uncached_formulas  # formula cells saved without a value (read as None)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def rows(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Non-empty data rows as (sheet row, {header: value}), in sheet order."""
+        names = self._names
+        for r, values in self._rows:
+            yield r, dict(zip(names, values))
+
+
+class WorkbookSnapshot:
+    def __init__(self, content_hash: str, sheets: Dict[str, SheetSnapshot]):
+        self.content_hash = content_hash
+        self.sheets = sheets
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return list(self.sheets)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sheets
+
+    def __getitem__(self, name: str) -> SheetSnapshot:
+        return self.sheets[name]
+
+
+def content_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read_sheet(ws) -> SheetSnapshot:
+    rows_iter = ws.iter_rows(values_only=True)
+    headers: Dict[str, int] = {}
+    for c, v in enumerate(next(rows_iter, ()), start=1):
+        k = _clean(v)
+        if k:
+            headers[k] = c
+    if not headers:
+        return SheetSnapshot(ws.title, headers, [])
+    cols = [c - 1 for c in headers.values()]
+    width = max(cols) + 1
+    rows: List[Tuple[int, Tuple[Any, ...]]] = []
+    # Only the header columns are projected out of each row; cells right of the
+    # last header are never decoded.
+    for r, values in enumerate(ws.iter_rows(min_row=2, max_col=width, values_only=True), start=2):
+        n = len(values)
+        projected = tuple(values[i] if i < n else None for i in cols)
+        if any(_clean(v) for v in projected):
+            rows.append((r, projected))
+    return SheetSnapshot(ws.title, headers, rows)
+
+
+def _uncached_formulas(archive: zipfile.ZipFile, part: str) -> int:
+    """Formula cells in a sheet part that carry no cached <v> value."""
+    # cheap pre-scan: scraper workbooks have no formulas, so the XML is only parsed when one exists
+    with archive.open(part) as fh:
+        tail = b""
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            if b"<f" in tail + chunk or b":f " in tail + chunk or b":f>" in tail + chunk:
+                break
+            tail = chunk[-8:]
+        else:
+            return 0
+    count = 0
+    with archive.open(part) as fh:
+        for _, el in iterparse(fh):
+            if el.tag.endswith("}c") or el.tag == "c":
+                children = {child.tag.rsplit("}", 1)[-1]: child for child in el}
+                if "f" in children and not (children.get("v") is not None and children["v"].text):
+                    count += 1
+                el.clear()
+    return count
+
+
+def read_workbook(xlsx_path: str, digest: Optional[str] = None) -> WorkbookSnapshot:
+    """
+    Parse the workbook read-only and values-only (rows are decoded lazily from
+    the sheet XML, the cell graph is never built). Dimensions are reset because
+    some writers store a stale <dimension> tag, which would otherwise truncate
+    read-only iteration.
+    """
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        sheets: Dict[str, SheetSnapshot] = {}
+        for ws in wb.worksheets:
+            if hasattr(ws, "reset_dimensions"):
+                ws.reset_dimensions()
+            sheets[ws.title] = _read_sheet(ws)
+            archive, part = getattr(wb, "_archive", None), getattr(ws, "_worksheet_path", None)
+            if archive is not None and part:
+                sheets[ws.title].uncached_formulas = _uncached_formulas(archive, part)
+    finally:
+        wb.close()
+    return WorkbookSnapshot(digest or content_hash(xlsx_path), sheets)
+
+
+def _to_payload(snap: WorkbookSnapshot) -> Dict[str, Any]:
+    return {
+        "version": SNAPSHOT_VERSION,
+        "content_hash": snap.content_hash,
+        "sheets": [(s.title, s.headers, s._rows, s.uncached_formulas) for s in snap.sheets.values()],
+    }
+
+
+def _from_payload(payload: Any, digest: str) -> Optional[WorkbookSnapshot]:
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION or payload.get("content_hash") != digest:
+        return None
+    sheets = {title: SheetSnapshot(title, headers, rows, uncached) for title, headers, rows, uncached in payload["sheets"]}
+    return WorkbookSnapshot(digest, sheets)
+
+
+def _prune(snapshot_dir: str, keep: int) -> None:
+    files = [os.path.join(snapshot_dir, f) for f in os.listdir(snapshot_dir) if f.endswith(".snap")]
+    files.sort(key=os.path.getmtime, reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def snapshot_path(snapshot_dir: str, digest: str) -> str:
+    return os.path.join(snapshot_dir, f"{digest}.snap")
+
+
+def load_snapshot(xlsx_path: str, snapshot_dir: Optional[str] = DEFAULT_SNAPSHOT_DIR, keep: int = DEFAULT_KEEP) -> WorkbookSnapshot:
+    """
+    Snapshot for the workbook's current content: from memory, else from
+    `snapshot_dir`, else parsed and written there (the newest `keep` are kept).
+    Pass snapshot_dir=None to skip the on-disk cache.
+    """
+    st = os.stat(xlsx_path)
+    memo_key = (os.path.abspath(xlsx_path), st.st_size, st.st_mtime_ns)
+    if memo_key in _MEMO:
+        return _MEMO[memo_key]
+
+    digest = content_hash(xlsx_path)
+    snap: Optional[WorkbookSnapshot] = None
+    path = snapshot_path(snapshot_dir, digest) if snapshot_dir else None
+    if path and os.path.exists(path):
+        try:
+            with open(path, "rb") as fh:
+                snap = _from_payload(pickle.loads(zlib.decompress(fh.read())), digest)
+        except Exception:
+            snap = None
+        if snap is not None:
+            os.utime(path)  # keeps recently used snapshots out of _prune
+    if snap is None:
+        snap = read_workbook(xlsx_path, digest)
+        if path:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                # level 1: cell text compresses ~10x and it costs far less than a re-parse
+                fh.write(zlib.compress(pickle.dumps(_to_payload(snap), protocol=pickle.HIGHEST_PROTOCOL), 1))
+            os.replace(tmp, path)
+            _prune(snapshot_dir, keep)
+
+    _MEMO.clear()
+    _MEMO[memo_key] = snap
+    return snap
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build (or show) the cached values snapshot of a workbook")
+    ap.add_argument("--xlsx", required=True)
+    ap.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR)
+    args = ap.parse_args()
+
+    cached = os.path.exists(snapshot_path(args.snapshot_dir, content_hash(args.xlsx)))
+    snap = load_snapshot(args.xlsx, args.snapshot_dir)
+    print(f"[snapshot] {args.xlsx} sha256={snap.content_hash[:16]} ({'cached' if cached else 'parsed'})")
+    for name in snap.sheetnames:
+        uncached = snap[name].uncached_formulas
+        print(f"  {name}: {len(snap[name])} rows, {len(snap[name].headers)} columns" + (f", {uncached} formula cells without cached values" if uncached else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Incrementally maintained index over one worksheet: header -> column,
+key -> sheet rows and the next free row.
+
+Built with a single values-only pass over the sheet, then kept current by
+insert()/append(), so per-row writes cost O(1) instead of re-scanning the sheet
+(header_map + build_existing_index + first_empty_row on every product made the
+detail phase quadratic in sheet size). Works on openpyxl worksheets and on
+staging_store.StagingSheet alike.
+
+Usage:
+    idx = WorksheetIndex(wb["JBG_Detail_Enrichment"], "product_id")
+    row = idx.row("12345") or idx.insert("12345")
+    idx.set(row, "detail_status", "OK")
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+def _key(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    s = str(value).strip()
+    return s or None
+
+
+class WorksheetIndex:
+    def __init__(self, ws, key_header: Optional[str] = None, required: Iterable[str] = ()):
+        self.ws = ws
+        self.title = ws.title
+        self.key_header = key_header
+        self.headers: Dict[str, int] = {}
+        self._rows: Dict[str, List[int]] = {}  # key -> sheet rows, in sheet order
+        self._free: List[int] = []  # heap of rows below the end with an empty key cell
+
+        rows = ws.iter_rows(min_row=1, values_only=True)
+        for col, v in enumerate(next(rows, ()), start=1):
+            if v is None:
+                continue
+            name = str(v).strip()
+            if name:
+                self.headers[name] = col
+        self.require(*([key_header] if key_header else []), *required)
+
+        last = 1
+        if key_header:
+            k = self.headers[key_header] - 1
+            for r, values in enumerate(rows, start=2):
+                last = r
+                key = _key(values[k]) if k < len(values) else None
+                if key is None:
+                    self._free.append(r)
+                else:
+                    self._rows.setdefault(key, []).append(r)
+        else:
+            last = ws.max_row
+        self._end = last + 1  # first row after everything the sheet holds
+
+    # ---- headers ----
+
+    def require(self, *names: str) -> None:
+        for name in names:
+            if name not in self.headers:
+                raise RuntimeError(f"Sheet {self.title} missing required header: {name}")
+
+    def col(self, name: str) -> Optional[int]:
+        return self.headers.get(name)
+
+    def ensure_columns(self, names: Iterable[str]) -> Dict[str, int]:
+        """Append any missing headers after the sheet's last used column."""
+        next_col = max(self.ws.max_column, max(self.headers.values(), default=0)) + 1
+        for name in names:
+            if name not in self.headers:
+                self.ws.cell(row=1, column=next_col).value = name
+                self.headers[name] = next_col
+                next_col += 1
+        return self.headers
+
+    # ---- keys ----
+
+    def __contains__(self, key: Any) -> bool:
+        return _key(key) in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def row(self, key: Any) -> Optional[int]:
+        """Sheet row for `key` (the last one if the key repeats)."""
+        rows = self._rows.get(_key(key))
+        return rows[-1] if rows else None
+
+    def rows(self, key: Any) -> List[int]:
+        return list(self._rows.get(_key(key), ()))
+
+    def data_rows(self) -> range:
+        return range(2, self._end)
+
+    # ---- cells ----
+
+    def get(self, row: int, name: str) -> Any:
+        col = self.headers.get(name)
+        return self.ws.cell(row=row, column=col).value if col else None
+
+    def set(self, row: int, name: str, value: Any) -> bool:
+        """Write one cell; columns the sheet doesn't have are skipped (returns False)."""
+        col = self.headers.get(name)
+        if not col:
+            return False
+        self.ws.cell(row=row, column=col).value = value
+        return True
+
+    # ---- new rows ----
+
+    def _claim(self, row: int, key: Optional[str]) -> int:
+        if key is not None and self.key_header:
+            self.ws.cell(row=row, column=self.headers[self.key_header]).value = key
+            self._rows.setdefault(key, []).append(row)
+        return row
+
+    def insert(self, key: Any) -> int:
+        """New row for `key` in the first row whose key cell is empty (gaps first, then the end)."""
+        if self._free:
+            row = heapq.heappop(self._free)
+        else:
+            row = self._end
+            self._end += 1
+        return self._claim(row, _key(key))
+
+    def append(self, key: Any = None) -> int:
+        """New row after the last row of the sheet."""
+        row = self._end
+        self._end += 1
+        return self._claim(row, _key(key))